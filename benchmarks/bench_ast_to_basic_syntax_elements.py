@@ -0,0 +1,89 @@
+"""Microbenchmark: converting the abstract syntax tree of large modules.
+
+Usage: python -m benchmarks.bench_ast_to_basic_syntax_elements [repeat]
+
+It measures `ast.parse` and the conversion into basic syntax elements separately
+for a generated module and for the largest modules of the standard library.
+The memory column shows the size of the created syntax elements.
+"""
+import ast
+import os
+import sys
+import sysconfig
+import timeit
+import tracemalloc
+
+from pycograph.ast_to_basic_syntax_elements import parse_module
+
+
+def generated_module(nr_of_functions: int = 2000) -> str:
+    """Generate a module with many functions, methods, attribute chains and calls."""
+    parts = ["import os", "from package.logic import do_stuff", "ANSWER = 42"]
+    for i in range(nr_of_functions):
+        parts.append(
+            f"""
+def function_{i}(arg):
+    result = do_stuff(arg.first.second.third, os.path.join("a", "b"))
+    for item in arg.items():
+        if item.value.inner.attribute > ANSWER:
+            result.append(helper_{i}(item).data.values)
+
+    def inner_{i}():
+        return function_{i}(arg.first).other.attr
+    return result
+
+
+class Class{i}:
+    LIMIT = {i}
+
+    def method(self):
+        return self.client.session.get(self.url).json()
+"""
+        )
+    return "\n".join(parts)
+
+
+def stdlib_modules(nr_of_modules: int = 5):
+    """Find the largest modules of the standard library."""
+    stdlib_dir = sysconfig.get_paths()["stdlib"]
+    paths = [
+        os.path.join(stdlib_dir, file_name)
+        for file_name in os.listdir(stdlib_dir)
+        if file_name.endswith(".py")
+    ]
+    paths.sort(key=os.path.getsize, reverse=True)
+    for path in paths[:nr_of_modules]:
+        with open(path, encoding="utf-8") as f:
+            yield os.path.basename(path), f.read()
+
+
+def bench(name: str, content: str, repeat: int) -> None:
+    parse_time = min(
+        timeit.repeat(
+            lambda: ast.parse(content, type_comments=True), number=1, repeat=repeat
+        )
+    )
+    total_time = min(
+        timeit.repeat(lambda: parse_module(content, name), number=1, repeat=repeat)
+    )
+    tracemalloc.start()
+    syntax_elements = parse_module(content, name)  # noqa: F841
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<24} {len(content) // 1024:>6} KiB"
+        f"  ast.parse {parse_time * 1000:8.1f} ms"
+        f"  syntax elements {(total_time - parse_time) * 1000:8.1f} ms"
+        f"  memory {memory / 1024:8.0f} KiB"
+    )
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    bench("generated", generated_module(), repeat)
+    for name, content in stdlib_modules():
+        bench(name, content, repeat)
+
+
+if __name__ == "__main__":
+    main()
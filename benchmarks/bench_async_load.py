@@ -0,0 +1,65 @@
+"""Benchmark: parsing and writing a generated project with batches in flight.
+
+Usage: python -m benchmarks.bench_async_load [nr_of_packages] [modules_per_package]
+[round_trip_ms]
+
+The Redis server is simulated: each query takes `round_trip_ms` (default: 5)
+without holding the GIL, like a network round trip.
+It compares the stream, where parsing waits for each query,
+with the asyncio loader writing up to `max_in_flight` batches while parsing.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.async_loader import load_project_async
+from pycograph.config import settings
+from pycograph.project import PythonProject
+from pycograph.streaming import stream_project
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    round_trip = (float(sys.argv[3]) if len(sys.argv) > 3 else 5) / 1000
+    settings.batch_size = 500
+    settings.batch_latency = 0
+    no_indexes = mock.MagicMock(result_set=[])
+
+    def query(*args):
+        time.sleep(round_trip)
+        return no_indexes
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        print(f"{nr_of_packages * modules_per_package} modules")
+        with mock.patch("redisgraph.graph.Graph.query", side_effect=query):
+            start = time.perf_counter()
+            PythonProject(root_dir).parse()
+            print(f"parse only: {time.perf_counter() - start:.2f} s")
+
+            start = time.perf_counter()
+            result = stream_project(PythonProject(root_dir), "bench", 5000)
+            print(
+                f"stream: {time.perf_counter() - start:.2f} s, "
+                f"{result.queries} queries"
+            )
+
+            for max_in_flight in (1, 4, 16):
+                start = time.perf_counter()
+                result = asyncio.run(
+                    load_project_async(
+                        PythonProject(root_dir), "bench", 5000, max_in_flight
+                    )
+                )
+                print(
+                    f"aload, {max_in_flight} in flight: "
+                    f"{time.perf_counter() - start:.2f} s, {result.queries} queries"
+                )
+
+
+if __name__ == "__main__":
+    main()
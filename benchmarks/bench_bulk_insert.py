@@ -0,0 +1,56 @@
+"""Benchmark: encoding a big generated project for the bulk insert.
+
+Usage: python -m benchmarks.bench_bulk_insert [nr_of_packages] [modules_per_package]
+[--redis]
+
+It measures grouping the nodes and edges and encoding them in the binary format of
+GRAPH.BULK, in batches of the default size.
+Without `--redis`, the batches are built completely but not sent,
+so only the client side is measured.
+With `--redis`, the graph is created in the Redis instance of the settings.
+"""
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.bulk_insert import BulkGraph, bulk_insert
+from pycograph.config import settings
+from pycograph.project import PythonProject
+
+
+def main() -> None:
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    use_redis = "--redis" in sys.argv
+    nr_of_packages = int(args[0]) if len(args) > 0 else 20
+    modules_per_package = int(args[1]) if len(args) > 1 else 40
+    settings.overwrite_existing_graph = True
+    with tempfile.TemporaryDirectory() as root_dir, ExitStack() as stack:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+        if not use_redis:
+            stack.enter_context(mock.patch("pycograph.bulk_insert.redis_connection"))
+            stack.enter_context(mock.patch("redisgraph.Graph.query"))
+
+        start = time.perf_counter()
+        bulk_graph = BulkGraph(parse_result)
+        batches = list(bulk_graph.batches(settings.bulk_batch_size))
+        duration = time.perf_counter() - start
+        rows = bulk_graph.node_count() + bulk_graph.edge_count()
+        size = sum(batch.size for batch in batches)
+        print(f"{nr_of_packages * modules_per_package} modules, {rows} rows")
+        print(
+            f"encoding: {duration:.2f} s, {rows / duration:,.0f} rows/s, "
+            f"{len(batches)} batches, {size / 1024 / 1024:.2f} MiB"
+        )
+
+        start = time.perf_counter()
+        result = bulk_insert("bench_bulk", parse_result)
+        duration = time.perf_counter() - start
+        print(f"bulk insert: {duration:.2f} s, {result.round_trips} commands")
+
+
+if __name__ == "__main__":
+    main()
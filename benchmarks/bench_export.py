@@ -0,0 +1,59 @@
+"""Benchmark: exporting a big generated project to files.
+
+Usage: python -m benchmarks.bench_export [nr_of_packages] [modules_per_package]
+
+It measures the duration, the size of the files and the memory allocated
+while exporting the parse result in each format, uncompressed and with gzip.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.exporters import Compression, ExportFormat, export_parse_result
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
+
+
+def export(
+    parse_result: ParseResult, export_format: ExportFormat, compression: Compression
+) -> None:
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        result = export_parse_result(
+            parse_result, output_dir, export_format, compression
+        )
+        duration = time.perf_counter() - start
+        size = sum(os.path.getsize(path) for path in result.paths)
+    # The memory is measured in a second run, tracing slows down the export.
+    with tempfile.TemporaryDirectory() as output_dir:
+        tracemalloc.start()
+        export_parse_result(parse_result, output_dir, export_format, compression)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    rows = result.nodes_exported + result.edges_exported
+    print(
+        f"{export_format.value} {compression.value}: {duration:.2f} s, "
+        f"{rows / duration:,.0f} rows/s, {len(result.paths)} files, "
+        f"{size / 1024 / 1024:.2f} MiB, peak allocated {peak / 1024 / 1024:.2f} MiB"
+    )
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+    objects = parse_result.objects.values()
+    edges = sum(len(obj.relationships) for obj in objects)
+    print(f"{nr_of_packages * modules_per_package} modules, {edges} edges")
+    for export_format in ExportFormat:
+        for compression in (Compression.none, Compression.gzip):
+            export(parse_result, export_format, compression)
+
+
+if __name__ == "__main__":
+    main()
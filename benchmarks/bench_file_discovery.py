@@ -0,0 +1,69 @@
+"""Benchmark: finding the Python files of a checkout with an in-tree virtualenv.
+
+Usage: python -m benchmarks.bench_file_discovery [nr_of_packages]
+
+It generates a project next to a virtualenv, a node_modules directory
+and __pycache__ directories in a temporary directory.
+Then it compares an unfiltered `os.walk` with `FileDiscovery`.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from pycograph.file_discovery import FileDiscovery
+
+
+def generate_checkout(root_dir: str, nr_of_packages: int) -> None:
+    """Generate the project's packages and the third-party directories."""
+    for pkg_nr in range(nr_of_packages):
+        _create_package(os.path.join(root_dir, "project", f"pkg{pkg_nr}"), 10)
+        _create_package(
+            os.path.join(root_dir, "project", f"pkg{pkg_nr}", "__pycache__"), 10
+        )
+    venv_dir = os.path.join(root_dir, ".venv")
+    site_packages = os.path.join(venv_dir, "lib", "python3.8", "site-packages")
+    for dep_nr in range(nr_of_packages * 10):
+        _create_package(os.path.join(site_packages, f"dep{dep_nr}"), 10)
+    with open(os.path.join(venv_dir, "pyvenv.cfg"), "w"):
+        pass
+    for dep_nr in range(nr_of_packages):
+        _create_package(os.path.join(root_dir, "node_modules", f"js{dep_nr}"), 5)
+
+
+def _create_package(dir_path: str, nr_of_modules: int) -> None:
+    os.makedirs(dir_path)
+    for mod_nr in range(nr_of_modules):
+        with open(os.path.join(dir_path, f"mod{mod_nr}.py"), "w") as f:
+            f.write("ANSWER = 42\n")
+
+
+def walk_all(root_dir: str) -> int:
+    """Count the .py files like the discovery before the pruning was introduced."""
+    return sum(
+        1
+        for _, _, files in os.walk(root_dir)
+        for file_name in files
+        if file_name.endswith(".py") and file_name != "setup.py"
+    )
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_checkout(root_dir, nr_of_packages)
+
+        start = time.perf_counter()
+        walked_files = walk_all(root_dir)
+        walk_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found_files = sum(1 for _ in FileDiscovery().python_files(root_dir))
+        discovery_duration = time.perf_counter() - start
+
+    print(f"os.walk:       {walked_files} files in {walk_duration:.3f} s")
+    print(f"FileDiscovery: {found_files} files in {discovery_duration:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
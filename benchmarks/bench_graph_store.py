@@ -0,0 +1,131 @@
+"""Benchmark: querying a big graph in memory with the GraphStore.
+
+Usage: python -m benchmarks.bench_graph_store [nr_of_packages] [modules_per_package]
+[functions_per_module]
+
+The parse result is generated directly, without parsing modules.
+With the defaults, it has 500 packages with 40 modules of 24 functions each,
+about 500k nodes. Each function calls two functions and each module imports
+a function of a module in another package.
+It measures building the store and the average duration of the queries.
+"""
+import random
+import sys
+import time
+from typing import Callable, Dict
+
+from pycograph.graph_store import GraphStore
+from pycograph.schemas.basic_syntax_elements import (
+    CallSyntaxElement,
+    ImportSyntaxElement,
+)
+from pycograph.schemas.parse_result import (
+    CallsRelationship,
+    ContainsRelationship,
+    FunctionWithContext,
+    ModuleWithContext,
+    ObjectWithContext,
+    PackageWithContext,
+    ParseResult,
+    ResolvedImportRelationship,
+)
+
+
+def generate_parse_result(
+    nr_of_packages: int, modules_per_package: int, functions_per_module: int
+) -> ParseResult:
+    rnd = random.Random(0)
+    objects: Dict[str, ObjectWithContext] = {}
+    call = CallSyntaxElement(what_reference_name="function")
+    for package_index in range(nr_of_packages):
+        package_name = f"package_{package_index}"
+        package = PackageWithContext(
+            name=package_name, full_name=package_name, dir_path=""
+        )
+        objects[package_name] = package
+        for module_index in range(modules_per_package):
+            module_name = f"{package_name}.module_{module_index}"
+            module = ModuleWithContext(
+                name=f"module_{module_index}", full_name=module_name, file_path=""
+            )
+            objects[module_name] = module
+            package.relationships.append(
+                ContainsRelationship(destination_full_name=module_name)
+            )
+            imported = (
+                f"package_{rnd.randrange(nr_of_packages)}."
+                f"module_{rnd.randrange(modules_per_package)}.function_0"
+            )
+            module.relationships.append(
+                ResolvedImportRelationship(
+                    destination_full_name=imported,
+                    import_element=ImportSyntaxElement(name=imported),
+                )
+            )
+            for function_index in range(functions_per_module):
+                function_name = f"{module_name}.function_{function_index}"
+                function = FunctionWithContext(
+                    name=f"function_{function_index}", full_name=function_name
+                )
+                objects[function_name] = function
+                module.relationships.append(
+                    ContainsRelationship(destination_full_name=function_name)
+                )
+                for _ in range(2):
+                    called = (
+                        f"{module_name}.function_{rnd.randrange(functions_per_module)}"
+                    )
+                    function.relationships.append(
+                        CallsRelationship(
+                            destination_full_name=called, syntax_element=call
+                        )
+                    )
+    return ParseResult(objects=objects)
+
+
+def measure(name: str, query: Callable[[int], object], repeat: int) -> None:
+    start = time.perf_counter()
+    for index in range(repeat):
+        query(index)
+    duration = time.perf_counter() - start
+    print(f"{name}: {duration / repeat * 1_000_000:.1f} µs")
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    functions_per_module = int(sys.argv[3]) if len(sys.argv) > 3 else 24
+    parse_result = generate_parse_result(
+        nr_of_packages, modules_per_package, functions_per_module
+    )
+    start = time.perf_counter()
+    store = GraphStore(parse_result)
+    duration = time.perf_counter() - start
+    print(f"{len(store)} nodes, {store.edge_count()} edges, built in {duration:.2f} s")
+
+    rnd = random.Random(1)
+    functions = [
+        full_name for full_name in store.ids if full_name.endswith("function_1")
+    ]
+    sample = [rnd.choice(functions) for _ in range(1000)]
+    function_ids = [store.node_id(full_name) for full_name in sample]
+    modules = [full_name.rsplit(".", 1)[0] for full_name in sample]
+    packages = [full_name.split(".", 1)[0] for full_name in sample]
+    measure(
+        "successors (IDs)", lambda i: store.successors(function_ids[i], "calls"), 1000
+    )
+    measure("callees", lambda i: store.callees(sample[i]), 1000)
+    measure("callers", lambda i: store.callers(sample[i]), 1000)
+    measure("imports", lambda i: store.imports(modules[i]), 1000)
+    measure("importers", lambda i: store.importers(sample[i]), 1000)
+    measure("module subtree", lambda i: store.subtree(modules[i]), 1000)
+    measure("2-hop neighborhood", lambda i: store.neighborhood(sample[i], 2), 1000)
+    measure(
+        "package imports from package",
+        lambda i: store.find_imports(packages[i], packages[-i - 1]),
+        100,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark: querying a graph while it's reloaded with --overwrite or --swap.
+
+Usage: python -m benchmarks.bench_graph_swap [nr_of_packages] [modules_per_package]
+
+It needs the Redis instance of the settings.
+A generated project is written, then a thread keeps counting the graph's functions
+while the project is loaded again, once overwriting the graph and once swapping
+a new graph in.
+For each reload, the number of queries finding a missing or incomplete graph
+and the median and maximal latency of the queries are printed.
+"""
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Tuple
+
+from redisgraph import Graph  # type: ignore
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.config import settings
+from pycograph.exceptions import RedisConnectionException
+from pycograph.graph_swap import swapped_graph
+from pycograph.graph_writer import GraphWriter, open_graph
+from pycograph.parse_result_to_redisgraph import redis_connection
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
+
+GRAPH_NAME = "bench_graph_swap"
+QUERY = "MATCH (n:function) RETURN count(n)"
+
+
+def write(graph_name: str, parse_result: ParseResult) -> None:
+    writer = GraphWriter(open_graph(graph_name))
+    writer.add_parse_result(parse_result)
+    writer.flush()
+
+
+def query_while(
+    loading: threading.Event, expected: int, results: List[Tuple[bool, float]]
+) -> None:
+    redis_graph = Graph(GRAPH_NAME, redis_connection())
+    while loading.is_set():
+        start = time.perf_counter()
+        try:
+            count = redis_graph.query(QUERY).result_set[0][0]
+        except Exception:
+            count = 0
+        results.append((count == expected, time.perf_counter() - start))
+
+
+def reload(parse_result: ParseResult, swap: bool, expected: int) -> None:
+    results: List[Tuple[bool, float]] = []
+    loading = threading.Event()
+    loading.set()
+    reader = threading.Thread(target=query_while, args=(loading, expected, results))
+    reader.start()
+    start = time.perf_counter()
+    if swap:
+        settings.overwrite_existing_graph = False
+        with swapped_graph(GRAPH_NAME) as building_name:
+            write(building_name, parse_result)
+    else:
+        settings.overwrite_existing_graph = True
+        write(GRAPH_NAME, parse_result)
+    duration = time.perf_counter() - start
+    loading.clear()
+    reader.join()
+    latencies = [latency * 1000 for _, latency in results]
+    failed = len([ok for ok, _ in results if not ok])
+    print(
+        f"{'swap' if swap else 'overwrite'}: {duration:.2f} s, "
+        f"{failed} of {len(results)} queries found no complete graph, "
+        f"latency median {statistics.median(latencies):.2f} ms, "
+        f"max {max(latencies):.2f} ms"
+    )
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+    expected = len(
+        [obj for obj in parse_result.objects.values() if obj.label() == "function"]
+    )
+    settings.overwrite_existing_graph = True
+    try:
+        write(GRAPH_NAME, parse_result)
+    except RedisConnectionException as e:
+        print(f"{e} This benchmark needs a Redis instance with RedisGraph.")
+        return
+    print(f"{len(parse_result.objects)} objects, {expected} functions")
+    for swap in (False, True):
+        reload(parse_result, swap, expected)
+    redis_connection().delete(GRAPH_NAME)
+
+
+if __name__ == "__main__":
+    main()
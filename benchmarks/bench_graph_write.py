@@ -0,0 +1,86 @@
+"""Benchmark: writing a big generated project with `Graph.commit` and in batches.
+
+Usage: python -m benchmarks.bench_graph_write [nr_of_packages] [modules_per_package]
+[--redis]
+
+It compares building one CREATE query and committing it (`populate_graph`)
+with sending parameterized UNWIND queries in adaptive batches (`GraphWriter`).
+Without `--redis`, the queries are built completely but not sent,
+so only the client side is measured.
+With `--redis`, the graphs are written to the Redis instance of the settings.
+"""
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import List
+from unittest import mock
+
+from redisgraph import Graph  # type: ignore
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.config import settings
+from pycograph.graph_writer import GraphWriter, build_params_header, open_graph
+from pycograph.parse_result_to_redisgraph import populate_graph
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
+
+
+def measure(name: str, write, rows: int, query_sizes: List[int]) -> None:
+    query_sizes.clear()
+    start = time.perf_counter()
+    write()
+    duration = time.perf_counter() - start
+    print(
+        f"{name}: {duration:.2f} s, {rows / duration:,.0f} rows/s, "
+        f"{len(query_sizes)} queries, "
+        f"largest query {max(query_sizes, default=0) / 1024 / 1024:.2f} MiB"
+    )
+
+
+def write_in_batches(parse_result: ParseResult) -> None:
+    writer = GraphWriter(open_graph("bench_batches"))
+    writer.add_parse_result(parse_result)
+    writer.flush()
+
+
+def main() -> None:
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    use_redis = "--redis" in sys.argv
+    nr_of_packages = int(args[0]) if len(args) > 0 else 20
+    modules_per_package = int(args[1]) if len(args) > 1 else 40
+    settings.overwrite_existing_graph = True
+    query_sizes: List[int] = []
+    original_query = Graph.query
+
+    def record_query(graph, q, params=None, *args, **kwargs):
+        query = build_params_header(params) + q if params else q
+        query_sizes.append(len(query))
+        if use_redis:
+            return original_query(graph, q, params, *args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as root_dir, ExitStack() as stack:
+        stack.enter_context(mock.patch.object(Graph, "query", record_query))
+        if not use_redis:
+            stack.enter_context(mock.patch("redis.Redis.delete"))
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+        objects = parse_result.objects.values()
+        rows = len(objects) + sum(len(obj.relationships) for obj in objects)
+        print(f"{nr_of_packages * modules_per_package} modules, {rows} rows")
+        measure(
+            "Graph.commit",
+            lambda: populate_graph("bench_commit", parse_result),
+            rows,
+            query_sizes,
+        )
+        measure(
+            "batches",
+            lambda: write_in_batches(parse_result),
+            rows,
+            query_sizes,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: resolving the imports of a big in-memory project.
+
+Usage: python -m benchmarks.bench_import_resolution [nr_of_modules] [imports_per_module]
+
+Each package re-exports the functions of its modules in its `__init__`,
+the other modules import them via absolute, relative and re-exported names.
+Only the import resolution is measured, not the parsing.
+The symbol table lookups are measured separately as well.
+"""
+import sys
+import time
+
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import PackageWithContext
+
+MODULES_PER_PACKAGE = 50
+
+
+def create_project(nr_of_modules: int, imports_per_module: int) -> PythonProject:
+    project = PythonProject(root_dir_path="bench")
+    nr_of_packages = max(1, nr_of_modules // MODULES_PER_PACKAGE)
+    for package_index in range(nr_of_packages):
+        package = PackageWithContext(
+            name=f"pkg{package_index}",
+            full_name=f"pkg{package_index}",
+            dir_path=f"pkg{package_index}",
+        )
+        init = package.add_module("__init__")
+        init.content = "\n".join(
+            f"from .mod{index} import func{index}"
+            for index in range(MODULES_PER_PACKAGE)
+        )
+        project._add_module(init)
+        for module_index in range(MODULES_PER_PACKAGE):
+            lines = [f"def func{module_index}():\n    pass"]
+            for import_index in range(imports_per_module):
+                other_package = (package_index + import_index) % nr_of_packages
+                other_module = import_index % MODULES_PER_PACKAGE
+                kind = import_index % 3
+                if kind == 0:
+                    lines.append(
+                        f"from pkg{other_package}.mod{other_module}"
+                        f" import func{other_module} as f{import_index}"
+                    )
+                elif kind == 1:
+                    lines.append(
+                        f"from pkg{other_package} import func{other_module}"
+                        f" as f{import_index}"
+                    )
+                else:
+                    lines.append(
+                        f"from .mod{other_module} import func{other_module}"
+                        f" as f{import_index}"
+                    )
+            modu = package.add_module(f"mod{module_index}")
+            modu.content = "\n".join(lines)
+            project._add_module(modu)
+    return project
+
+
+def main() -> None:
+    nr_of_modules = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    imports_per_module = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    project = create_project(nr_of_modules, imports_per_module)
+    project._parse_module_contents()
+    imports = [
+        (modu, import_elem)
+        for modu in project.modules
+        for import_elem in modu.unresolved_imports
+    ]
+    start = time.perf_counter()
+    project._resolve_imports()
+    duration = time.perf_counter() - start
+    unresolved = sum(len(modu.unresolved_imports) for modu in project.modules)
+    print(
+        f"{len(project.modules)} modules, {len(imports)} imports,"
+        f" {unresolved} unresolved, import resolution {duration:.2f} s"
+    )
+
+    # The lookups alone, without creating the relationships.
+    start = time.perf_counter()
+    for modu, import_elem in imports:
+        project.symbol_table.resolve_import(import_elem, modu.full_name)
+    print(f"symbol table lookups {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: looking up nodes by full name and name with and without indexes.
+
+Usage: python -m benchmarks.bench_index_lookup [nr_of_packages] [modules_per_package]
+[nr_of_lookups]
+
+It needs the Redis instance of the settings.
+A generated project is written, then the indexes are dropped
+and random functions are looked up by their full names and names.
+The lookups are repeated after the indexes were created again.
+The plan of each lookup query is printed: a `Node By Index Scan` with the indexes,
+a `Node By Label Scan` without them.
+"""
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+from redisgraph import Graph  # type: ignore
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.config import settings
+from pycograph.exceptions import RedisConnectionException
+from pycograph.graph_writer import GraphWriter, build_params_header, open_graph
+from pycograph.parse_result_to_redisgraph import (
+    INDEXED_PROPERTIES,
+    create_indexes,
+    existing_indexes,
+)
+from pycograph.project import PythonProject
+
+QUERIES = {
+    "full_name": "MATCH (n:function {full_name: $value}) RETURN n.name",
+    "name": "MATCH (n:function {name: $value}) RETURN n.full_name",
+}
+
+
+def execution_plan(redis_graph: Graph, query: str, value: str) -> str:
+    params_header = build_params_header({"value": value})
+    plan = redis_graph.redis_con.execute_command(
+        "GRAPH.EXPLAIN", redis_graph.name, params_header + query
+    )
+    return " ".join(
+        (op.decode() if isinstance(op, bytes) else op).strip() for op in plan
+    )
+
+
+def measure(redis_graph: Graph, title: str, functions: List[List[str]]) -> None:
+    print(title)
+    for index, (property_name, query) in enumerate(QUERIES.items()):
+        plan = execution_plan(redis_graph, query, functions[0][index])
+        start = time.perf_counter()
+        for function in functions:
+            redis_graph.query(query, {"value": function[index]})
+        duration = time.perf_counter() - start
+        print(
+            f"  {property_name}: {duration / len(functions) * 1000:.3f} ms per lookup, "
+            f"plan: {plan}"
+        )
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    nr_of_lookups = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    settings.overwrite_existing_graph = True
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+    functions = [
+        [obj.full_name, obj.name]
+        for obj in parse_result.objects.values()
+        if obj.label() == "function"
+    ]
+    try:
+        redis_graph = open_graph("bench_index_lookup")
+        writer = GraphWriter(redis_graph)
+        writer.add_parse_result(parse_result)
+        writer.flush()
+    except RedisConnectionException as e:
+        print(f"{e} This benchmark needs a Redis instance with RedisGraph.")
+        return
+    print(f"{writer.nodes_added} nodes, {len(functions)} functions")
+    lookups = random.Random(0).choices(functions, k=nr_of_lookups)
+
+    for label, property_name in sorted(existing_indexes(redis_graph)):
+        redis_graph.query(f"DROP INDEX ON :{label}({property_name})")
+    measure(redis_graph, "without indexes", lookups)
+    labels = {obj.label() for obj in parse_result.objects.values()}
+    created = create_indexes(redis_graph, labels)
+    print(f"{len(created)} indexes created on {', '.join(INDEXED_PROPERTIES)}")
+    measure(redis_graph, "with indexes", lookups)
+    redis_graph.delete()
+
+
+if __name__ == "__main__":
+    main()
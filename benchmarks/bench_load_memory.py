@@ -0,0 +1,50 @@
+"""Benchmark: peak memory of loading a big generated project.
+
+Usage: python -m benchmarks.bench_load_memory [nr_of_packages] [modules_per_package]
+
+It compares building the whole graph in memory (`populate_graph`)
+with writing it in a stream (`stream_project`).
+The queries aren't sent to RedisGraph, but they are built completely.
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.parse_result_to_redisgraph import populate_graph
+from pycograph.project import PythonProject
+from pycograph.streaming import stream_project
+
+
+def measure(name: str, load) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    load()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {duration:.2f} s, peak memory {peak / 1024 / 1024:.1f} MiB")
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as root_dir, mock.patch(
+        "redisgraph.graph.Graph.query"
+    ):
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        print(f"{nr_of_packages * modules_per_package} modules")
+        measure(
+            "populate_graph",
+            lambda: populate_graph("bench", PythonProject(root_dir).parse()),
+        )
+        measure(
+            "stream_project",
+            lambda: stream_project(PythonProject(root_dir), "bench"),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: parsing a big generated project.
+
+Usage: python -m benchmarks.bench_parse_project [nr_of_packages] [modules_per_package]
+
+It generates a project with cross-module imports and calls in a temporary directory,
+then measures the time of `PythonProject.parse`
+and the peak memory of the parse result.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pycograph.project import PythonProject
+
+
+def generate_project(root_dir: str, nr_of_packages: int, modules_per_package: int):
+    """Generate packages whose modules import and call each other."""
+    for pkg_nr in range(nr_of_packages):
+        pkg_dir = os.path.join(root_dir, "project", f"pkg{pkg_nr}")
+        os.makedirs(pkg_dir)
+        with open(os.path.join(pkg_dir, "__init__.py"), "w") as f:
+            f.write(f"from .mod0 import function0 as pkg{pkg_nr}_function\n")
+        for mod_nr in range(modules_per_package):
+            other_pkg = (pkg_nr + 1) % nr_of_packages
+            other_mod = (mod_nr + 1) % modules_per_package
+            lines = [
+                "import os",
+                f"from project.pkg{other_pkg} import pkg{other_pkg}_function",
+                f"from project.pkg{pkg_nr}.mod{other_mod} import function0, Helper",
+                "LIMIT = 10",
+            ]
+            for fn_nr in range(10):
+                lines.append(
+                    f"""
+def function{fn_nr}(arg):
+    result = function0(arg) + pkg{other_pkg}_function(LIMIT)
+    return Helper(result).process(os.path.join("a", "b"))
+"""
+                )
+            lines.append(
+                """
+class Helper:
+    def __init__(self, value):
+        self.value = value
+
+    def process(self, path):
+        return function1(self.value, path)
+"""
+            )
+            with open(os.path.join(pkg_dir, f"mod{mod_nr}.py"), "w") as f:
+                f.write("\n".join(lines))
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+
+        start = time.perf_counter()
+        parse_result = PythonProject(root_dir).parse()
+        duration = time.perf_counter() - start
+        del parse_result
+
+        tracemalloc.start()
+        parse_result = PythonProject(root_dir).parse()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    nr_of_edges = sum(len(obj.relationships) for obj in parse_result.objects.values())
+    print(
+        f"{nr_of_packages * modules_per_package} modules,"
+        f" {len(parse_result.objects)} objects, {nr_of_edges} relationships"
+    )
+    print(f"parse time {duration:.2f} s, peak memory {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
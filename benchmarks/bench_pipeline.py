@@ -0,0 +1,58 @@
+"""Benchmark: writing a generated project over a slow link with pipelining.
+
+Usage: python -m benchmarks.bench_pipeline [nr_of_packages] [modules_per_package]
+[round_trip_ms]
+
+The Redis server is simulated: each round trip takes `round_trip_ms` (default: 5),
+the execution of the queries is free.
+It compares writing the graph with different pipeline depths.
+"""
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from redisgraph import Graph  # type: ignore
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.graph_writer import AdaptiveBatchSize, GraphWriter
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
+
+
+def write(parse_result: ParseResult, depth: int, round_trip: float) -> None:
+    redis_con = mock.MagicMock()
+    redis_con.pipeline.return_value.execute.side_effect = lambda: time.sleep(round_trip)
+    graph = Graph("bench", redis_con)
+    with mock.patch.object(graph, "query", lambda *args: time.sleep(round_trip)):
+        writer = GraphWriter(
+            graph,
+            batch_size=AdaptiveBatchSize(1000, 0),
+            pipeline_depth=depth,
+        )
+        start = time.perf_counter()
+        writer.add_parse_result(parse_result)
+        writer.flush()
+        duration = time.perf_counter() - start
+    pipeline = writer.pipeline
+    print(
+        f"depth {depth}: {duration:.2f} s, {pipeline.queries} queries, "
+        f"{pipeline.round_trips} round trips, "
+        f"{pipeline.round_trips_saved()} round trips saved"
+    )
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    round_trip = (float(sys.argv[3]) if len(sys.argv) > 3 else 5) / 1000
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+    print(f"{nr_of_packages * modules_per_package} modules")
+    for depth in (1, 4, 16, 64):
+        write(parse_result, depth, round_trip)
+
+
+if __name__ == "__main__":
+    main()
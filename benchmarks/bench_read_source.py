@@ -0,0 +1,69 @@
+"""Benchmark: memory of reading the modules as text versus as bytes.
+
+Usage: python -m benchmarks.bench_read_source [nr_of_packages] [modules_per_package]
+
+"text" reads each module as decoded text and keeps it in the module,
+like the modules did before they were read as bytes.
+"bytes" passes the bytes of each file to `ast.parse` and releases them.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.file_discovery import FileDiscovery
+from pycograph.schemas.parse_result import ModuleWithContext
+
+
+def parse_text(file_paths: List[str]) -> List[ModuleWithContext]:
+    modules = []
+    for file_path in file_paths:
+        with open(file_path, "r") as f:
+            modu = ModuleWithContext(
+                name="bench", file_path=file_path, content=f.read()
+            )
+        modu.parse()
+        modules.append(modu)
+    return modules
+
+
+def parse_bytes(file_paths: List[str]) -> List[ModuleWithContext]:
+    modules = []
+    for file_path in file_paths:
+        modu = ModuleWithContext(name="bench", file_path=file_path)
+        modu.parse()
+        modules.append(modu)
+    return modules
+
+
+def measure(name: str, parse: Callable[[], List[ModuleWithContext]]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    modules = parse()
+    duration = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del modules
+    print(
+        f"{name}: {duration:.2f} s, retained {retained / 1024 / 1024:.1f} MiB,"
+        f" peak {peak / 1024 / 1024:.1f} MiB"
+    )
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        file_paths = list(FileDiscovery().python_files(root_dir))
+        total_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+        print(f"{len(file_paths)} modules, {total_size / 1024 / 1024:.1f} MiB")
+        measure("text", lambda: parse_text(file_paths))
+        measure("bytes", lambda: parse_bytes(file_paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: loading the same project repeatedly with and without upserts.
+
+Usage: python -m benchmarks.bench_upsert [nr_of_packages] [modules_per_package]
+[nr_of_loads]
+
+It needs the Redis instance of the settings.
+A generated project is written `nr_of_loads` times (default: 3) into a new graph,
+once with the create queries and once with the merge queries.
+The duration of each load and the number of nodes and edges in the graph
+afterwards are printed: they grow with each load without upserts
+and stay the same with them.
+"""
+import sys
+import tempfile
+import time
+
+from redisgraph import Graph  # type: ignore
+
+from benchmarks.bench_parse_project import generate_project
+from pycograph.config import settings
+from pycograph.exceptions import RedisConnectionException
+from pycograph.graph_writer import GraphWriter, open_graph
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
+
+
+def graph_size(redis_graph: Graph) -> str:
+    nodes = redis_graph.query("MATCH (n) RETURN count(n)").result_set[0][0]
+    edges = redis_graph.query("MATCH ()-[r]->() RETURN count(r)").result_set[0][0]
+    return f"{nodes} nodes, {edges} edges"
+
+
+def load_repeatedly(parse_result: ParseResult, upsert: bool, nr_of_loads: int) -> None:
+    settings.overwrite_existing_graph = True
+    redis_graph = open_graph("bench_upsert")
+    settings.overwrite_existing_graph = False
+    print("upsert" if upsert else "create")
+    for load_nr in range(nr_of_loads):
+        start = time.perf_counter()
+        writer = GraphWriter(redis_graph, upsert=upsert)
+        writer.add_parse_result(parse_result)
+        writer.flush()
+        duration = time.perf_counter() - start
+        print(f"  load {load_nr + 1}: {duration:.2f} s, {graph_size(redis_graph)}")
+    redis_graph.delete()
+
+
+def main() -> None:
+    nr_of_packages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    modules_per_package = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    nr_of_loads = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    with tempfile.TemporaryDirectory() as root_dir:
+        generate_project(root_dir, nr_of_packages, modules_per_package)
+        parse_result = PythonProject(root_dir).parse()
+    print(f"{len(parse_result.objects)} objects")
+    try:
+        for upsert in (False, True):
+            load_repeatedly(parse_result, upsert, nr_of_loads)
+    except RedisConnectionException as e:
+        print(f"{e} This benchmark needs a Redis instance with RedisGraph.")
+
+
+if __name__ == "__main__":
+    main()
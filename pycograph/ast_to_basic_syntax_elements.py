@@ -1,7 +1,9 @@
 """Parse the abstract syntax tree of a Python project into basic syntax elements."""
 import ast
-from typing import List, Optional
+from collections import deque
+from typing import Callable, Dict, List, Optional, Type
 
+from pycograph.helpers.source_reader import Source
 from pycograph.schemas.basic_syntax_elements import (
     CallSyntaxElement,
     ClassDefSyntaxElement,
@@ -13,24 +15,24 @@ from pycograph.schemas.basic_syntax_elements import (
 )
 
 
-def parse_module(content: str, full_name: str) -> List[SyntaxElement]:
+def parse_module(content: Source, full_name: str) -> List[SyntaxElement]:
     """Parse the content of a Python module into a list os basic syntax elements.
 
     This function returns only a list of basic syntax elements,
     which will be stored in the module.
     In later steps, they will be converted into objects with context and relationships.
 
-    :param content: The module's content as text.
-    :type content: str
+    :param content: The module's content as text or as bytes,
+    which are decoded according to the module's encoding declaration.
+    :type content: Source
     :param full_name: The module's full name.
     :type full_name: str
     :return: A list of basic syntax elements.
     :rtype: List[SyntaxElement]
     """
-    result = []
+    result: List[SyntaxElement] = []
     module = ast.parse(content, full_name, type_comments=True)
-    for ast_object in module.body:
-        result.extend(parse_ast_object(ast_object))
+    SyntaxElementExtractor().add_body(module.body, result)
     return result
 
 
@@ -42,31 +44,9 @@ def parse_ast_object(ast_object: ast.AST) -> List[SyntaxElement]:
     :return: A list of basic syntax elements.
     :rtype: List[SyntaxElement]
     """
-    if type(ast_object) == ast.ImportFrom:
-        return parse_import_from(ast_object)  # type: ignore
-    if type(ast_object) == ast.Import:
-        return parse_import(ast_object)  # type: ignore
-    if type(ast_object) == ast.FunctionDef:
-        return [parse_function(ast_object)]  # type: ignore
-    if type(ast_object) == ast.ClassDef:
-        return [parse_class(ast_object)]  # type: ignore
-
-    if type(ast_object) == ast.Assign:
-        return parse_ast_assign(ast_object)  # type: ignore
-
-    if type(ast_object) == ast.Attribute:
-        result = parse_ast_attribute(ast_object)  # type: ignore
-        if result:
-            return [result]
-    if type(ast_object) == ast.Expr:
-        result = parse_ast_expr(ast_object)  # type: ignore
-        if result:
-            return [result]
-    if type(ast_object) == ast.Name:
-        result = parse_ast_name(ast_object)  # type: ignore
-        if result:
-            return [result]
-    return []
+    result: List[SyntaxElement] = []
+    SyntaxElementExtractor().add_body([ast_object], result)
+    return result
 
 
 def parse_import_from(ast_import_from: ast.ImportFrom) -> List[ImportFromSyntaxElement]:
@@ -118,12 +98,7 @@ def parse_function(ast_function_def: ast.FunctionDef) -> FunctionDefSyntaxElemen
     :return: A basic syntax element for function definition.
     :rtype: FunctionDefSyntaxElement
     """
-    function_def = FunctionDefSyntaxElement(name=ast_function_def.name)
-    for ast_obj in ast.walk(ast_function_def):
-        # parsing ast.Expr was added only to detect function calls directly in a module.
-        if type(ast_obj) not in [ast.FunctionDef, ast.Expr]:
-            function_def.add_syntax_elements(parse_ast_object(ast_obj))
-    return function_def
+    return SyntaxElementExtractor().parse_function(ast_function_def)
 
 
 def parse_class(ast_class: ast.ClassDef) -> ClassDefSyntaxElement:
@@ -134,16 +109,7 @@ def parse_class(ast_class: ast.ClassDef) -> ClassDefSyntaxElement:
     :return: A basic syntax element for class definition.
     :rtype: ClassDefSyntaxElement
     """
-    class_def = ClassDefSyntaxElement(name=ast_class.name)
-
-    # Here, we don't use walk,
-    # because we want to add only the direct children.
-    # We assume that we won't encounter ifs or other similar blocks
-    # directly in the class's code, but rather in functions...
-    for ast_object in ast_class.body:
-        class_def.add_syntax_elements(parse_ast_object(ast_object))
-
-    return class_def
+    return SyntaxElementExtractor().parse_class(ast_class)
 
 
 def parse_ast_assign(ast_assign: ast.Assign) -> List[SyntaxElement]:
@@ -175,20 +141,54 @@ def parse_ast_attribute(
     """
     if type(ast_attribute.ctx) != ast.Load:
         return None
-    if passed_attribute:
-        whole_attr = f"{ast_attribute.attr}.{passed_attribute}"
-    else:
-        whole_attr = ast_attribute.attr
-    if type(ast_attribute.value) == ast.Name:
-        return parse_ast_name(ast_attribute.value, whole_attr)  # type: ignore
-    if (
-        type(ast_attribute.value) == ast.Call
-        and type(ast_attribute.value.func) == ast.Name  # type: ignore
-    ):
-        return parse_ast_name(ast_attribute.value.func, whole_attr)  # type: ignore
-    if type(ast_attribute.value) == ast.Attribute:
-        return parse_ast_attribute(ast_attribute.value, whole_attr)  # type: ignore
-    return None
+    attribute_chain = parse_attribute_chain(ast_attribute)
+    if not passed_attribute:
+        return attribute_chain[0]
+    outer_call = attribute_chain[0]
+    if outer_call is None:
+        return None
+    return CallSyntaxElement(
+        what_reference_name=outer_call.what_reference_name,
+        called_attribute=f"{outer_call.called_attribute}.{passed_attribute}",
+    )
+
+
+def parse_attribute_chain(
+    ast_attribute: ast.Attribute,
+) -> List[Optional[CallSyntaxElement]]:
+    """Parse all the attributes of a chain like `a.b.c` in one pass.
+
+    The result contains one element for each `ast.Attribute` of the chain,
+    starting with the outermost one:
+    `a.b.c` => [call a with attribute b.c, call a with attribute b]
+
+    :param ast_attribute: The outermost attribute of a chain.
+    :type ast_attribute: ast.Attribute
+    :return: The syntax element of each attribute in the chain, None if the
+    attribute doesn't refer to a name or isn't loaded.
+    :rtype: List[Optional[CallSyntaxElement]]
+    """
+    chain = [ast_attribute]
+    value = ast_attribute.value
+    while type(value) == ast.Attribute:
+        chain.append(value)  # type: ignore
+        value = value.value  # type: ignore
+    if type(value) == ast.Call and type(value.func) == ast.Name:  # type: ignore
+        value = value.func  # type: ignore
+    if type(value) != ast.Name:
+        return [None] * len(chain)
+
+    result: List[Optional[CallSyntaxElement]] = [None] * len(chain)
+    called_attribute = ""
+    for index in range(len(chain) - 1, -1, -1):
+        attribute = chain[index]
+        if called_attribute:
+            called_attribute = f"{called_attribute}.{attribute.attr}"
+        else:
+            called_attribute = attribute.attr
+        if type(attribute.ctx) == ast.Load:
+            result[index] = parse_ast_name(value, called_attribute)  # type: ignore
+    return result
 
 
 def parse_ast_expr(ast_expression: ast.Expr) -> Optional[SyntaxElement]:
@@ -262,3 +262,163 @@ def parse_stored_ast_name(ast_name: ast.Name) -> Optional[ConstantSyntaxElement]
     if ast_name.id == ast_name.id.upper():
         return ConstantSyntaxElement(name=ast_name.id)
     return None
+
+
+_NOT_PARSED = object()
+
+
+class SyntaxElementExtractor:
+    """Convert ast objects into basic syntax elements.
+
+    The handler of an ast object is looked up by its type in a dispatch table.
+    Each ast object is handled only once:
+    * The attributes of a chain like `a.b.c` are parsed together,
+    the results for the inner attributes are kept until the walk reaches them.
+    * If a function contains a class, the results of the class's methods
+    are kept for the walk of the outer function.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an extractor with empty caches."""
+        self._attribute_results: Dict[ast.AST, Optional[SyntaxElement]] = {}
+        self._walk_results: Dict[ast.AST, List[SyntaxElement]] = {}
+        self._walk_depth = 0
+
+    def add_body(self, body: List[ast.AST], result: List[SyntaxElement]) -> None:
+        """Parse the statements of a module or class and add them to the result.
+
+        :param body: The statements directly in the module or class.
+        :type body: List[ast.AST]
+        :param result: The list where the basic syntax elements are added.
+        :type result: List[SyntaxElement]
+        """
+        handlers = self._body_handlers
+        for ast_object in body:
+            handler = handlers.get(type(ast_object))
+            if handler:
+                handler(self, ast_object, result)
+
+    def parse_function(
+        self, ast_function_def: ast.FunctionDef
+    ) -> FunctionDefSyntaxElement:
+        """Parse a function definition and its content into a basic syntax element.
+
+        The function is walked in the same breadth-first order as `ast.walk`,
+        so the syntax elements are in the same order as in the ast.
+
+        :param ast_function_def: An function including its content.
+        :type ast_function_def: ast.FunctionDef
+        :return: A basic syntax element for function definition.
+        :rtype: FunctionDefSyntaxElement
+        """
+        function_def = FunctionDefSyntaxElement(name=ast_function_def.name)
+        result = function_def.syntax_elements
+        handlers = self._walk_handlers
+        walk_results = self._walk_results
+        # Only a walk inside another walk needs to keep its results.
+        keep_results = self._walk_depth > 0
+        self._walk_depth += 1
+        todo = deque([ast_function_def])
+        while todo:
+            ast_object = todo.popleft()
+            todo.extend(ast.iter_child_nodes(ast_object))
+            if walk_results:
+                kept_result = walk_results.pop(ast_object, None)
+                if kept_result is not None:
+                    result.extend(kept_result)
+                    continue
+            handler = handlers.get(type(ast_object))
+            if not handler:
+                continue
+            if keep_results:
+                start = len(result)
+                handler(self, ast_object, result)
+                walk_results[ast_object] = result[start:]
+            else:
+                handler(self, ast_object, result)
+        self._walk_depth -= 1
+        return function_def
+
+    def parse_class(self, ast_class: ast.ClassDef) -> ClassDefSyntaxElement:
+        """Parse a class definition and its content into a basic syntax element.
+
+        :param ast_class: A class including its content.
+        :type ast_class: ast.ClassDef
+        :return: A basic syntax element for class definition.
+        :rtype: ClassDefSyntaxElement
+        """
+        class_def = ClassDefSyntaxElement(name=ast_class.name)
+
+        # Here, we don't walk the class,
+        # because we want to add only the direct children.
+        # We assume that we won't encounter ifs or other similar blocks
+        # directly in the class's code, but rather in functions...
+        self.add_body(ast_class.body, class_def.syntax_elements)
+        return class_def
+
+    def _add_import_from(
+        self, ast_import_from: ast.ImportFrom, result: List[SyntaxElement]
+    ) -> None:
+        result.extend(parse_import_from(ast_import_from))
+
+    def _add_import(self, ast_import: ast.Import, result: List[SyntaxElement]) -> None:
+        result.extend(parse_import(ast_import))
+
+    def _add_function(
+        self, ast_function_def: ast.FunctionDef, result: List[SyntaxElement]
+    ) -> None:
+        result.append(self.parse_function(ast_function_def))
+
+    def _add_class(self, ast_class: ast.ClassDef, result: List[SyntaxElement]) -> None:
+        result.append(self.parse_class(ast_class))
+
+    def _add_assign(self, ast_assign: ast.Assign, result: List[SyntaxElement]) -> None:
+        result.extend(parse_ast_assign(ast_assign))
+
+    def _add_attribute(
+        self, ast_attribute: ast.Attribute, result: List[SyntaxElement]
+    ) -> None:
+        parsed = self._attribute_results.pop(ast_attribute, _NOT_PARSED)
+        if parsed is _NOT_PARSED:
+            attribute_chain = parse_attribute_chain(ast_attribute)
+            parsed = attribute_chain[0]
+            # The inner attributes of the chain will be reached later by the walk.
+            inner_attribute = ast_attribute.value
+            for inner_result in attribute_chain[1:]:
+                self._attribute_results[inner_attribute] = inner_result
+                inner_attribute = inner_attribute.value  # type: ignore
+        if parsed:
+            result.append(parsed)  # type: ignore
+
+    def _add_expr(self, ast_expression: ast.Expr, result: List[SyntaxElement]) -> None:
+        parsed = parse_ast_expr(ast_expression)
+        if parsed:
+            result.append(parsed)
+
+    def _add_name(self, ast_name: ast.Name, result: List[SyntaxElement]) -> None:
+        parsed = parse_ast_name(ast_name)
+        if parsed:
+            result.append(parsed)
+
+    _Handler = Callable[["SyntaxElementExtractor", ast.AST, List[SyntaxElement]], None]
+
+    # Handlers for the statements directly in a module or class.
+    _body_handlers: Dict[Type[ast.AST], _Handler] = {
+        ast.ImportFrom: _add_import_from,  # type: ignore
+        ast.Import: _add_import,  # type: ignore
+        ast.FunctionDef: _add_function,  # type: ignore
+        ast.ClassDef: _add_class,  # type: ignore
+        ast.Assign: _add_assign,  # type: ignore
+        ast.Attribute: _add_attribute,  # type: ignore
+        ast.Expr: _add_expr,  # type: ignore
+        ast.Name: _add_name,  # type: ignore
+    }
+
+    # Handlers for the ast objects found by walking a function.
+    # ast.Expr was added only to detect function calls directly in a module.
+    # The contents of inner functions are walked as part of the outer function.
+    _walk_handlers: Dict[Type[ast.AST], _Handler] = {
+        ast_type: handler
+        for ast_type, handler in _body_handlers.items()
+        if ast_type not in (ast.FunctionDef, ast.Expr)
+    }
@@ -0,0 +1,328 @@
+"""Write a Python project into RedisGraph with asyncio, while it's being parsed.
+
+The project is parsed in a thread, in the same order as a stream
+(see `pycograph.streaming`).
+When its buffer is full, the parser hands the rows over to the event loop,
+which splits them into batches and writes them from a thread pool.
+At most `max_in_flight` batches are in flight and one full buffer waits for them.
+When Redis falls behind, the parser waits until its buffer can be handed over,
+so the memory used stays bounded.
+
+The edges look up their nodes,
+so an edge batch is sent only after all node batches sent before it are written,
+including the ones of earlier buffers.
+The edges can still be in flight together with the nodes of the next buffer.
+
+redis-py has an asyncio client only from version 4.2, but redisgraph needs redis 3,
+so the batches are sent with the synchronous client, which releases the GIL while
+it waits for Redis. Each thread takes its own connection from the pool.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, DefaultDict, List, Optional, Set, Tuple
+
+from redisgraph import Graph  # type: ignore
+
+from pycograph.config import active_settings
+from pycograph.graph_writer import (
+    DEFAULT_BUFFER_SIZE,
+    AdaptiveBatchSize,
+    EdgeGroup,
+    NodeGroup,
+    adaptive_batch_size,
+    edge_row,
+    edges_query,
+    node_row,
+    nodes_query,
+    open_graph,
+)
+from pycograph.incremental_update import GraphUpdateResult
+from pycograph.parse_result_to_redisgraph import create_indexes, handle_redis_errors
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ObjectWithContext, Relationship
+from pycograph.streaming import stream_rows
+
+# The default maximal number of batches written concurrently.
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# the node groups and the edge groups with their rows
+Rows = Tuple[
+    DefaultDict[NodeGroup, List[List[Any]]], DefaultDict[EdgeGroup, List[List[Any]]]
+]
+
+
+class RowBuffer:
+    """Collect the rows of the nodes and edges until they are handed over."""
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        """Initialize an empty buffer.
+
+        :param buffer_size: The number of rows after which the buffer is full,
+        defaults to DEFAULT_BUFFER_SIZE
+        :type buffer_size: int
+        """
+        self.buffer_size = buffer_size
+        self.nodes: DefaultDict[NodeGroup, List[List[Any]]] = defaultdict(list)
+        self.edges: DefaultDict[EdgeGroup, List[List[Any]]] = defaultdict(list)
+        self._buffered_rows = 0
+
+    def add_node(self, obj: ObjectWithContext) -> None:
+        """Add a node to be written.
+
+        :param obj: The object represented by the node.
+        :type obj: ObjectWithContext
+        """
+        group, row = node_row(obj)
+        self.nodes[group].append(row)
+        self._buffered_rows += 1
+
+    def add_edge(
+        self,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination: ObjectWithContext,
+    ) -> None:
+        """Add an edge to be written.
+
+        Both nodes must have been added before.
+
+        :param source: The source object.
+        :type source: ObjectWithContext
+        :param relationship: The relationship represented by the edge.
+        :type relationship: Relationship
+        :param destination: The destination object.
+        :type destination: ObjectWithContext
+        """
+        group, row = edge_row(source, relationship, destination)
+        self.edges[group].append(row)
+        self._buffered_rows += 1
+
+    def is_full(self) -> bool:
+        """Whether the rows should be handed over."""
+        return self._buffered_rows >= self.buffer_size
+
+    def take(self) -> Rows:
+        """Take the buffered rows out of the buffer.
+
+        :return: The node groups and the edge groups with their rows.
+        :rtype: Rows
+        """
+        rows = (self.nodes, self.edges)
+        self.nodes = defaultdict(list)
+        self.edges = defaultdict(list)
+        self._buffered_rows = 0
+        return rows
+
+
+class AsyncGraphWriter:
+    """Write nodes and edges with a bounded number of batches in flight."""
+
+    def __init__(
+        self,
+        redis_graph: Graph,
+        executor: ThreadPoolExecutor,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        batch_size: Optional[AdaptiveBatchSize] = None,
+    ) -> None:
+        """Initialize a writer for a graph.
+
+        It must be created in a running event loop.
+
+        :param redis_graph: The graph to write.
+        :type redis_graph: Graph
+        :param executor: The thread pool sending the batches.
+        :type executor: ThreadPoolExecutor
+        :param max_in_flight: The maximal number of batches written concurrently,
+        defaults to DEFAULT_MAX_IN_FLIGHT
+        :type max_in_flight: int
+        :param batch_size: The number of rows sent in one query,
+        defaults to a batch size based on the settings
+        :type batch_size: Optional[AdaptiveBatchSize]
+        """
+        self.redis_graph = redis_graph
+        self.executor = executor
+        self.max_in_flight = max(max_in_flight, 1)
+        self.batch_size = batch_size or adaptive_batch_size()
+        self.upsert = active_settings().upsert
+        self.nodes_added = 0
+        self.edges_added = 0
+        self.queries = 0
+        # the most batches that were in flight at the same time
+        self.peak_in_flight = 0
+        self._indexed_labels: Set[str] = set()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._in_flight: Set["asyncio.Future[None]"] = set()
+        # the node batches in flight, of this and of the earlier buffers
+        self._node_writes: Set["asyncio.Future[None]"] = set()
+        self._error: Optional[BaseException] = None
+
+    async def write(self, rows: Rows) -> None:
+        """Send the rows of the nodes and then the rows of the edges.
+
+        The method returns when the nodes are written and the edges are sent,
+        the edges may still be in flight.
+
+        :param rows: The node groups and the edge groups with their rows.
+        :type rows: Rows
+        """
+        nodes, edges = rows
+        labels = {label for label, _ in nodes}
+        for source_label, _, destination_label, _ in edges:
+            labels.add(source_label)
+            labels.add(destination_label)
+        new_labels = labels - self._indexed_labels
+        if new_labels:
+            await self._run(create_indexes, self.redis_graph, new_labels)
+            self._indexed_labels.update(new_labels)
+
+        for (label, keys), node_rows in nodes.items():
+            query = nodes_query(label, keys, self.upsert)
+            for write in await self._send_in_batches(query, node_rows):
+                self._node_writes.add(write)
+                write.add_done_callback(self._node_writes.discard)
+            self.nodes_added += len(node_rows)
+        if edges and self._node_writes:
+            # The edges' MATCH finds only the nodes that are already written.
+            await asyncio.wait(set(self._node_writes))
+            self._raise_error()
+        for group, edge_rows in edges.items():
+            query = edges_query(*group, self.upsert)
+            await self._send_in_batches(query, edge_rows)
+            self.edges_added += len(edge_rows)
+
+    async def close(self) -> None:
+        """Wait until all batches are written.
+
+        :raises PycographException: If a batch couldn't be written.
+        """
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight))
+        self._raise_error()
+
+    async def _send_in_batches(
+        self, query: str, rows: List[Any]
+    ) -> List["asyncio.Future[None]"]:
+        """Send a query with the rows as its `$rows` parameter in batches."""
+        writes = []
+        start = 0
+        while start < len(rows):
+            end = start + self.batch_size.size
+            writes.append(await self._send(query, rows[start:end]))
+            start = end
+        return writes
+
+    async def _send(self, query: str, rows: List[Any]) -> "asyncio.Future[None]":
+        """Send a batch once fewer than `max_in_flight` batches are in flight.
+
+        Waiting for a free slot is the backpressure on the parser.
+        """
+        self._raise_error()
+        await self._slots.acquire()
+        self._raise_error()
+        write = asyncio.get_running_loop().run_in_executor(
+            self.executor, self._query, query, rows
+        )
+        self._in_flight.add(write)
+        self.peak_in_flight = max(self.peak_in_flight, len(self._in_flight))
+        self.queries += 1
+        write.add_done_callback(self._finished)
+        return write
+
+    def _finished(self, write: "asyncio.Future[None]") -> None:
+        """Free the slot of a written batch and keep its error, if any."""
+        self._in_flight.discard(write)
+        self._slots.release()
+        if not write.cancelled() and write.exception() and not self._error:
+            self._error = write.exception()
+
+    def _raise_error(self) -> None:
+        """Stop the load after the first failed batch."""
+        if self._error:
+            raise self._error
+
+    def _query(self, query: str, rows: List[Any]) -> None:
+        """Write a batch, in a thread of the pool."""
+        query_start = time.perf_counter()
+        with handle_redis_errors("write"):
+            self.redis_graph.query(query, {"rows": rows})
+        self.batch_size.observe(len(rows), time.perf_counter() - query_start)
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Call a blocking function in the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+
+async def load_project_async(
+    project: PythonProject,
+    graph_name: str,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> GraphUpdateResult:
+    """Parse a project and write its graph model with several batches in flight.
+
+    :param project: The project to parse.
+    :type project: PythonProject
+    :param graph_name: The name of the graph.
+    :type graph_name: str
+    :param buffer_size: The number of nodes and edges buffered before writing them,
+    defaults to DEFAULT_BUFFER_SIZE
+    :type buffer_size: int
+    :param max_in_flight: The maximal number of batches written concurrently,
+    defaults to DEFAULT_MAX_IN_FLIGHT
+    :type max_in_flight: int
+    :return: The summary of the written graph.
+    :rtype: GraphUpdateResult
+    """
+    loop = asyncio.get_running_loop()
+    # None marks the end of the project.
+    buffers: "asyncio.Queue[Optional[Rows]]" = asyncio.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def hand_over(rows: Optional[Rows]) -> None:
+        asyncio.run_coroutine_threadsafe(buffers.put(rows), loop).result()
+
+    def parse() -> int:
+        buffer = RowBuffer(buffer_size)
+        modules_added = 0
+        try:
+            for modules_added in stream_rows(project, buffer):
+                if stop.is_set():
+                    return modules_added
+                if buffer.is_full():
+                    hand_over(buffer.take())
+            hand_over(buffer.take())
+        finally:
+            hand_over(None)
+        return modules_added
+
+    with ThreadPoolExecutor(max_workers=max(max_in_flight, 1)) as executor:
+        writer = AsyncGraphWriter(open_graph(graph_name), executor, max_in_flight)
+        # The parser runs with the settings of this load.
+        parsing = loop.run_in_executor(None, contextvars.copy_context().run, parse)
+        try:
+            rows = await buffers.get()
+            while rows is not None:
+                await writer.write(rows)
+                rows = await buffers.get()
+        except BaseException:
+            stop.set()
+            while await buffers.get() is not None:
+                pass
+            raise
+        modules_added = await parsing
+        await writer.close()
+
+    return GraphUpdateResult(
+        graph_name=graph_name,
+        modules_added=modules_added,
+        nodes_added=writer.nodes_added,
+        edges_added=writer.edges_added,
+        queries=writer.queries,
+        round_trips=writer.queries,
+    )
@@ -0,0 +1,303 @@
+"""Create a new graph with RedisGraph's bulk insert command.
+
+For the initial load of a big project, `GRAPH.BULK` is much faster than queries:
+the nodes and edges are sent in a binary format and RedisGraph creates them
+without parsing and planning queries.
+The format is the one of the redisgraph-bulk-loader:
+
+* A blob per label and property keys: a header and then a row per node.
+* A blob per relationship name and property keys: a header and then a row per edge.
+* The header is the null-terminated name, the number of properties as a 4-byte
+  unsigned integer and the null-terminated property keys.
+* A node row contains its property values, each of them a 1-byte type and the value.
+* An edge row starts with the 8-byte IDs of its source and destination nodes.
+
+The nodes get consecutive integer IDs in the order they are sent,
+which are the IDs RedisGraph assigns to the nodes of a new graph.
+The blobs are sent in batches of a limited size, each batch in one command.
+All nodes are sent before the edges.
+"""
+
+import struct
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Tuple
+
+from redisgraph import Graph  # type: ignore
+
+from pycograph.config import active_settings
+from pycograph.exceptions import GraphExistsException
+from pycograph.graph_writer import node_row
+from pycograph.incremental_update import GraphUpdateResult
+from pycograph.parse_result_to_redisgraph import (
+    create_indexes,
+    delete_graph,
+    handle_redis_errors,
+    redis_connection,
+)
+from pycograph.schemas.parse_result import ParseResult
+
+# The property types of the binary format.
+TYPE_NULL = 0
+TYPE_BOOL = 1
+TYPE_DOUBLE = 2
+TYPE_STRING = 3
+TYPE_LONG = 4
+
+# label or relationship name, property keys
+EntityGroup = Tuple[str, Tuple[str, ...]]
+
+
+class BulkGraph:
+    """The nodes and edges of a ParseResult with integer node IDs.
+
+    The nodes are grouped by their labels and property keys,
+    the edges by their relationship names and property keys.
+    The IDs are assigned group by group, in the order the nodes are sent.
+    The edge rows start with the IDs of their source and destination nodes.
+    """
+
+    __slots__ = ("nodes", "edges")
+
+    def __init__(self, parse_result: ParseResult) -> None:
+        """Group the nodes and edges of a parse result.
+
+        The relationships pointing to unknown objects are skipped.
+
+        :param parse_result: A parsed Python project.
+        :type parse_result: ParseResult
+        """
+        objects = parse_result.objects
+        grouped: DefaultDict[EntityGroup, List[Tuple[str, List[Any]]]] = defaultdict(
+            list
+        )
+        for obj in objects.values():
+            group, row = node_row(obj)
+            grouped[group].append((obj.full_name, row))
+
+        node_ids: Dict[str, int] = {}
+        self.nodes: Dict[EntityGroup, List[List[Any]]] = {}
+        for group, entries in grouped.items():
+            for full_name, _ in entries:
+                node_ids[full_name] = len(node_ids)
+            self.nodes[group] = [row for _, row in entries]
+
+        self.edges: DefaultDict[EntityGroup, List[List[Any]]] = defaultdict(list)
+        for obj in objects.values():
+            for rel in obj.relationships:
+                destination_id = node_ids.get(rel.destination_full_name)
+                if destination_id is None:
+                    continue
+                properties = rel.properties()
+                self.edges[(rel.name, tuple(properties.keys()))].append(
+                    [node_ids[obj.full_name], destination_id, *properties.values()]
+                )
+
+    def node_count(self) -> int:
+        """The number of nodes."""
+        return sum(len(rows) for rows in self.nodes.values())
+
+    def edge_count(self) -> int:
+        """The number of edges."""
+        return sum(len(rows) for rows in self.edges.values())
+
+    def batches(self, max_size: int) -> Iterator["BulkBatch"]:
+        """Split the nodes and edges into binary batches.
+
+        A group is split between batches if it doesn't fit into one.
+        A single row bigger than the maximal size is sent in a batch of its own.
+
+        :param max_size: The maximal size of a batch in bytes.
+        :type max_size: int
+        :return: The batches, the ones with the nodes first.
+        :rtype: Iterator[BulkBatch]
+        """
+        batch = BulkBatch()
+        for is_edge, groups in ((False, self.nodes), (True, self.edges)):
+            for (name, keys), rows in groups.items():
+                header = packed_header(name, keys)
+                blob = bytearray(header)
+                count = 0
+                for row in rows:
+                    binary = packed_edge(row) if is_edge else packed_node(row)
+                    too_big = batch.size + len(blob) + len(binary) > max_size
+                    if too_big and (count or batch.size):
+                        if count:
+                            batch.add(bytes(blob), count, is_edge)
+                        yield batch
+                        batch = BulkBatch()
+                        blob = bytearray(header)
+                        count = 0
+                    blob += binary
+                    count += 1
+                if count:
+                    batch.add(bytes(blob), count, is_edge)
+        if batch.size:
+            yield batch
+
+
+class BulkBatch:
+    """The blobs sent in one GRAPH.BULK command."""
+
+    __slots__ = ("node_count", "edge_count", "node_blobs", "edge_blobs", "size")
+
+    def __init__(self) -> None:
+        self.node_count = 0
+        self.edge_count = 0
+        self.node_blobs: List[bytes] = []
+        self.edge_blobs: List[bytes] = []
+        self.size = 0
+
+    def add(self, blob: bytes, count: int, is_edge: bool) -> None:
+        """Add the blob of a group.
+
+        :param blob: The header and the rows.
+        :type blob: bytes
+        :param count: The number of rows in the blob.
+        :type count: int
+        :param is_edge: Whether the rows are edges.
+        :type is_edge: bool
+        """
+        if is_edge:
+            self.edge_blobs.append(blob)
+            self.edge_count += count
+        else:
+            self.node_blobs.append(blob)
+            self.node_count += count
+        self.size += len(blob)
+
+    def arguments(self, begin: bool) -> List[Any]:
+        """The arguments of the GRAPH.BULK command after the graph's name.
+
+        :param begin: Whether this is the first batch, which creates the graph.
+        :type begin: bool
+        :return: The arguments.
+        :rtype: List[Any]
+        """
+        args: List[Any] = ["BEGIN"] if begin else []
+        args.extend(
+            [
+                self.node_count,
+                self.edge_count,
+                len(self.node_blobs),
+                len(self.edge_blobs),
+            ]
+        )
+        return args + self.node_blobs + self.edge_blobs
+
+
+def bulk_insert(
+    graph_name: str, parse_result: ParseResult, max_batch_size: Optional[int] = None
+) -> GraphUpdateResult:
+    """Create a new graph from the `ParseResult` with GRAPH.BULK commands.
+
+    The indexes are created after the nodes,
+    so later incremental updates find the nodes quickly.
+
+    :param graph_name: The name of the created graph.
+    :type graph_name: str
+    :param parse_result: A parsed Python project with objects representing the nodes of
+    the graph.
+    :type parse_result: ParseResult
+    :param max_batch_size: The maximal size of one command in bytes,
+    defaults to the settings
+    :type max_batch_size: Optional[int]
+    :raises GraphExistsException: If the graph exists and shouldn't be overwritten.
+    :return: The summary of the created graph.
+    :rtype: GraphUpdateResult
+    """
+    config = active_settings()
+    redis_instance = redis_connection()
+    if config.overwrite_existing_graph:
+        delete_graph(redis_instance, graph_name)
+    else:
+        with handle_redis_errors("bulk insert"):
+            exists = redis_instance.exists(graph_name)
+        if exists:
+            raise GraphExistsException(
+                f"The graph {graph_name} already exists. "
+                "A bulk insert can only create a new graph."
+            )
+
+    bulk_graph = BulkGraph(parse_result)
+    round_trips = 0
+    for batch in bulk_graph.batches(max_batch_size or config.bulk_batch_size):
+        with handle_redis_errors("bulk insert"):
+            redis_instance.execute_command(
+                "GRAPH.BULK", graph_name, *batch.arguments(begin=round_trips == 0)
+            )
+        round_trips += 1
+
+    redis_graph = Graph(graph_name, redis_instance)
+    create_indexes(redis_graph, {label for label, _ in bulk_graph.nodes})
+    return GraphUpdateResult(
+        graph_name=graph_name,
+        nodes_added=bulk_graph.node_count(),
+        edges_added=bulk_graph.edge_count(),
+        queries=round_trips,
+        round_trips=round_trips,
+    )
+
+
+def packed_header(name: str, keys: Tuple[str, ...]) -> bytes:
+    """Encode the header of a blob.
+
+    :param name: The label or relationship name.
+    :type name: str
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :return: The binary header.
+    :rtype: bytes
+    """
+    return b"".join(
+        [_c_string(name), struct.pack("=I", len(keys))] + [_c_string(k) for k in keys]
+    )
+
+
+def packed_node(row: List[Any]) -> bytes:
+    """Encode a node row: its property values.
+
+    :param row: The property values.
+    :type row: List[Any]
+    :return: The binary row.
+    :rtype: bytes
+    """
+    return b"".join(packed_value(value) for value in row)
+
+
+def packed_edge(row: List[Any]) -> bytes:
+    """Encode an edge row: the source's and destination's IDs and the property values.
+
+    :param row: The IDs and the property values.
+    :type row: List[Any]
+    :return: The binary row.
+    :rtype: bytes
+    """
+    return struct.pack("=QQ", row[0], row[1]) + packed_node(row[2:])
+
+
+def packed_value(value: Any) -> bytes:
+    """Encode a property value with its type.
+
+    :param value: The property value.
+    :type value: Any
+    :raises TypeError: If the value's type isn't supported by the format.
+    :return: The binary value.
+    :rtype: bytes
+    """
+    if value is None:
+        return struct.pack("=B", TYPE_NULL)
+    # bool is a subclass of int, so it's checked first.
+    if isinstance(value, bool):
+        return struct.pack("=B?", TYPE_BOOL, value)
+    if isinstance(value, int):
+        return struct.pack("=Bq", TYPE_LONG, value)
+    if isinstance(value, float):
+        return struct.pack("=Bd", TYPE_DOUBLE, value)
+    if isinstance(value, str):
+        return struct.pack("=B", TYPE_STRING) + _c_string(value)
+    raise TypeError(f"Unsupported property value for the bulk insert: {value!r}")
+
+
+def _c_string(value: str) -> bytes:
+    """Encode a string null-terminated."""
+    return value.encode("utf-8") + b"\0"
@@ -1,13 +1,17 @@
 """CLI for Pycograph."""
 
-from typing import Optional
+import asyncio
+from typing import Any, Dict, List, Optional
 
 import typer
 
 from pycograph import __version__, pycograph
 from pycograph.config import settings
 from pycograph.exceptions import PycographException
-from pycograph.schemas.pycograph_input import PycographLoadInput
+from pycograph.exporters import Compression, ExportFormat
+from pycograph.graph_writer import DEFAULT_BUFFER_SIZE
+from pycograph.incremental_update import GraphUpdateResult
+from pycograph.schemas.pycograph_input import PycographLoadInput, read_manifest
 
 app = typer.Typer()
 
@@ -24,6 +28,20 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+def positive_callback(value: Optional[float]) -> Optional[float]:
+    """Validate an option that must be greater than 0 if it's provided.
+
+    :param value: The option's value.
+    :type value: Optional[float]
+    :raises typer.BadParameter: If the value is 0 or negative.
+    :return: The value.
+    :rtype: Optional[float]
+    """
+    if value is not None and value <= 0:
+        raise typer.BadParameter("The value must be greater than 0.")
+    return value
+
+
 @app.callback()
 def callback(
     version: Optional[bool] = typer.Option(
@@ -35,39 +53,419 @@ def callback(
 
 @app.command()
 def load(
-    project_dir: Optional[str] = None,
+    project_dir: Optional[List[str]] = typer.Option(
+        None, help="A root directory of the project. Repeatable."
+    ),
+    manifest: Optional[str] = typer.Option(
+        None, help="A file listing the project's root directories, one per line."
+    ),
     graph_name: Optional[str] = None,
     overwrite: bool = typer.Option(
         False, help="If a graph with this name already exists, delete it."
     ),
+    incremental: bool = typer.Option(
+        False, help="Rewrite only the parts of the graph that changed."
+    ),
+    upsert: bool = typer.Option(
+        False,
+        help="Merge the nodes and edges into the graph instead of adding copies.",
+    ),
+    swap: bool = typer.Option(
+        False,
+        help="Build the graph under a temporary name and swap it in when complete.",
+    ),
+    stream: bool = typer.Option(
+        False, help="Write the nodes and edges in batches while parsing."
+    ),
+    buffer_size: int = typer.Option(
+        DEFAULT_BUFFER_SIZE,
+        min=1,
+        help="Nodes and edges buffered before writing them with --stream.",
+    ),
+    max_in_flight: int = typer.Option(
+        1,
+        min=1,
+        help="Batches written concurrently while parsing with --stream.",
+    ),
+    bulk: bool = typer.Option(
+        False, help="Create a new graph with bulk insert commands, for big projects."
+    ),
+    bulk_batch_size: int = typer.Option(
+        64, min=1, help="The maximal size of a bulk insert command in MiB."
+    ),
+    batch_size: int = typer.Option(
+        1000, min=1, help="The initial number of nodes or edges written in one query."
+    ),
+    batch_latency: float = typer.Option(
+        0.2,
+        min=0,
+        help="Target seconds per query, the batch size adapts to it. 0: fixed size.",
+    ),
     test_types: bool = typer.Option(
         False, help="Determine the test types by detecting subdirectories of tests."
     ),
+    aggregate_calls: bool = typer.Option(
+        True, help="Merge the identical calls of an object into one edge with a count."
+    ),
+    external_imports: bool = typer.Option(
+        False,
+        help="Resolve the imports of the standard library and installed packages.",
+    ),
     redis_host: Optional[str] = typer.Option(None, help="Redis instance host."),
     redis_port: Optional[int] = typer.Option(None, help="Redis instance port."),
+    redis_socket: Optional[str] = typer.Option(
+        None, help="Unix domain socket of the Redis instance, instead of host and port."
+    ),
+    redis_timeout: Optional[float] = typer.Option(
+        None,
+        callback=positive_callback,
+        help="Seconds to wait for a Redis response. Default: no limit.",
+    ),
+    redis_connect_timeout: Optional[float] = typer.Option(
+        None,
+        callback=positive_callback,
+        help="Seconds to wait for a Redis connection over TCP. Default: no limit.",
+    ),
+    pipeline_depth: int = typer.Option(
+        1, min=1, help="The number of write queries sent in one round trip."
+    ),
+    jobs: int = typer.Option(
+        1, min=0, help="Number of processes parsing the modules. 0: one per CPU."
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None, help="Parse only the files matching this glob. Repeatable."
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, help="Skip the files and directories matching this glob. Repeatable."
+    ),
+    default_excludes: bool = typer.Option(
+        True, help="Skip virtual environments, VCS, build and cache directories."
+    ),
+    gitignore: bool = typer.Option(
+        False, help="Skip the files and directories ignored by .gitignore files."
+    ),
+    max_file_size: int = typer.Option(
+        0, min=0, help="Skip the files bigger than this size in MiB. 0: no limit."
+    ),
+    cache: bool = typer.Option(
+        False,
+        help="Store the parsed modules in the project's .pycograph-cache directory "
+        "and skip parsing unchanged ones.",
+    ),
+    clear_cache: bool = typer.Option(
+        False, help="Delete the parse cache before loading."
+    ),
+    cache_size: int = typer.Option(
+        512, min=1, help="The maximal size of the parse cache in MiB."
+    ),
     version: Optional[bool] = typer.Option(
         None, "--version", callback=version_callback, is_eager=True
     ),
 ):
     """Load a Python project's code into a graph model."""
+    _update_settings(
+        overwrite, test_types, aggregate_calls, redis_host, redis_port, jobs
+    )
+    _update_connection_settings(
+        redis_socket, redis_timeout, redis_connect_timeout, pipeline_depth
+    )
+    settings.resolve_external_imports = external_imports
+    _update_discovery_settings(
+        include, exclude, default_excludes, gitignore, max_file_size
+    )
+    settings.use_parse_cache = cache
+    settings.clear_parse_cache = clear_cache
+    settings.parse_cache_max_size = cache_size * 1024 * 1024
+    settings.batch_size = batch_size
+    settings.batch_latency = batch_latency
+    settings.bulk_batch_size = bulk_batch_size * 1024 * 1024
+    if incremental + stream + bulk > 1:
+        typer.echo(
+            "The --incremental, --stream and --bulk options can't be combined.",
+            err=True,
+        )
+        return
+    if upsert and (incremental or bulk):
+        typer.echo(
+            "The --upsert option can't be combined with --incremental or --bulk.",
+            err=True,
+        )
+        return
+    if swap and incremental:
+        typer.echo("The --swap option can't be combined with --incremental.", err=True)
+        return
+    settings.upsert = upsert
+    settings.swap_graph = swap
+    try:
+        load_input = _load_input(project_dir, manifest, graph_name)
+        if incremental:
+            update_result = pycograph.update(load_input)
+        elif stream and max_in_flight > 1:
+            update_result = asyncio.run(
+                pycograph.aload(load_input, buffer_size, max_in_flight)
+            )
+        elif stream:
+            update_result = pycograph.stream(load_input, buffer_size)
+        elif bulk:
+            update_result = pycograph.bulk(load_input)
+        else:
+            update_result = pycograph.write(load_input)
+    except PycographException as e:
+        typer.echo(e, err=True)
+        return
+    if incremental:
+        output = _update_output(update_result)
+    else:
+        output = {
+            "graph name": update_result.graph_name,
+            "nodes added": update_result.nodes_added,
+            "edges added": update_result.edges_added,
+            "round trips saved": update_result.round_trips_saved(),
+        }
+    typer.echo("Graph successfully updated.")
+    typer.echo(output)
+
+
+@app.command()
+def export(
+    output: str = typer.Option(
+        ..., "--output", "--output-dir", help="The directory of the exported files."
+    ),
+    export_format: ExportFormat = typer.Option(
+        ExportFormat.csv, "--format", help="The format of the files."
+    ),
+    compression: Compression = typer.Option(
+        Compression.none, help="The compression of the files."
+    ),
+    project_dir: Optional[List[str]] = typer.Option(
+        None, help="A root directory of the project. Repeatable."
+    ),
+    manifest: Optional[str] = typer.Option(
+        None, help="A file listing the project's root directories, one per line."
+    ),
+    graph_name: Optional[str] = typer.Option(
+        None, help="The graph name in the printed bulk loader command of --format csv."
+    ),
+    test_types: bool = typer.Option(
+        False, help="Determine the test types by detecting subdirectories of tests."
+    ),
+    aggregate_calls: bool = typer.Option(
+        True, help="Merge the identical calls of an object into one edge with a count."
+    ),
+    external_imports: bool = typer.Option(
+        False,
+        help="Resolve the imports of the standard library and installed packages.",
+    ),
+    jobs: int = typer.Option(
+        1, min=0, help="Number of processes parsing the modules. 0: one per CPU."
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None, help="Parse only the files matching this glob. Repeatable."
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, help="Skip the files and directories matching this glob. Repeatable."
+    ),
+    default_excludes: bool = typer.Option(
+        True, help="Skip virtual environments, VCS, build and cache directories."
+    ),
+    gitignore: bool = typer.Option(
+        False, help="Skip the files and directories ignored by .gitignore files."
+    ),
+    max_file_size: int = typer.Option(
+        0, min=0, help="Skip the files bigger than this size in MiB. 0: no limit."
+    ),
+    version: Optional[bool] = typer.Option(
+        None, "--version", callback=version_callback, is_eager=True
+    ),
+):
+    """Export the graph model to JSON Lines, CSV or GraphML files without Redis."""
+    settings.determine_test_types = test_types
+    settings.aggregate_calls = aggregate_calls
+    settings.jobs = jobs
+    settings.resolve_external_imports = external_imports
+    _update_discovery_settings(
+        include, exclude, default_excludes, gitignore, max_file_size
+    )
+    try:
+        load_input = _load_input(project_dir, manifest, graph_name)
+        export_result = pycograph.export(load_input, output, export_format, compression)
+    except PycographException as e:
+        typer.echo(e, err=True)
+        return
+    typer.echo(
+        {
+            "files": len(export_result.paths),
+            "nodes exported": export_result.nodes_exported,
+            "edges exported": export_result.edges_exported,
+        }
+    )
+    if export_result.bulk_loader_args:
+        command = ["redisgraph-bulk-insert", load_input.graph_name]
+        typer.echo(" ".join(command + export_result.bulk_loader_args))
+
+
+@app.command()
+def watch(
+    project_dir: Optional[List[str]] = typer.Option(
+        None, help="A root directory of the project. Repeatable."
+    ),
+    manifest: Optional[str] = typer.Option(
+        None, help="A file listing the project's root directories, one per line."
+    ),
+    graph_name: Optional[str] = None,
+    overwrite: bool = typer.Option(
+        False, help="If a graph with this name already exists, delete it first."
+    ),
+    test_types: bool = typer.Option(
+        False, help="Determine the test types by detecting subdirectories of tests."
+    ),
+    aggregate_calls: bool = typer.Option(
+        True, help="Merge the identical calls of an object into one edge with a count."
+    ),
+    external_imports: bool = typer.Option(
+        False,
+        help="Resolve the imports of the standard library and installed packages.",
+    ),
+    redis_host: Optional[str] = typer.Option(None, help="Redis instance host."),
+    redis_port: Optional[int] = typer.Option(None, help="Redis instance port."),
+    redis_socket: Optional[str] = typer.Option(
+        None, help="Unix domain socket of the Redis instance, instead of host and port."
+    ),
+    redis_timeout: Optional[float] = typer.Option(
+        None,
+        callback=positive_callback,
+        help="Seconds to wait for a Redis response. Default: no limit.",
+    ),
+    redis_connect_timeout: Optional[float] = typer.Option(
+        None,
+        callback=positive_callback,
+        help="Seconds to wait for a Redis connection over TCP. Default: no limit.",
+    ),
+    pipeline_depth: int = typer.Option(
+        1, min=1, help="The number of write queries sent in one round trip."
+    ),
+    jobs: int = typer.Option(
+        1, min=0, help="Number of processes parsing the modules. 0: one per CPU."
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None, help="Parse only the files matching this glob. Repeatable."
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, help="Skip the files and directories matching this glob. Repeatable."
+    ),
+    default_excludes: bool = typer.Option(
+        True, help="Skip virtual environments, VCS, build and cache directories."
+    ),
+    gitignore: bool = typer.Option(
+        False, help="Skip the files and directories ignored by .gitignore files."
+    ),
+    max_file_size: int = typer.Option(
+        0, min=0, help="Skip the files bigger than this size in MiB. 0: no limit."
+    ),
+    interval: float = typer.Option(
+        1.0, min=0, help="Seconds between two checks for changed files."
+    ),
+    debounce: float = typer.Option(
+        0.5, min=0, help="Seconds without changes before the graph is updated."
+    ),
+    version: Optional[bool] = typer.Option(
+        None, "--version", callback=version_callback, is_eager=True
+    ),
+):
+    """Update the graph model whenever the project's .py files change."""
+    _update_settings(
+        overwrite, test_types, aggregate_calls, redis_host, redis_port, jobs
+    )
+    _update_connection_settings(
+        redis_socket, redis_timeout, redis_connect_timeout, pipeline_depth
+    )
+    settings.resolve_external_imports = external_imports
+    _update_discovery_settings(
+        include, exclude, default_excludes, gitignore, max_file_size
+    )
+    try:
+        load_input = _load_input(project_dir, manifest, graph_name)
+        project_dirs = ", ".join(str(path) for path in load_input.project_dir_paths)
+        typer.echo(f"Watching {project_dirs}. Press Ctrl+C to stop.")
+        for update_result, duration in pycograph.watch(load_input, interval, debounce):
+            output = _update_output(update_result)
+            output["seconds"] = round(duration, 3)
+            typer.echo(output)
+    except PycographException as e:
+        typer.echo(e, err=True)
+    except KeyboardInterrupt:
+        typer.echo("Stopped watching.")
+
+
+def _load_input(
+    project_dir: Optional[List[str]],
+    manifest: Optional[str],
+    graph_name: Optional[str],
+) -> PycographLoadInput:
+    """Create the input from the project directories and the manifest's entries."""
+    project_dir_paths = list(project_dir or [])
+    if manifest:
+        project_dir_paths.extend(read_manifest(manifest))
+    return PycographLoadInput(
+        project_dir_paths=project_dir_paths, graph_name=graph_name
+    )
+
+
+def _update_settings(
+    overwrite: bool,
+    test_types: bool,
+    aggregate_calls: bool,
+    redis_host: Optional[str],
+    redis_port: Optional[int],
+    jobs: int,
+) -> None:
+    """Store the options shared by the commands in the settings."""
     settings.overwrite_existing_graph = overwrite
     settings.determine_test_types = test_types
+    settings.aggregate_calls = aggregate_calls
+    settings.jobs = jobs
     if redis_host:
         settings.redis_host = redis_host
     if redis_port:
         settings.redis_port = redis_port
-    try:
-        load_input = PycographLoadInput(
-            project_dir_path=project_dir, graph_name=graph_name
-        )
-        redis_graph = pycograph.load(load_input)
-    except PycographException as e:
-        typer.echo(e, err=True)
-        return
-    output = {
-        "graph name": redis_graph.name,
-        "nodes added": len(redis_graph.nodes),
-        "edges added": len(redis_graph.edges),
+
+
+def _update_connection_settings(
+    redis_socket: Optional[str],
+    redis_timeout: Optional[float],
+    redis_connect_timeout: Optional[float],
+    pipeline_depth: int,
+) -> None:
+    """Store the options of the Redis connection in the settings."""
+    settings.redis_socket = redis_socket
+    settings.redis_socket_timeout = redis_timeout
+    settings.redis_connect_timeout = redis_connect_timeout
+    settings.pipeline_depth = pipeline_depth
+
+
+def _update_discovery_settings(
+    include: Optional[List[str]],
+    exclude: Optional[List[str]],
+    default_excludes: bool,
+    gitignore: bool,
+    max_file_size: int,
+) -> None:
+    """Store the options of the file discovery in the settings."""
+    settings.include = list(include or [])
+    settings.exclude = list(exclude or [])
+    settings.use_default_excludes = default_excludes
+    settings.use_gitignore = gitignore
+    settings.max_file_size = max_file_size * 1024 * 1024
+
+
+def _update_output(update_result: GraphUpdateResult) -> Dict[str, Any]:
+    """Summarize an incremental update for the output."""
+    return {
+        "graph name": update_result.graph_name,
+        "modules added": update_result.modules_added,
+        "modules changed": update_result.modules_changed,
+        "modules removed": update_result.modules_removed,
+        "nodes added": update_result.nodes_added,
+        "edges added": update_result.edges_added,
+        "round trips saved": update_result.round_trips_saved(),
     }
-    typer.echo("Graph successfully updated.")
-    typer.echo(output)
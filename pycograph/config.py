@@ -1,15 +1,81 @@
-"""Configuration for Pycograph."""
+"""Configuration for Pycograph.
+
+The CLI stores its options in the global `settings`.
+A load can run with its own `Settings` object instead, activated by `use_settings`.
+The active settings are stored in a context variable,
+so loads with different settings can run concurrently in threads.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
 
 from pydantic import BaseSettings
 
+from pycograph.file_discovery import DEFAULT_MAX_FILE_SIZE
+from pycograph.parse_cache import DEFAULT_MAX_SIZE
+
 
 class Settings(BaseSettings):
     """Settings class."""
 
     overwrite_existing_graph: bool = False
+    upsert: bool = False
+    swap_graph: bool = False
     determine_test_types: bool = False
+    aggregate_calls: bool = True
+    resolve_external_imports: bool = False
     redis_host: str = "localhost"
     redis_port: int = 6379
+    redis_socket: Optional[str] = None
+    redis_socket_timeout: Optional[float] = None
+    redis_connect_timeout: Optional[float] = None
+    pipeline_depth: int = 1
+    jobs: int = 1
+    use_parse_cache: bool = False
+    clear_parse_cache: bool = False
+    parse_cache_dir: Optional[str] = None
+    parse_cache_max_size: int = DEFAULT_MAX_SIZE
+    include: List[str] = []
+    exclude: List[str] = []
+    use_default_excludes: bool = True
+    use_gitignore: bool = False
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+    batch_size: int = 1000
+    batch_latency: float = 0.2
+    bulk_batch_size: int = 64 * 1024 * 1024
 
 
 settings = Settings()
+
+_active_settings: ContextVar[Optional[Settings]] = ContextVar(
+    "active_settings", default=None
+)
+
+
+def active_settings() -> Settings:
+    """The settings of the current load.
+
+    :return: The settings activated by `use_settings`, otherwise the global settings.
+    :rtype: Settings
+    """
+    return _active_settings.get() or settings
+
+
+@contextmanager
+def use_settings(config: Optional[Settings]) -> Iterator[Settings]:
+    """Activate settings in the current context.
+
+    :param config: The settings to activate, None keeps the active settings.
+    :type config: Optional[Settings]
+    :return: The active settings.
+    :rtype: Iterator[Settings]
+    """
+    if config is None:
+        yield active_settings()
+        return
+    token = _active_settings.set(config)
+    try:
+        yield config
+    finally:
+        _active_settings.reset(token)
@@ -13,6 +13,10 @@ class RedisConnectionException(PycographException):
     """Wraps errors connecting to the Redis database."""
 
 
+class RedisTimeoutException(PycographException):
+    """Wraps timeouts waiting for the Redis database."""
+
+
 class RedisResponseException(PycographException):
     """Wraps unclassified ResponseError from a the RedisGraph client library."""
 
@@ -23,3 +27,15 @@ class RedisWithoutGraphException(PycographException):
 
 class ModuleWithInvalidContentException(PycographException):
     """A module containing invalid syntax."""
+
+
+class InvalidManifestException(PycographException):
+    """A manifest of project roots that can't be read."""
+
+
+class GraphExistsException(PycographException):
+    """A graph that exists already, but should be created."""
+
+
+class GraphSwapException(PycographException):
+    """A new graph that can't replace the live graph."""
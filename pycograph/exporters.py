@@ -0,0 +1,414 @@
+"""Export the graph model of a ParseResult to files, without Redis.
+
+The nodes and edges are written while iterating over the parse result,
+so no graph model is built in memory:
+
+* `jsonl`: `nodes.jsonl` and `edges.jsonl` with a JSON object per line.
+* `csv`: a file per label and per relationship name in the format of the
+  redisgraph-bulk-loader, with integer node IDs.
+* `graphml`: `graph.graphml`. The property keys must be declared before the graph,
+  so the nodes and edges are written to a temporary file first
+  and copied after the declarations.
+
+Each file can be compressed with gzip, bz2 or xz.
+"""
+
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import IO, Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from pycograph.schemas.parse_result import ObjectWithContext, ParseResult, Relationship
+
+GRAPHML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+)
+
+
+class ExportFormat(str, Enum):
+    """The file formats of the export."""
+
+    jsonl = "jsonl"
+    csv = "csv"
+    graphml = "graphml"
+
+
+class Compression(str, Enum):
+    """The compressions of the exported files."""
+
+    none = "none"
+    gzip = "gzip"
+    bz2 = "bz2"
+    xz = "xz"
+
+
+# compression => function opening a file, file name suffix
+_OPENERS = {
+    Compression.none: (open, ""),
+    Compression.gzip: (gzip.open, ".gz"),
+    Compression.bz2: (bz2.open, ".bz2"),
+    Compression.xz: (lzma.open, ".xz"),
+}
+
+
+class ExportResult:
+    """The summary of an export."""
+
+    __slots__ = ("paths", "nodes_exported", "edges_exported", "bulk_loader_args")
+
+    def __init__(
+        self,
+        *,
+        paths: List[str],
+        nodes_exported: int,
+        edges_exported: int,
+        bulk_loader_args: List[str],
+    ) -> None:
+        self.paths = paths
+        self.nodes_exported = nodes_exported
+        self.edges_exported = edges_exported
+        # The arguments of the redisgraph-bulk-insert command loading the files,
+        # empty if the files can't be loaded with it.
+        self.bulk_loader_args = bulk_loader_args
+
+
+class Exporter(ABC):
+    """Write the nodes and edges to files in one format."""
+
+    def __init__(self, output_dir: str, compression: Compression) -> None:
+        """Initialize an exporter.
+
+        :param output_dir: The directory where the files are written.
+        :type output_dir: str
+        :param compression: The compression of the files.
+        :type compression: Compression
+        """
+        self.output_dir = output_dir
+        self.compression = compression
+        self.paths: List[str] = []
+        self._files: List[IO[str]] = []
+
+    @abstractmethod
+    def write_node(self, node_id: int, obj: ObjectWithContext) -> None:
+        """Write a node.
+
+        :param node_id: The node's integer ID, its index in the parse result.
+        :type node_id: int
+        :param obj: The object represented by the node.
+        :type obj: ObjectWithContext
+        """
+
+    @abstractmethod
+    def write_edge(
+        self,
+        source_id: int,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination_id: int,
+        destination: ObjectWithContext,
+    ) -> None:
+        """Write an edge. All nodes are written before the edges.
+
+        :param source_id: The source node's integer ID.
+        :type source_id: int
+        :param source: The source object.
+        :type source: ObjectWithContext
+        :param relationship: The relationship represented by the edge.
+        :type relationship: Relationship
+        :param destination_id: The destination node's integer ID.
+        :type destination_id: int
+        :param destination: The destination object.
+        :type destination: ObjectWithContext
+        """
+
+    def close(self) -> None:
+        """Finish and close the files."""
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def bulk_loader_args(self) -> List[str]:
+        """The arguments of the redisgraph-bulk-insert command loading the files."""
+        return []
+
+    def open(self, file_name: str) -> IO[str]:
+        """Open an output file for writing text, compressed if requested.
+
+        :param file_name: The file's name without the compression's suffix.
+        :type file_name: str
+        :return: The open file, which is closed by `close`.
+        :rtype: IO[str]
+        """
+        opener, suffix = _OPENERS[self.compression]
+        path = os.path.join(self.output_dir, file_name + suffix)
+        f = opener(path, "wt", encoding="utf-8", newline="")
+        self.paths.append(path)
+        self._files.append(f)
+        return f
+
+
+class JsonLinesExporter(Exporter):
+    """Write the nodes and edges as JSON objects, one per line.
+
+    The nodes and edges refer to the nodes by their full names.
+    """
+
+    def __init__(self, output_dir: str, compression: Compression) -> None:
+        super().__init__(output_dir, compression)
+        self._nodes = self.open("nodes.jsonl")
+        self._edges = self.open("edges.jsonl")
+
+    def write_node(self, node_id: int, obj: ObjectWithContext) -> None:
+        line = {
+            "id": obj.full_name,
+            "label": obj.label(),
+            "properties": obj.node_properties(),
+        }
+        self._nodes.write(json.dumps(line) + "\n")
+
+    def write_edge(
+        self,
+        source_id: int,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination_id: int,
+        destination: ObjectWithContext,
+    ) -> None:
+        line = {
+            "source": source.full_name,
+            "type": relationship.name,
+            "target": destination.full_name,
+            "properties": relationship.properties(),
+        }
+        self._edges.write(json.dumps(line) + "\n")
+
+
+class CsvExporter(Exporter):
+    """Write a CSV file per label or relationship name and property keys.
+
+    The first column of the node files is the node's integer ID,
+    the first two columns of the edge files are the IDs of the source and the
+    destination. The headers of these columns start with an underscore,
+    so the bulk loader doesn't store them as properties.
+    A label or relationship name with several property key sets gets a file
+    per key set, e.g. `imports.csv` and `imports-2.csv`.
+    """
+
+    def __init__(self, output_dir: str, compression: Compression) -> None:
+        super().__init__(output_dir, compression)
+        # (name, property keys) => CSV writer
+        self._writers: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        self._file_counts: Dict[str, int] = {}
+        # "-N" or "-R", name, path
+        self._bulk_loader_files: List[Tuple[str, str, str]] = []
+
+    def write_node(self, node_id: int, obj: ObjectWithContext) -> None:
+        properties = obj.node_properties()
+        writer = self._writer("-N", obj.label(), ["_id"], tuple(properties.keys()))
+        writer.writerow([node_id, *map(_csv_value, properties.values())])
+
+    def write_edge(
+        self,
+        source_id: int,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination_id: int,
+        destination: ObjectWithContext,
+    ) -> None:
+        properties = relationship.properties()
+        writer = self._writer(
+            "-R", relationship.name, ["_src", "_dest"], tuple(properties.keys())
+        )
+        writer.writerow(
+            [source_id, destination_id, *map(_csv_value, properties.values())]
+        )
+
+    def bulk_loader_args(self) -> List[str]:
+        # The bulk loader reads only uncompressed files.
+        if self.compression != Compression.none:
+            return []
+        args = []
+        for option, name, path in self._bulk_loader_files:
+            args.extend([option, name, path])
+        return args
+
+    def _writer(
+        self, option: str, name: str, id_columns: List[str], keys: Tuple[str, ...]
+    ) -> Any:
+        """Find or create the writer of a label or relationship name and keys."""
+        writer = self._writers.get((name, keys))
+        if writer is None:
+            count = self._file_counts.get(name, 0) + 1
+            self._file_counts[name] = count
+            file_name = f"{name}.csv" if count == 1 else f"{name}-{count}.csv"
+            f = self.open(file_name)
+            writer = csv.writer(f)
+            writer.writerow(id_columns + list(keys))
+            self._writers[(name, keys)] = writer
+            self._bulk_loader_files.append((option, name, self.paths[-1]))
+        return writer
+
+
+class GraphMLExporter(Exporter):
+    """Write the nodes and edges as a GraphML document.
+
+    The nodes are identified by their full names,
+    the labels and relationship names are stored in the `label` attributes.
+    """
+
+    def __init__(self, output_dir: str, compression: Compression) -> None:
+        super().__init__(output_dir, compression)
+        self._body = tempfile.TemporaryFile(
+            "w+t", encoding="utf-8", dir=output_dir, suffix=".graphml"
+        )
+        # (domain, property key) => GraphML type
+        self._keys: Dict[Tuple[str, str], str] = {}
+
+    def write_node(self, node_id: int, obj: ObjectWithContext) -> None:
+        self._body.write(
+            f"<node id={quoteattr(obj.full_name)}>"
+            f"{self._data('node', {'label': obj.label(), **obj.node_properties()})}"
+            "</node>\n"
+        )
+
+    def write_edge(
+        self,
+        source_id: int,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination_id: int,
+        destination: ObjectWithContext,
+    ) -> None:
+        properties = {"label": relationship.name, **relationship.properties()}
+        self._body.write(
+            f"<edge source={quoteattr(source.full_name)} "
+            f"target={quoteattr(destination.full_name)}>"
+            f"{self._data('edge', properties)}</edge>\n"
+        )
+
+    def close(self) -> None:
+        try:
+            f = self.open("graph.graphml")
+            f.write(GRAPHML_HEADER)
+            for (domain, key), graphml_type in self._keys.items():
+                key_id = quoteattr(_key_id(domain, key))
+                f.write(
+                    f"<key id={key_id} for={quoteattr(domain)} "
+                    f"attr.name={quoteattr(key)} "
+                    f"attr.type={quoteattr(graphml_type)}/>\n"
+                )
+            f.write('<graph edgedefault="directed">\n')
+            self._body.seek(0)
+            shutil.copyfileobj(self._body, f)
+            f.write("</graph>\n</graphml>\n")
+        finally:
+            self._body.close()
+            super().close()
+
+    def _data(self, domain: str, properties: Dict[str, Any]) -> str:
+        """Format the properties as data elements and declare their keys."""
+        elements = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            if (domain, key) not in self._keys:
+                self._keys[(domain, key)] = _graphml_type(value)
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            elements.append(
+                f"<data key={quoteattr(_key_id(domain, key))}>"
+                f"{escape(str(value))}</data>"
+            )
+        return "".join(elements)
+
+
+EXPORTERS = {
+    ExportFormat.jsonl: JsonLinesExporter,
+    ExportFormat.csv: CsvExporter,
+    ExportFormat.graphml: GraphMLExporter,
+}
+
+
+def export_parse_result(
+    parse_result: ParseResult,
+    output_dir: str,
+    export_format: ExportFormat = ExportFormat.jsonl,
+    compression: Optional[Compression] = None,
+) -> ExportResult:
+    """Write the nodes and then the edges of a parse result to files.
+
+    The relationships pointing to unknown objects are skipped.
+
+    :param parse_result: A parsed Python project.
+    :type parse_result: ParseResult
+    :param output_dir: The directory where the files are written.
+    :type output_dir: str
+    :param export_format: The format of the files, defaults to ExportFormat.jsonl
+    :type export_format: ExportFormat
+    :param compression: The compression of the files, defaults to None
+    :type compression: Optional[Compression]
+    :return: The summary of the export.
+    :rtype: ExportResult
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    exporter = EXPORTERS[export_format](output_dir, compression or Compression.none)
+    objects = parse_result.objects
+    node_ids: Dict[str, int] = {}
+    edges_exported = 0
+    try:
+        for obj in objects.values():
+            node_id = len(node_ids)
+            node_ids[obj.full_name] = node_id
+            exporter.write_node(node_id, obj)
+        for obj in objects.values():
+            for rel in obj.relationships:
+                destination = objects.get(rel.destination_full_name)
+                if destination:
+                    exporter.write_edge(
+                        node_ids[obj.full_name],
+                        obj,
+                        rel,
+                        node_ids[destination.full_name],
+                        destination,
+                    )
+                    edges_exported += 1
+    finally:
+        exporter.close()
+    return ExportResult(
+        paths=exporter.paths,
+        nodes_exported=len(node_ids),
+        edges_exported=edges_exported,
+        bulk_loader_args=exporter.bulk_loader_args(),
+    )
+
+
+def _csv_value(value: Any) -> Any:
+    """Format a property value like the bulk loader's type inference expects it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else value
+
+
+def _graphml_type(value: Any) -> str:
+    """The GraphML type of a property value."""
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, float):
+        return "double"
+    return "string"
+
+
+def _key_id(domain: str, key: str) -> str:
+    """The ID of a GraphML key, e.g. `node_full_name`."""
+    return f"{domain}_{key}"
@@ -0,0 +1,186 @@
+"""Index the modules outside of the project: the stdlib and the installed packages.
+
+Only the top-level module names are collected by listing the directories,
+the modules aren't imported or parsed.
+The index is cached on disk with a fingerprint of the interpreter and of the
+environment's directories. A package installed or removed changes the modification
+time of its site-packages directory, so the cached index is rebuilt.
+The index belongs to the environment, not to a project,
+so it's cached in the user's cache directory and reused by all projects.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import site
+import sys
+import sysconfig
+from importlib.machinery import all_suffixes
+from typing import Any, FrozenSet, Iterable, List, Optional
+
+from pycograph.parse_cache import write_atomically
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "external-modules"
+
+
+class ExternalModuleIndex:
+    """The top-level names of the modules outside of the project."""
+
+    __slots__ = ("module_names",)
+
+    def __init__(self, module_names: Iterable[str]) -> None:
+        """Initialize an index with module names.
+
+        :param module_names: The top-level module names.
+        :type module_names: Iterable[str]
+        """
+        self.module_names: FrozenSet[str] = frozenset(module_names)
+
+    def top_level_module(self, full_name: str) -> Optional[str]:
+        """Find the external top-level module an absolute import is referring to.
+
+        :param full_name: The imported full name, e.g. `requests.adapters.HTTPAdapter`
+        :type full_name: str
+        :return: The top-level module's name, e.g. `requests`,
+        None if it's not an external module.
+        :rtype: Optional[str]
+        """
+        top_level_name = full_name.split(".", 1)[0]
+        if top_level_name in self.module_names:
+            return top_level_name
+        return None
+
+
+def load_index(cache_dir: Optional[str] = None) -> ExternalModuleIndex:
+    """Load the index from the cache or build it if the environment changed.
+
+    :param cache_dir: The directory where the index is cached,
+    defaults to None: the index isn't cached.
+    :type cache_dir: Optional[str]
+    :return: The index of the active environment.
+    :rtype: ExternalModuleIndex
+    """
+    search_paths = environment_paths()
+    fingerprint = environment_fingerprint(search_paths)
+    index_path = os.path.join(cache_dir, INDEX_FILE_NAME) if cache_dir else None
+    if index_path:
+        cached = _read_index(index_path)
+        if isinstance(cached, dict) and cached.get("fingerprint") == fingerprint:
+            return ExternalModuleIndex(cached["module_names"])
+
+    index = build_index(search_paths)
+    if index_path:
+        data = {"fingerprint": fingerprint, "module_names": sorted(index.module_names)}
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            write_atomically(index_path, marshal.dumps(data))
+        except OSError as e:
+            logger.warning(f"Could not write the external module index: {e}")
+    return index
+
+
+def user_cache_dir() -> str:
+    """Determine pycograph's directory in the user's cache directory.
+
+    :return: `$XDG_CACHE_HOME/pycograph`, by default `~/.cache/pycograph`.
+    :rtype: str
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "pycograph")
+
+
+def build_index(search_paths: List[str]) -> ExternalModuleIndex:
+    """Collect the top-level module names of the standard library and environment.
+
+    :param search_paths: The directories containing the modules.
+    :type search_paths: List[str]
+    :return: The index.
+    :rtype: ExternalModuleIndex
+    """
+    module_names = set(sys.builtin_module_names)
+    # Available since Python 3.10.
+    module_names.update(getattr(sys, "stdlib_module_names", ()))
+    suffixes = tuple(all_suffixes())
+    for search_path in search_paths:
+        try:
+            with os.scandir(search_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            name = _module_name(entry, suffixes)
+            if name:
+                module_names.add(name)
+    return ExternalModuleIndex(module_names)
+
+
+def environment_paths() -> List[str]:
+    """The directories of the standard library and the active environment's packages.
+
+    :return: The existing directories in the order of their precedence.
+    :rtype: List[str]
+    """
+    paths = sysconfig.get_paths()
+    candidates = [paths["stdlib"], paths["platstdlib"]]
+    candidates.append(os.path.join(paths["platstdlib"], "lib-dynload"))
+    candidates.extend(site.getsitepackages())
+    if site.ENABLE_USER_SITE:
+        candidates.append(site.getusersitepackages())
+    result: List[str] = []
+    for candidate in candidates:
+        if candidate not in result and os.path.isdir(candidate):
+            result.append(candidate)
+    return result
+
+
+def environment_fingerprint(search_paths: List[str]) -> str:
+    """Identify the interpreter and the state of the environment's directories.
+
+    :param search_paths: The directories containing the modules.
+    :type search_paths: List[str]
+    :return: A hexadecimal digest.
+    :rtype: str
+    """
+    state: List[Any] = [sys.executable, sys.version]
+    for search_path in search_paths:
+        try:
+            state.append((search_path, os.stat(search_path).st_mtime_ns))
+        except OSError:
+            continue
+    return hashlib.blake2b(repr(state).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_index(index_path: str) -> Any:
+    """Read a cached index, None if it doesn't exist or is invalid."""
+    try:
+        with open(index_path, "rb") as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _module_name(entry: os.DirEntry, suffixes: tuple) -> Optional[str]:
+    """Determine the top-level module name of a directory entry, if it's a module.
+
+    Packages (including namespace packages), source, bytecode and extension modules
+    are recognized. Directories like `foo-1.0.dist-info` aren't valid names.
+    """
+    name = entry.name
+    try:
+        is_dir = entry.is_dir()
+    except OSError:
+        return None
+    if is_dir:
+        return name if name.isidentifier() and name != "__pycache__" else None
+    for suffix in suffixes:
+        if name.endswith(suffix):
+            # e.g. `_ssl.cpython-311-x86_64-linux-gnu.so`
+            end = len(name) - len(suffix)
+            module_name = name[:end].split(".", 1)[0]
+            return module_name if module_name.isidentifier() else None
+    return None
@@ -0,0 +1,322 @@
+"""Find the Python files of a project.
+
+The directory tree is traversed with `os.scandir`
+and the excluded directories are pruned before descending into them.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from typing import Iterator, List, Optional, Pattern, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directories and files that don't contain the project's own code.
+# A pattern starting with `/` matches only at the project's root,
+# so a subpackage named e.g. `build` is still found.
+DEFAULT_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    ".eggs",
+    "*.egg-info",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".pycograph-cache",
+    "node_modules",
+    "/build",
+    "/dist",
+)
+# No limit by default, so no file is skipped because of its size.
+DEFAULT_MAX_FILE_SIZE = 0
+
+# A directory containing this file is a virtual environment.
+VIRTUALENV_MARKER = "pyvenv.cfg"
+
+
+class GitignoreRules:
+    """The patterns of the .gitignore files found so far.
+
+    Supported syntax: comments, negation with `!`, directory-only patterns with a
+    trailing `/`, patterns anchored by a `/` and the wildcards `*`, `?`, `[...]`
+    and `**`.
+    """
+
+    def __init__(self) -> None:
+        # (base directory relative to the root, regex, negated, directory only)
+        self.rules: List[Tuple[str, Pattern[str], bool, bool]] = []
+
+    def add_file(self, file_path: str, base_dir: str) -> None:
+        """Add the patterns of a .gitignore file.
+
+        :param file_path: The path of the .gitignore file.
+        :type file_path: str
+        :param base_dir: The file's directory relative to the project's root,
+        "" for the root.
+        :type base_dir: str
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            rule = _parse_gitignore_line(line)
+            if rule:
+                pattern, negated, dir_only = rule
+                self.rules.append((base_dir, pattern, negated, dir_only))
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Check whether a path is ignored. The last matching pattern wins.
+
+        :param rel_path: The path relative to the project's root with `/` separators.
+        :type rel_path: str
+        :param is_dir: Whether the path is a directory.
+        :type is_dir: bool
+        :return: True if the path is ignored.
+        :rtype: bool
+        """
+        ignored = False
+        for base_dir, pattern, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            path_in_base = rel_path
+            if base_dir:
+                prefix = base_dir + "/"
+                if not rel_path.startswith(prefix):
+                    continue
+                start = len(prefix)
+                path_in_base = rel_path[start:]
+            if pattern.match(path_in_base):
+                ignored = not negated
+        return ignored
+
+
+class FileDiscovery:
+    """Find the directories containing Python files."""
+
+    def __init__(
+        self,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        use_default_excludes: bool = True,
+        use_gitignore: bool = False,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    ) -> None:
+        """Initialize a discovery with filters.
+
+        The include and exclude patterns are globs,
+        matched against both the name and the path relative to the project's root.
+        An exclude pattern starting with `/` is matched only against the path
+        relative to the root.
+
+        :param include: If provided, only the files matching one of these patterns
+        are found, defaults to ()
+        :type include: Sequence[str]
+        :param exclude: The files and directories matching these patterns
+        are skipped, defaults to ()
+        :type exclude: Sequence[str]
+        :param use_default_excludes: Skip the DEFAULT_EXCLUDES and the virtual
+        environments as well, defaults to True
+        :type use_default_excludes: bool
+        :param use_gitignore: Skip the paths ignored by .gitignore files,
+        defaults to False
+        :type use_gitignore: bool
+        :param max_file_size: Skip the files bigger than this size in bytes,
+        0 means no limit, defaults to DEFAULT_MAX_FILE_SIZE
+        :type max_file_size: int
+        """
+        self.include = list(include)
+        self.exclude = list(exclude)
+        if use_default_excludes:
+            self.exclude.extend(DEFAULT_EXCLUDES)
+        self.use_default_excludes = use_default_excludes
+        self.use_gitignore = use_gitignore
+        self.max_file_size = max_file_size
+        self._include_regex = _globs_to_regex(self.include)
+        self._exclude_regex = _globs_to_regex(
+            [pattern for pattern in self.exclude if not pattern.startswith("/")]
+        )
+        self._anchored_exclude_regex = _globs_to_regex(
+            [pattern[1:] for pattern in self.exclude if pattern.startswith("/")]
+        )
+
+    def walk(self, root_dir_path: str) -> Iterator[Tuple[str, List[str]]]:
+        """Traverse a project's directory tree top-down in alphabetical order.
+
+        :param root_dir_path: The project's root directory.
+        :type root_dir_path: str
+        :return: Each directory containing Python files and the names of these files.
+        :rtype: Iterator[Tuple[str, List[str]]]
+        """
+        gitignore = GitignoreRules() if self.use_gitignore else None
+        # (directory path, path relative to the root)
+        stack = [(root_dir_path, "")]
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            entries = _scan(dir_path)
+            if entries is None:
+                continue
+            if self.use_default_excludes and any(
+                entry.name == VIRTUALENV_MARKER for entry in entries
+            ):
+                logger.info(f"Skipped the virtual environment {dir_path}")
+                continue
+            if gitignore is not None and any(
+                entry.name == ".gitignore" for entry in entries
+            ):
+                gitignore.add_file(os.path.join(dir_path, ".gitignore"), rel_dir)
+
+            file_names = []
+            sub_dirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                is_dir = _is_dir(entry)
+                if self._is_excluded(entry.name, rel_path):
+                    continue
+                if gitignore is not None and gitignore.is_ignored(rel_path, is_dir):
+                    continue
+                if is_dir:
+                    sub_dirs.append((entry.path, rel_path))
+                elif self._is_python_file(entry, rel_path):
+                    file_names.append(entry.name)
+            if file_names:
+                yield dir_path, file_names
+            stack.extend(reversed(sub_dirs))
+
+    def python_files(self, root_dir_path: str) -> Iterator[str]:
+        """Find the paths of a project's Python files.
+
+        :param root_dir_path: The project's root directory.
+        :type root_dir_path: str
+        :return: The file paths.
+        :rtype: Iterator[str]
+        """
+        for dir_path, file_names in self.walk(root_dir_path):
+            for file_name in file_names:
+                yield os.path.join(dir_path, file_name)
+
+    def _is_excluded(self, name: str, rel_path: str) -> bool:
+        regex = self._exclude_regex
+        if regex and (regex.match(name) or regex.match(rel_path)):
+            return True
+        anchored_regex = self._anchored_exclude_regex
+        return bool(anchored_regex and anchored_regex.match(rel_path))
+
+    def _is_python_file(self, entry: os.DirEntry, rel_path: str) -> bool:
+        if not entry.name.endswith(".py") or entry.name == "setup.py":
+            return False
+        regex = self._include_regex
+        if regex and not (regex.match(entry.name) or regex.match(rel_path)):
+            return False
+        if self.max_file_size:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                return False
+            if size > self.max_file_size:
+                logger.warning(
+                    f"Skipped {entry.path}, because its size {size} bytes"
+                    f" exceeds the limit of {self.max_file_size} bytes."
+                )
+                return False
+        return True
+
+
+def _globs_to_regex(patterns: List[str]) -> Optional[Pattern[str]]:
+    """Combine glob patterns into one regex, None if there are no patterns."""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def _scan(dir_path: str) -> Optional[List[os.DirEntry]]:
+    """List a directory's entries sorted by name, None if it can't be read."""
+    try:
+        with os.scandir(dir_path) as it:
+            return sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return None
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    """Check whether an entry is a directory, without following symlinks."""
+    try:
+        return entry.is_dir(follow_symlinks=False)
+    except OSError:
+        return False
+
+
+def _parse_gitignore_line(line: str) -> Optional[Tuple[Pattern[str], bool, bool]]:
+    """Convert a line of a .gitignore file into a regex.
+
+    :param line: The line.
+    :type line: str
+    :return: The regex, whether it's negated and whether it matches only
+    directories, None for empty lines and comments.
+    :rtype: Optional[Tuple[Pattern[str], bool, bool]]
+    """
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    if line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A pattern without a slash matches at any level.
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _glob_to_regex(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return re.compile(f"^{regex}$"), negated, dir_only
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regex matching paths with `/` separators."""
+    result = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            result.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("/**", index) and index + 3 == len(pattern):
+            result.append("/.*")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            result.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end == -1:
+                result.append(re.escape(char))
+            else:
+                class_start = index + 1
+                char_class = pattern[class_start:end].replace("\\", "\\\\")
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                result.append(f"[{char_class}]")
+                index = end
+        else:
+            result.append(re.escape(char))
+        index += 1
+    return "".join(result)
@@ -0,0 +1,320 @@
+"""Query the graph model of a ParseResult in memory, without Redis.
+
+The nodes get integer IDs, their index in the parse result.
+The edges of each relationship name are stored twice, by their sources and by
+their destinations, in compressed sparse row format: an array of offsets per
+node into an array of neighbor IDs.
+So the neighbors of a node are found without hashing and without a Python object
+per edge, and a store of a big project is compact.
+
+The methods working with IDs are the fastest, the ones working with full names
+look up the IDs in a dictionary.
+"""
+
+from array import array
+from collections import deque
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pycograph.schemas.parse_result import (
+    CALLS,
+    CONTAINS,
+    IMPORTS,
+    ObjectWithContext,
+    ParseResult,
+)
+
+DIRECTIONS = ("out", "in", "both")
+
+
+class Adjacency:
+    """The edges of one relationship name in one direction."""
+
+    __slots__ = ("offsets", "neighbors")
+
+    def __init__(self, node_count: int, sources: array, destinations: array) -> None:
+        """Sort the edges by their sources.
+
+        :param node_count: The number of nodes.
+        :type node_count: int
+        :param sources: The source ID of each edge.
+        :type sources: array
+        :param destinations: The destination ID of each edge.
+        :type destinations: array
+        """
+        counts = [0] * (node_count + 1)
+        for source in sources:
+            counts[source + 1] += 1
+        self.offsets = array("q", accumulate(counts))
+        self.neighbors = array("q", bytes(8 * len(destinations)))
+        positions = list(self.offsets)
+        for source, destination in zip(sources, destinations):
+            self.neighbors[positions[source]] = destination
+            positions[source] += 1
+
+    def __call__(self, node_id: int) -> Sequence[int]:
+        """The neighbors of a node.
+
+        :param node_id: The node's ID.
+        :type node_id: int
+        :return: The neighbors' IDs, once per edge.
+        :rtype: Sequence[int]
+        """
+        start = self.offsets[node_id]
+        end = self.offsets[node_id + 1]
+        return self.neighbors[start:end]
+
+
+class GraphStore:
+    """The nodes and edges of a ParseResult with adjacency indexes.
+
+    The objects of the parse result are referenced, not copied.
+    The relationships pointing to unknown objects are skipped.
+    """
+
+    __slots__ = ("objects", "ids", "_forward", "_reverse")
+
+    def __init__(self, parse_result: ParseResult) -> None:
+        """Index the nodes and edges of a parse result.
+
+        :param parse_result: A parsed Python project.
+        :type parse_result: ParseResult
+        """
+        self.objects: List[ObjectWithContext] = list(parse_result.objects.values())
+        self.ids: Dict[str, int] = {
+            obj.full_name: node_id for node_id, obj in enumerate(self.objects)
+        }
+        # relationship name => source IDs, destination IDs
+        edges: Dict[str, Tuple[array, array]] = {}
+        for source_id, obj in enumerate(self.objects):
+            for rel in obj.relationships:
+                destination_id = self.ids.get(rel.destination_full_name)
+                if destination_id is None:
+                    continue
+                if rel.name not in edges:
+                    edges[rel.name] = (array("q"), array("q"))
+                sources, destinations = edges[rel.name]
+                sources.append(source_id)
+                destinations.append(destination_id)
+
+        node_count = len(self.objects)
+        self._forward: Dict[str, Adjacency] = {}
+        self._reverse: Dict[str, Adjacency] = {}
+        for rel_name, (sources, destinations) in edges.items():
+            self._forward[rel_name] = Adjacency(node_count, sources, destinations)
+            self._reverse[rel_name] = Adjacency(node_count, destinations, sources)
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def relationship_names(self) -> List[str]:
+        """The names of the relationships with at least one edge."""
+        return list(self._forward)
+
+    def edge_count(self, rel_name: Optional[str] = None) -> int:
+        """The number of edges.
+
+        :param rel_name: Count only the edges of this relationship, defaults to None
+        :type rel_name: Optional[str]
+        :return: The number of edges.
+        :rtype: int
+        """
+        adjacencies = [self._forward[rel_name]] if rel_name else self._forward.values()
+        return sum(len(adjacency.neighbors) for adjacency in adjacencies)
+
+    def node_id(self, full_name: str) -> int:
+        """The ID of a node.
+
+        :param full_name: The node's full name.
+        :type full_name: str
+        :raises KeyError: If there's no node with this full name.
+        :return: The node's ID.
+        :rtype: int
+        """
+        return self.ids[full_name]
+
+    def node(self, node_id: int) -> ObjectWithContext:
+        """The object represented by a node.
+
+        :param node_id: The node's ID.
+        :type node_id: int
+        :return: The object, e.g. for its `label()` and `node_properties()`.
+        :rtype: ObjectWithContext
+        """
+        return self.objects[node_id]
+
+    def successors(self, node_id: int, rel_name: str) -> Sequence[int]:
+        """The destinations of a node's outgoing edges.
+
+        :param node_id: The node's ID.
+        :type node_id: int
+        :param rel_name: The relationship's name, e.g. `calls`.
+        :type rel_name: str
+        :return: The destinations' IDs, once per edge.
+        :rtype: Sequence[int]
+        """
+        adjacency = self._forward.get(rel_name)
+        return adjacency(node_id) if adjacency else ()
+
+    def predecessors(self, node_id: int, rel_name: str) -> Sequence[int]:
+        """The sources of a node's incoming edges.
+
+        :param node_id: The node's ID.
+        :type node_id: int
+        :param rel_name: The relationship's name, e.g. `calls`.
+        :type rel_name: str
+        :return: The sources' IDs, once per edge.
+        :rtype: Sequence[int]
+        """
+        adjacency = self._reverse.get(rel_name)
+        return adjacency(node_id) if adjacency else ()
+
+    def callees(self, full_name: str) -> List[str]:
+        """The objects called by an object."""
+        return self._names(self.successors(self.ids[full_name], CALLS))
+
+    def callers(self, full_name: str) -> List[str]:
+        """The objects calling an object."""
+        return self._names(self.predecessors(self.ids[full_name], CALLS))
+
+    def imports(self, full_name: str) -> List[str]:
+        """The objects imported by a module."""
+        return self._names(self.successors(self.ids[full_name], IMPORTS))
+
+    def importers(self, full_name: str) -> List[str]:
+        """The modules importing an object."""
+        return self._names(self.predecessors(self.ids[full_name], IMPORTS))
+
+    def container(self, full_name: str) -> Optional[str]:
+        """The package, module or class containing an object, if any."""
+        containers = self.predecessors(self.ids[full_name], CONTAINS)
+        return self.objects[containers[0]].full_name if containers else None
+
+    def subtree_ids(self, node_id: int) -> List[int]:
+        """A node and all the nodes it contains recursively.
+
+        :param node_id: The ID of the subtree's root.
+        :type node_id: int
+        :return: The IDs, starting with the root.
+        :rtype: List[int]
+        """
+        contains = self._forward.get(CONTAINS)
+        result = [node_id]
+        if contains:
+            # Each node has at most one container, so no node is visited twice.
+            for current in result:
+                result.extend(contains(current))
+        return result
+
+    def subtree(self, full_name: str) -> List[str]:
+        """An object and all the objects it contains recursively.
+
+        :param full_name: The full name of the subtree's root, e.g. a package.
+        :type full_name: str
+        :return: The full names, starting with the root.
+        :rtype: List[str]
+        """
+        return self._names(self.subtree_ids(self.ids[full_name]))
+
+    def neighborhood_ids(
+        self,
+        node_id: int,
+        hops: int,
+        rel_names: Optional[Iterable[str]] = None,
+        direction: str = "both",
+    ) -> Dict[int, int]:
+        """The nodes reachable within a number of hops.
+
+        :param node_id: The ID of the start node.
+        :type node_id: int
+        :param hops: The maximal number of edges on a path.
+        :type hops: int
+        :param rel_names: Follow only these relationships, defaults to all of them
+        :type rel_names: Optional[Iterable[str]]
+        :param direction: Follow the edges `out` of the nodes, `in` to them or
+        `both`, defaults to "both"
+        :type direction: str
+        :raises ValueError: If the direction is unknown.
+        :return: The distance of each reachable node, including the start node.
+        :rtype: Dict[int, int]
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"The direction must be one of {', '.join(DIRECTIONS)}.")
+        names = list(self._forward) if rel_names is None else list(rel_names)
+        adjacencies: List[Adjacency] = []
+        if direction in ("out", "both"):
+            adjacencies.extend(
+                self._forward[name] for name in names if name in self._forward
+            )
+        if direction in ("in", "both"):
+            adjacencies.extend(
+                self._reverse[name] for name in names if name in self._reverse
+            )
+
+        distances = {node_id: 0}
+        queue = deque([node_id])
+        while queue:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            if distance > hops:
+                continue
+            for adjacency in adjacencies:
+                for neighbor in adjacency(current):
+                    if neighbor not in distances:
+                        distances[neighbor] = distance
+                        queue.append(neighbor)
+        return distances
+
+    def neighborhood(
+        self,
+        full_name: str,
+        hops: int,
+        rel_names: Optional[Iterable[str]] = None,
+        direction: str = "both",
+    ) -> Dict[str, int]:
+        """The objects reachable within a number of hops.
+
+        :param full_name: The full name of the start object.
+        :type full_name: str
+        :param hops: The maximal number of edges on a path.
+        :type hops: int
+        :param rel_names: Follow only these relationships, defaults to all of them
+        :type rel_names: Optional[Iterable[str]]
+        :param direction: Follow the edges `out` of the nodes, `in` to them or
+        `both`, defaults to "both"
+        :type direction: str
+        :return: The distance of each reachable object by its full name,
+        including the start object.
+        :rtype: Dict[str, int]
+        """
+        distances = self.neighborhood_ids(
+            self.ids[full_name], hops, rel_names, direction
+        )
+        return {
+            self.objects[node_id].full_name: distance
+            for node_id, distance in distances.items()
+        }
+
+    def find_imports(self, source: str, destination: str) -> List[Tuple[str, str]]:
+        """Find the imports from one part of the project into another one.
+
+        E.g. whether anything in the `payments` package imports from `legacy`.
+
+        :param source: The full name of the importing part, e.g. a package.
+        :type source: str
+        :param destination: The full name of the imported part.
+        :type destination: str
+        :return: The importer's and the imported object's full name of each import.
+        :rtype: List[Tuple[str, str]]
+        """
+        destination_ids: Set[int] = set(self.subtree_ids(self.ids[destination]))
+        return [
+            (self.objects[importer].full_name, self.objects[imported].full_name)
+            for importer in self.subtree_ids(self.ids[source])
+            for imported in self.successors(importer, IMPORTS)
+            if imported in destination_ids
+        ]
+
+    def _names(self, node_ids: Iterable[int]) -> List[str]:
+        """The full names of the nodes, without duplicates, in the order of the IDs."""
+        return [self.objects[node_id].full_name for node_id in dict.fromkeys(node_ids)]
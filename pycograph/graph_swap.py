@@ -0,0 +1,106 @@
+"""Replace a graph with a newly built one in one step.
+
+A load with `--overwrite` deletes the graph first and then rebuilds it,
+so the graph's readers see it empty or half-built until the load is done.
+With a swap, the new graph is built under a temporary name next to the live one,
+and the live graph is replaced only when the new one is complete:
+
+* The live graph is renamed to a retired name and the new graph to the live name,
+  both in one transaction, so the readers never find the graph missing.
+* The retired graph is deleted with UNLINK, which frees its memory in the
+  background instead of blocking the Redis server.
+
+If the load fails, the temporary graph is deleted and the live graph is kept.
+"""
+
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+import redis  # type: ignore
+
+from pycograph.exceptions import GraphSwapException
+from pycograph.parse_result_to_redisgraph import handle_redis_errors, redis_connection
+
+
+@contextmanager
+def swapped_graph(graph_name: str) -> Iterator[str]:
+    """Build a graph under a temporary name and swap it in at the end.
+
+    :param graph_name: The name of the live graph.
+    :type graph_name: str
+    :return: The temporary name the graph should be built under.
+    :rtype: Iterator[str]
+    """
+    redis_instance = redis_connection()
+    building_name = temporary_graph_name(graph_name, "building")
+    try:
+        yield building_name
+    except BaseException:
+        try:
+            redis_instance.unlink(building_name)
+        except redis.exceptions.RedisError:
+            # The error of the load is more useful than the one of the cleanup.
+            pass
+        raise
+    swap_graph(redis_instance, building_name, graph_name)
+
+
+def swap_graph(
+    redis_instance: redis.Redis, building_name: str, graph_name: str
+) -> bool:
+    """Replace the live graph with the new one and free the old one asynchronously.
+
+    A plain RENAME onto the live graph would free the old graph synchronously,
+    blocking the server for the size of the graph,
+    so the old graph is renamed away in the same transaction and unlinked.
+
+    :param redis_instance: The Redis instance containing the graphs.
+    :type redis_instance: redis.Redis
+    :param building_name: The name of the new graph.
+    :type building_name: str
+    :param graph_name: The name of the live graph.
+    :type graph_name: str
+    :raises GraphSwapException: If the new graph doesn't exist.
+    :return: Whether a live graph was replaced.
+    :rtype: bool
+    """
+    retired_name = temporary_graph_name(graph_name, "retired")
+    with handle_redis_errors("swap"):
+        with redis_instance.pipeline() as pipeline:
+            while True:
+                try:
+                    # A load swapping the same graph concurrently restarts this one.
+                    pipeline.watch(graph_name, building_name)
+                    if not pipeline.exists(building_name):
+                        # A transaction isn't rolled back after a failed command,
+                        # so the live graph would be renamed away.
+                        raise GraphSwapException(
+                            f"The graph {building_name} doesn't exist, "
+                            f"so the graph {graph_name} is kept."
+                        )
+                    replaced = bool(pipeline.exists(graph_name))
+                    pipeline.multi()
+                    if replaced:
+                        pipeline.rename(graph_name, retired_name)
+                    pipeline.rename(building_name, graph_name)
+                    pipeline.execute()
+                    break
+                except redis.WatchError:
+                    continue
+        if replaced:
+            redis_instance.unlink(retired_name)
+    return replaced
+
+
+def temporary_graph_name(graph_name: str, purpose: str) -> str:
+    """Create a unique name for a graph next to the live one.
+
+    :param graph_name: The name of the live graph.
+    :type graph_name: str
+    :param purpose: Why the graph exists, e.g. `building`.
+    :type purpose: str
+    :return: The temporary name.
+    :rtype: str
+    """
+    return f"{graph_name}:{purpose}:{uuid.uuid4().hex}"
@@ -0,0 +1,620 @@
+"""Write nodes and edges to RedisGraph with parameterized UNWIND queries.
+
+The nodes and edges are grouped by their labels and property keys,
+so that each group is written with the same query.
+The rows of a group contain only the property values in the order of the keys.
+The edges look up their nodes by full name, using the indexes of their labels.
+
+In upsert mode, the nodes are merged on their label and full name
+and the edges on their nodes, relationship name and key properties,
+so loading the same project again doesn't duplicate anything.
+
+The rows are sent in batches, so no query grows with the size of the project
+and the Redis server isn't blocked for long by one query.
+The batch size adapts to the observed latency of the queries.
+Several queries can be sent in one round trip with Redis pipelining.
+"""
+
+import time
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional, Set, Tuple
+
+from redisgraph import Graph  # type: ignore
+
+from pycograph.config import active_settings
+from pycograph.parse_result_to_redisgraph import (
+    create_indexes,
+    delete_graph,
+    handle_redis_errors,
+    redis_connection,
+)
+from pycograph.schemas.parse_result import (
+    ObjectWithContext,
+    ParseResult,
+    Relationship,
+)
+
+# The limits of the number of rows sent to RedisGraph in one query.
+MIN_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 100000
+# The default number of rows a GraphWriter buffers before writing them.
+DEFAULT_BUFFER_SIZE = 10000
+
+# The edge properties updated by an upsert, the others identify the edge.
+EDGE_VALUE_PROPERTIES = ("count",)
+
+# label, property keys
+NodeGroup = Tuple[str, Tuple[str, ...]]
+# source label, relationship name, destination label, property keys
+EdgeGroup = Tuple[str, str, str, Tuple[str, ...]]
+
+
+class AdaptiveBatchSize:
+    """The number of rows sent in one query, adapted to the observed latency.
+
+    A query slower than the target latency halves the batch size.
+    A full batch written in less than half of the target latency doubles it.
+    """
+
+    __slots__ = ("size", "target_latency")
+
+    def __init__(self, size: int, target_latency: float) -> None:
+        """Initialize the batch size.
+
+        :param size: The initial number of rows in a batch.
+        :type size: int
+        :param target_latency: The target duration of a query in seconds,
+        0 means a fixed batch size.
+        :type target_latency: float
+        """
+        self.size = min(max(size, MIN_BATCH_SIZE), MAX_BATCH_SIZE)
+        self.target_latency = target_latency
+
+    def observe(self, rows: int, latency: float) -> None:
+        """Adapt the batch size to the duration of a query.
+
+        :param rows: The number of rows sent in the query.
+        :type rows: int
+        :param latency: The duration of the query in seconds.
+        :type latency: float
+        """
+        if not self.target_latency:
+            return
+        if latency > self.target_latency:
+            self.size = max(self.size // 2, MIN_BATCH_SIZE)
+        elif rows >= self.size and latency < self.target_latency / 2:
+            self.size = min(self.size * 2, MAX_BATCH_SIZE)
+
+
+class QueryPipeline:
+    """Send the write queries of a graph, several of them in one round trip.
+
+    Up to `depth` queries are queued and sent in a Redis pipeline,
+    so their responses are awaited only once.
+    Redis executes the commands in the order they were sent,
+    so the edges are still created after their nodes.
+    With a depth of 1, each query is sent on its own.
+    """
+
+    __slots__ = (
+        "redis_graph",
+        "depth",
+        "batch_size",
+        "queries",
+        "round_trips",
+        "_commands",
+        "_rows",
+    )
+
+    def __init__(
+        self,
+        redis_graph: Graph,
+        depth: int = 1,
+        batch_size: Optional[AdaptiveBatchSize] = None,
+    ) -> None:
+        """Initialize a pipeline for a graph.
+
+        :param redis_graph: The graph to write.
+        :type redis_graph: Graph
+        :param depth: The maximal number of queries sent in one round trip,
+        defaults to 1
+        :type depth: int
+        :param batch_size: The number of rows sent in one query,
+        defaults to a batch size based on the settings
+        :type batch_size: Optional[AdaptiveBatchSize]
+        """
+        self.redis_graph = redis_graph
+        self.depth = depth
+        self.batch_size = batch_size or adaptive_batch_size()
+        self.queries = 0
+        self.round_trips = 0
+        self._commands: List[Tuple[str, ...]] = []
+        # the number of rows of each queued command
+        self._rows: List[int] = []
+
+    def query_in_batches(self, query: str, rows: List[Any]) -> None:
+        """Send a query with the rows as its `$rows` parameter in batches.
+
+        :param query: The query unwinding the `$rows` parameter.
+        :type query: str
+        :param rows: The rows to send.
+        :type rows: List[Any]
+        """
+        start = 0
+        while start < len(rows):
+            end = start + self.batch_size.size
+            self.query(query, rows[start:end])
+            start = end
+
+    def query(self, query: str, rows: List[Any]) -> None:
+        """Send a query or queue it until the pipeline is full.
+
+        :param query: The query unwinding the `$rows` parameter.
+        :type query: str
+        :param rows: The rows of the query.
+        :type rows: List[Any]
+        """
+        if self.depth <= 1:
+            query_start = time.perf_counter()
+            with handle_redis_errors("write"):
+                self.redis_graph.query(query, {"rows": rows})
+            self._observe([len(rows)], time.perf_counter() - query_start)
+            return
+        params_header = build_params_header({"rows": rows})
+        self._commands.append(
+            ("GRAPH.QUERY", self.redis_graph.name, params_header + query, "--compact")
+        )
+        self._rows.append(len(rows))
+        if len(self._commands) >= self.depth:
+            self.execute()
+
+    def execute(self) -> None:
+        """Send the queued queries in one round trip and wait for their results."""
+        if not self._commands:
+            return
+        pipeline = self.redis_graph.redis_con.pipeline(transaction=False)
+        for command in self._commands:
+            pipeline.execute_command(*command)
+        query_start = time.perf_counter()
+        with handle_redis_errors("write"):
+            pipeline.execute()
+        self._observe(self._rows, time.perf_counter() - query_start)
+        self._commands = []
+        self._rows = []
+
+    def round_trips_saved(self) -> int:
+        """The number of round trips saved by sending several queries in one."""
+        return self.queries - self.round_trips
+
+    def _observe(self, rows: List[int], latency: float) -> None:
+        """Count a round trip and adapt the batch size to its queries' latency."""
+        self.queries += len(rows)
+        self.round_trips += 1
+        for query_rows in rows:
+            self.batch_size.observe(query_rows, latency / len(rows))
+
+
+class GraphWriter:
+    """Buffer nodes and edges and write them when the buffer is full.
+
+    The memory used for the graph model is bounded by the buffer size,
+    instead of the size of the project.
+    """
+
+    def __init__(
+        self,
+        redis_graph: Graph,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        batch_size: Optional[AdaptiveBatchSize] = None,
+        pipeline_depth: Optional[int] = None,
+        upsert: Optional[bool] = None,
+    ) -> None:
+        """Initialize a writer for a graph.
+
+        :param redis_graph: The graph to write.
+        :type redis_graph: Graph
+        :param buffer_size: The number of rows buffered before writing them,
+        defaults to DEFAULT_BUFFER_SIZE
+        :type buffer_size: int
+        :param batch_size: The number of rows sent in one query,
+        defaults to a batch size based on the settings
+        :type batch_size: Optional[AdaptiveBatchSize]
+        :param pipeline_depth: The maximal number of queries sent in one round trip,
+        defaults to the settings
+        :type pipeline_depth: Optional[int]
+        :param upsert: Merge the nodes and edges into the existing ones instead of
+        creating them, defaults to the settings
+        :type upsert: Optional[bool]
+        """
+        self.redis_graph = redis_graph
+        self.buffer_size = buffer_size
+        self.pipeline = query_pipeline(redis_graph, batch_size, pipeline_depth)
+        self.upsert = active_settings().upsert if upsert is None else upsert
+        self.nodes: DefaultDict[NodeGroup, List[List[Any]]] = defaultdict(list)
+        self.edges: DefaultDict[EdgeGroup, List[List[Any]]] = defaultdict(list)
+        self.nodes_added = 0
+        self.edges_added = 0
+        self._buffered_rows = 0
+        self._indexed_labels: Set[str] = set()
+
+    def add_node(self, obj: ObjectWithContext) -> None:
+        """Add a node to be written.
+
+        :param obj: The object represented by the node.
+        :type obj: ObjectWithContext
+        """
+        group, row = node_row(obj)
+        self.nodes[group].append(row)
+        self._add_row()
+
+    def add_edge(
+        self,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination: ObjectWithContext,
+    ) -> None:
+        """Add an edge to be written.
+
+        Both nodes must have been added before.
+
+        :param source: The source object.
+        :type source: ObjectWithContext
+        :param relationship: The relationship represented by the edge.
+        :type relationship: Relationship
+        :param destination: The destination object.
+        :type destination: ObjectWithContext
+        """
+        group, row = edge_row(source, relationship, destination)
+        self.edges[group].append(row)
+        self._add_row()
+
+    def add_parse_result(self, parse_result: ParseResult) -> None:
+        """Add all nodes and then all edges of a parse result to be written.
+
+        The relationships pointing to unknown objects are skipped.
+
+        :param parse_result: A parsed Python project.
+        :type parse_result: ParseResult
+        """
+        objects = parse_result.objects
+        for obj in objects.values():
+            self.add_node(obj)
+        for obj in objects.values():
+            for rel in obj.relationships:
+                destination = objects.get(rel.destination_full_name)
+                if destination:
+                    self.add_edge(obj, rel, destination)
+
+    def flush(self) -> None:
+        """Write the buffered nodes and then the buffered edges.
+
+        All queries are sent when the method returns.
+        """
+        labels = {label for label, _ in self.nodes}
+        for source_label, _, destination_label, _ in self.edges:
+            labels.add(source_label)
+            labels.add(destination_label)
+        create_indexes(self.redis_graph, labels - self._indexed_labels)
+        self._indexed_labels.update(labels)
+
+        for (label, keys), rows in self.nodes.items():
+            self.pipeline.query_in_batches(nodes_query(label, keys, self.upsert), rows)
+            self.nodes_added += len(rows)
+        for group, rows in self.edges.items():
+            self.pipeline.query_in_batches(edges_query(*group, self.upsert), rows)
+            self.edges_added += len(rows)
+        self.pipeline.execute()
+        self.nodes.clear()
+        self.edges.clear()
+        self._buffered_rows = 0
+
+    def _add_row(self) -> None:
+        self._buffered_rows += 1
+        if self._buffered_rows >= self.buffer_size:
+            self.flush()
+
+
+def open_graph(graph_name: str) -> Graph:
+    """Connect to the graph to be written.
+
+    :param graph_name: The name of the graph.
+    :type graph_name: str
+    :return: The graph, which is deleted first if it should be overwritten.
+    :rtype: Graph
+    """
+    redis_instance = redis_connection()
+    if active_settings().overwrite_existing_graph:
+        delete_graph(redis_instance, graph_name)
+    return Graph(graph_name, redis_instance)
+
+
+def node_row(obj: ObjectWithContext) -> Tuple[NodeGroup, List[Any]]:
+    """Convert an object into a row of a node group.
+
+    :param obj: The object represented by the node.
+    :type obj: ObjectWithContext
+    :return: The node group and the row.
+    :rtype: Tuple[NodeGroup, List[Any]]
+    """
+    properties = obj.node_properties()
+    return (obj.label(), tuple(properties.keys())), list(properties.values())
+
+
+def edge_row(
+    source: ObjectWithContext,
+    relationship: Relationship,
+    destination: ObjectWithContext,
+) -> Tuple[EdgeGroup, List[Any]]:
+    """Convert a relationship into a row of an edge group.
+
+    The row starts with the source's and the destination's full name.
+
+    :param source: The source object.
+    :type source: ObjectWithContext
+    :param relationship: The relationship represented by the edge.
+    :type relationship: Relationship
+    :param destination: The destination object.
+    :type destination: ObjectWithContext
+    :return: The edge group and the row.
+    :rtype: Tuple[EdgeGroup, List[Any]]
+    """
+    properties = relationship.properties()
+    group = (
+        source.label(),
+        relationship.name,
+        destination.label(),
+        tuple(properties.keys()),
+    )
+    return group, [source.full_name, destination.full_name, *properties.values()]
+
+
+def create_nodes_query(label: str, keys: Tuple[str, ...]) -> str:
+    """Create the query writing the rows of a node group.
+
+    :param label: The nodes' label.
+    :type label: str
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :return: The query unwinding the `$rows` parameter.
+    :rtype: str
+    """
+    return f"UNWIND $rows AS row CREATE (:{label} {{{_properties_from_row(keys, 0)}}})"
+
+
+def create_edges_query(
+    source_label: str, rel_name: str, destination_label: str, keys: Tuple[str, ...]
+) -> str:
+    """Create the query writing the rows of an edge group.
+
+    :param source_label: The source nodes' label.
+    :type source_label: str
+    :param rel_name: The relationship's name.
+    :type rel_name: str
+    :param destination_label: The destination nodes' label.
+    :type destination_label: str
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :return: The query unwinding the `$rows` parameter.
+    :rtype: str
+    """
+    properties = f" {{{_properties_from_row(keys, 2)}}}" if keys else ""
+    return (
+        "UNWIND $rows AS row "
+        f"MATCH (s:{source_label} {{full_name: row[0]}}), "
+        f"(d:{destination_label} {{full_name: row[1]}}) "
+        f"CREATE (s)-[:{rel_name}{properties}]->(d)"
+    )
+
+
+def merge_nodes_query(label: str, keys: Tuple[str, ...]) -> str:
+    """Create the query merging the rows of a node group on their full names.
+
+    The other properties of an existing node are updated.
+
+    :param label: The nodes' label.
+    :type label: str
+    :param keys: The property keys, including `full_name`.
+    :type keys: Tuple[str, ...]
+    :return: The query unwinding the `$rows` parameter.
+    :rtype: str
+    """
+    full_name_index = keys.index("full_name")
+    query = (
+        "UNWIND $rows AS row "
+        f"MERGE (n:{label} {{full_name: row[{full_name_index}]}})"
+    )
+    updates = [
+        f"n.`{key}` = row[{index}]"
+        for index, key in enumerate(keys)
+        if key != "full_name"
+    ]
+    return f"{query} SET {', '.join(updates)}" if updates else query
+
+
+def merge_edges_query(
+    source_label: str, rel_name: str, destination_label: str, keys: Tuple[str, ...]
+) -> str:
+    """Create the query merging the rows of an edge group.
+
+    An edge is identified by its nodes, its relationship name and the properties
+    which aren't in EDGE_VALUE_PROPERTIES. Those are updated.
+
+    :param source_label: The source nodes' label.
+    :type source_label: str
+    :param rel_name: The relationship's name.
+    :type rel_name: str
+    :param destination_label: The destination nodes' label.
+    :type destination_label: str
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :return: The query unwinding the `$rows` parameter.
+    :rtype: str
+    """
+    identifying = []
+    updates = []
+    for index, key in enumerate(keys, start=2):
+        if key in EDGE_VALUE_PROPERTIES:
+            updates.append(f"r.`{key}` = row[{index}]")
+        else:
+            identifying.append(f"`{key}`: row[{index}]")
+    properties = f" {{{', '.join(identifying)}}}" if identifying else ""
+    query = (
+        "UNWIND $rows AS row "
+        f"MATCH (s:{source_label} {{full_name: row[0]}}), "
+        f"(d:{destination_label} {{full_name: row[1]}}) "
+        f"MERGE (s)-[r:{rel_name}{properties}]->(d)"
+    )
+    return f"{query} SET {', '.join(updates)}" if updates else query
+
+
+def build_params_header(params: Dict[str, Any]) -> str:
+    """Create the header passing the parameters of a query sent as a raw command.
+
+    It encodes the parameters like redisgraph's `Graph.query`,
+    which has no public function for it.
+
+    :param params: The parameters by their names.
+    :type params: Dict[str, Any]
+    :return: The header to put in front of the query, e.g. `CYPHER rows=[1,2] `.
+    :rtype: str
+    """
+    return "CYPHER " + "".join(
+        f"{key}={param_value(value)} " for key, value in params.items()
+    )
+
+
+def param_value(value: Any) -> str:
+    """Encode a parameter value for the parameters header of a query.
+
+    :param value: A string, number, bool, None or a list or dict of these.
+    :type value: Any
+    :return: The encoded value.
+    :rtype: str
+    """
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(param_value(item) for item in value) + "]"
+    if isinstance(value, dict):
+        return (
+            "{"
+            + ",".join(f"{key}:{param_value(item)}" for key, item in value.items())
+            + "}"
+        )
+    return str(value)
+
+
+def nodes_query(label: str, keys: Tuple[str, ...], upsert: bool = False) -> str:
+    """Create the query writing the rows of a node group.
+
+    :param label: The nodes' label.
+    :type label: str
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :param upsert: Merge the nodes instead of creating them, defaults to False
+    :type upsert: bool
+    :return: The query unwinding the `$rows` parameter.
+    :rtype: str
+    """
+    if upsert:
+        return merge_nodes_query(label, keys)
+    return create_nodes_query(label, keys)
+
+
+def edges_query(
+    source_label: str,
+    rel_name: str,
+    destination_label: str,
+    keys: Tuple[str, ...],
+    upsert: bool = False,
+) -> str:
+    """Create the query writing the rows of an edge group.
+
+    :param source_label: The source nodes' label.
+    :type source_label: str
+    :param rel_name: The relationship's name.
+    :type rel_name: str
+    :param destination_label: The destination nodes' label.
+    :type destination_label: str
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :param upsert: Merge the edges instead of creating them, defaults to False
+    :type upsert: bool
+    :return: The query unwinding the `$rows` parameter.
+    :rtype: str
+    """
+    if upsert:
+        return merge_edges_query(source_label, rel_name, destination_label, keys)
+    return create_edges_query(source_label, rel_name, destination_label, keys)
+
+
+def adaptive_batch_size() -> AdaptiveBatchSize:
+    """Create a batch size based on the settings.
+
+    :return: The batch size with the initial size and target latency of the settings.
+    :rtype: AdaptiveBatchSize
+    """
+    config = active_settings()
+    return AdaptiveBatchSize(config.batch_size, config.batch_latency)
+
+
+def query_in_batches(
+    redis_graph: Graph,
+    query: str,
+    rows: List[Any],
+    batch_size: Optional[AdaptiveBatchSize] = None,
+) -> None:
+    """Execute a query with the rows as its `$rows` parameter in batches.
+
+    :param redis_graph: The graph to query.
+    :type redis_graph: Graph
+    :param query: The query unwinding the `$rows` parameter.
+    :type query: str
+    :param rows: The rows to send.
+    :type rows: List[Any]
+    :param batch_size: The number of rows sent in one query, adapted after each
+    query, defaults to a batch size based on the settings
+    :type batch_size: Optional[AdaptiveBatchSize]
+    """
+    QueryPipeline(redis_graph, 1, batch_size).query_in_batches(query, rows)
+
+
+def query_pipeline(
+    redis_graph: Graph,
+    batch_size: Optional[AdaptiveBatchSize] = None,
+    depth: Optional[int] = None,
+) -> QueryPipeline:
+    """Create a query pipeline based on the settings.
+
+    :param redis_graph: The graph to write.
+    :type redis_graph: Graph
+    :param batch_size: The number of rows sent in one query,
+    defaults to a batch size based on the settings
+    :type batch_size: Optional[AdaptiveBatchSize]
+    :param depth: The maximal number of queries sent in one round trip,
+    defaults to the settings
+    :type depth: Optional[int]
+    :return: The query pipeline.
+    :rtype: QueryPipeline
+    """
+    if depth is None:
+        depth = active_settings().pipeline_depth
+    return QueryPipeline(redis_graph, depth, batch_size)
+
+
+def _properties_from_row(keys: Tuple[str, ...], offset: int) -> str:
+    """Create a map of properties that are read from a row of the query parameter.
+
+    :param keys: The property keys.
+    :type keys: Tuple[str, ...]
+    :param offset: The index of the first property value in the row.
+    :type offset: int
+    :return: The properties in Cypher syntax without the braces.
+    :rtype: str
+    """
+    return ", ".join(
+        f"`{key}`: row[{index}]" for index, key in enumerate(keys, start=offset)
+    )
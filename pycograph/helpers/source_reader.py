@@ -0,0 +1,44 @@
+"""Read the source of Python modules as bytes.
+
+The bytes are passed to `ast.parse` without decoding them first,
+so the encoding declared in the module (PEP 263) is used
+and the decoded text is never kept in memory.
+"""
+
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+# Files at least this big are memory-mapped instead of read.
+MMAP_THRESHOLD = 1024 * 1024
+
+# The source of a module: already known text or the bytes of its file.
+Source = Union[str, bytes, mmap.mmap]
+
+
+@contextmanager
+def open_source(
+    file_path: str, mmap_threshold: int = MMAP_THRESHOLD
+) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Open a module's file and provide its content as bytes.
+
+    Big files are memory-mapped, so their content isn't copied into memory.
+    The source is released when the context is exited,
+    so it shouldn't be referenced afterwards.
+
+    :param file_path: The path of the module's file.
+    :type file_path: str
+    :param mmap_threshold: The minimal size of memory-mapped files in bytes,
+    defaults to MMAP_THRESHOLD
+    :type mmap_threshold: int
+    :return: The file's content.
+    :rtype: Iterator[Union[bytes, mmap.mmap]]
+    """
+    with open(file_path, "rb") as f:
+        size = f.seek(0, 2)
+        if size == 0 or size < mmap_threshold:
+            f.seek(0)
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
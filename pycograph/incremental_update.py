@@ -0,0 +1,409 @@
+"""Update an existing RedisGraph graph incrementally based on a ParseResult.
+
+The graph is updated in units: a package, an external module
+or a module with all its contained objects.
+The root node of each unit stores a fingerprint of the unit's nodes and edges.
+Only the units with a missing or different fingerprint are deleted and re-created,
+together with the edges pointing into them from the other units.
+
+The fingerprint covers the resolved edges, not only the module's source.
+This way, a module whose imports or calls are resolved differently
+because another module changed is re-created as well.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import (
+    Any,
+    Collection,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from redisgraph import Graph  # type: ignore
+
+from pycograph.graph_writer import (
+    EdgeGroup,
+    NodeGroup,
+    create_edges_query,
+    create_nodes_query,
+    edge_row,
+    node_row,
+    open_graph,
+    query_pipeline,
+)
+from pycograph.parse_result_to_redisgraph import create_indexes, handle_redis_errors
+from pycograph.schemas.parse_result import (
+    ExternalModuleWithContext,
+    ModuleWithContext,
+    ObjectWithContext,
+    PackageWithContext,
+    ParseResult,
+    Relationship,
+)
+
+FINGERPRINT = "fingerprint"
+PACKAGE_LABELS = ("package", "test_package")
+MODULE_LABELS = ("init", "module", "test_module")
+EXTERNAL_MODULE_LABELS = ("external_module",)
+UNIT_LABELS = PACKAGE_LABELS + MODULE_LABELS + EXTERNAL_MODULE_LABELS
+
+
+class GraphUpdatePlan:
+    """The changes needed to bring a graph up to date with a ParseResult.
+
+    The nodes and edges are grouped like in the GraphWriter.
+    """
+
+    __slots__ = (
+        "deleted_units",
+        "nodes",
+        "edges",
+        "fingerprints",
+        "modules_added",
+        "modules_changed",
+        "modules_removed",
+        "queries",
+        "round_trips",
+    )
+
+    def __init__(self) -> None:
+        # label => full names of the units' roots
+        self.deleted_units: DefaultDict[str, List[str]] = defaultdict(list)
+        self.nodes: DefaultDict[NodeGroup, List[List[Any]]] = defaultdict(list)
+        self.edges: DefaultDict[EdgeGroup, List[List[Any]]] = defaultdict(list)
+        # label => [full name, fingerprint] of the units' roots
+        self.fingerprints: DefaultDict[str, List[List[str]]] = defaultdict(list)
+        self.modules_added = 0
+        self.modules_changed = 0
+        self.modules_removed = 0
+        # the write queries and the round trips needed to send them
+        self.queries = 0
+        self.round_trips = 0
+
+    def add_node(self, obj: ObjectWithContext) -> None:
+        """Add a node to be created.
+
+        :param obj: The object represented by the node.
+        :type obj: ObjectWithContext
+        """
+        group, row = node_row(obj)
+        self.nodes[group].append(row)
+
+    def add_edge(
+        self,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination: ObjectWithContext,
+    ) -> None:
+        """Add an edge to be created.
+
+        :param source: The source object.
+        :type source: ObjectWithContext
+        :param relationship: The relationship represented by the edge.
+        :type relationship: Relationship
+        :param destination: The destination object.
+        :type destination: ObjectWithContext
+        """
+        group, row = edge_row(source, relationship, destination)
+        self.edges[group].append(row)
+
+    def result(self, graph_name: str) -> "GraphUpdateResult":
+        """Summarize the update.
+
+        :param graph_name: The name of the updated graph.
+        :type graph_name: str
+        :return: The summary of the update.
+        :rtype: GraphUpdateResult
+        """
+        return GraphUpdateResult(
+            graph_name=graph_name,
+            modules_added=self.modules_added,
+            modules_changed=self.modules_changed,
+            modules_removed=self.modules_removed,
+            nodes_added=sum(len(rows) for rows in self.nodes.values()),
+            edges_added=sum(len(rows) for rows in self.edges.values()),
+            queries=self.queries,
+            round_trips=self.round_trips,
+        )
+
+    def update_stored_units(
+        self, stored_units: Dict[str, Tuple[str, Optional[str]]]
+    ) -> None:
+        """Apply the update to the units read from the graph.
+
+        This way, the graph doesn't need to be read again before the next update.
+
+        :param stored_units: The label and fingerprint of the units stored in the
+        graph by their full names.
+        :type stored_units: Dict[str, Tuple[str, Optional[str]]]
+        """
+        for full_names in self.deleted_units.values():
+            for full_name in full_names:
+                stored_units.pop(full_name, None)
+        for label, rows in self.fingerprints.items():
+            for full_name, fingerprint in rows:
+                stored_units[full_name] = (label, fingerprint)
+
+    def labels(self) -> Set[str]:
+        """The labels of the nodes that are looked up by their full names."""
+        labels = set(UNIT_LABELS)
+        for source_label, _, destination_label, _ in self.edges:
+            labels.add(source_label)
+            labels.add(destination_label)
+        return labels
+
+
+class GraphUpdateResult:
+    """The summary of an incremental graph update."""
+
+    __slots__ = (
+        "graph_name",
+        "modules_added",
+        "modules_changed",
+        "modules_removed",
+        "nodes_added",
+        "edges_added",
+        "queries",
+        "round_trips",
+    )
+
+    def __init__(
+        self,
+        *,
+        graph_name: str,
+        modules_added: int = 0,
+        modules_changed: int = 0,
+        modules_removed: int = 0,
+        nodes_added: int = 0,
+        edges_added: int = 0,
+        queries: int = 0,
+        round_trips: int = 0,
+    ) -> None:
+        self.graph_name = graph_name
+        self.modules_added = modules_added
+        self.modules_changed = modules_changed
+        self.modules_removed = modules_removed
+        self.nodes_added = nodes_added
+        self.edges_added = edges_added
+        self.queries = queries
+        self.round_trips = round_trips
+
+    def round_trips_saved(self) -> int:
+        """The number of round trips saved by sending several queries in one."""
+        return self.queries - self.round_trips
+
+
+def update_graph(graph_name: str, parse_result: ParseResult) -> GraphUpdateResult:
+    """Update a RedisGraph graph, so that it represents the `ParseResult`.
+
+    Only the packages and modules that changed since the last update are rewritten.
+    A graph created without fingerprints is rewritten completely at the first update.
+
+    :param graph_name: The name of the updated graph.
+    :type graph_name: str
+    :param parse_result: A parsed Python project with objects representing the nodes of
+    the graph.
+    :type parse_result: ParseResult
+    :return: The summary of the update.
+    :rtype: GraphUpdateResult
+    """
+    redis_graph = open_graph(graph_name)
+    plan = plan_update(parse_result, read_units(redis_graph))
+    apply_plan(redis_graph, plan)
+    return plan.result(graph_name)
+
+
+def read_units(redis_graph: Graph) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Read the packages and modules stored in the graph.
+
+    :param redis_graph: The graph to read.
+    :type redis_graph: Graph
+    :return: The label and fingerprint of each stored unit by its full name.
+    :rtype: Dict[str, Tuple[str, Optional[str]]]
+    """
+    units = {}
+    for label in UNIT_LABELS:
+        with handle_redis_errors("read"):
+            result = redis_graph.query(
+                f"MATCH (n:{label}) RETURN n.full_name, n.{FINGERPRINT}"
+            )
+        for full_name, fingerprint in result.result_set:
+            units[full_name] = (label, fingerprint)
+    return units
+
+
+def plan_update(
+    parse_result: ParseResult,
+    stored_units: Dict[str, Tuple[str, Optional[str]]],
+    unit_names: Optional[Collection[str]] = None,
+) -> GraphUpdatePlan:
+    """Determine which nodes and edges need to be deleted and created.
+
+    * Units not in the parse result anymore are deleted.
+    * Units with a different fingerprint are deleted and re-created.
+    * New units are created.
+    * The edges from the created units and into the created units are created.
+
+    If the units that might have changed are known, only these are compared.
+    They must include the sources of all edges into them,
+    like the `updated_units` of a `PythonProject` after a reparse.
+
+    :param parse_result: The parsed Python project.
+    :type parse_result: ParseResult
+    :param stored_units: The label and fingerprint of the units stored in the graph.
+    :type stored_units: Dict[str, Tuple[str, Optional[str]]]
+    :param unit_names: The full names of the units that might have changed,
+    defaults to all units
+    :type unit_names: Optional[Collection[str]]
+    :return: The plan of the update.
+    :rtype: GraphUpdatePlan
+    """
+    objects = parse_result.objects
+    plan = GraphUpdatePlan()
+    created: Set[str] = set()
+    units = _find_units(objects, unit_names)
+    for root_full_name, unit_objects in units.items():
+        root = unit_objects[0]
+        fingerprint = _fingerprint(unit_objects, objects)
+        stored = stored_units.get(root_full_name)
+        if stored and stored[1] == fingerprint:
+            continue
+        if stored:
+            plan.deleted_units[stored[0]].append(root_full_name)
+        if isinstance(root, ModuleWithContext):
+            if stored:
+                plan.modules_changed += 1
+            else:
+                plan.modules_added += 1
+        plan.fingerprints[root.label()].append([root_full_name, fingerprint])
+        for obj in unit_objects:
+            plan.add_node(obj)
+            created.add(obj.full_name)
+
+    for root_full_name in stored_units if unit_names is None else unit_names:
+        stored = stored_units.get(root_full_name)
+        if stored and root_full_name not in units:
+            label = stored[0]
+            plan.deleted_units[label].append(root_full_name)
+            if label in MODULE_LABELS:
+                plan.modules_removed += 1
+
+    if unit_names is None:
+        sources: Iterable[ObjectWithContext] = objects.values()
+    else:
+        sources = (obj for unit_objects in units.values() for obj in unit_objects)
+    for obj in sources:
+        source_created = obj.full_name in created
+        for rel in obj.relationships:
+            destination = objects.get(rel.destination_full_name)
+            if destination and (source_created or destination.full_name in created):
+                plan.add_edge(obj, rel, destination)
+    return plan
+
+
+def apply_plan(redis_graph: Graph, plan: GraphUpdatePlan) -> None:
+    """Execute the queries of an update plan.
+
+    The fingerprints are stored at the end,
+    so an interrupted update is repeated by the next update.
+
+    :param redis_graph: The graph to update.
+    :type redis_graph: Graph
+    :param plan: The plan of the update.
+    :type plan: GraphUpdatePlan
+    """
+    create_indexes(redis_graph, plan.labels())
+
+    pipeline = query_pipeline(redis_graph)
+    for label, full_names in plan.deleted_units.items():
+        if label in MODULE_LABELS:
+            query = (
+                "UNWIND $rows AS row "
+                f"MATCH (:{label} {{full_name: row}})-[:contains*0..]->(n) "
+                "DETACH DELETE n"
+            )
+        else:
+            query = (
+                "UNWIND $rows AS row "
+                f"MATCH (n:{label} {{full_name: row}}) DETACH DELETE n"
+            )
+        pipeline.query_in_batches(query, full_names)
+
+    for (label, keys), rows in plan.nodes.items():
+        pipeline.query_in_batches(create_nodes_query(label, keys), rows)
+
+    for group, rows in plan.edges.items():
+        pipeline.query_in_batches(create_edges_query(*group), rows)
+
+    for label, rows in plan.fingerprints.items():
+        query = (
+            "UNWIND $rows AS row "
+            f"MATCH (n:{label} {{full_name: row[0]}}) SET n.{FINGERPRINT} = row[1]"
+        )
+        pipeline.query_in_batches(query, rows)
+    pipeline.execute()
+    plan.queries = pipeline.queries
+    plan.round_trips = pipeline.round_trips
+
+
+def _find_units(
+    objects: Dict[str, ObjectWithContext],
+    unit_names: Optional[Collection[str]] = None,
+) -> Dict[str, List[ObjectWithContext]]:
+    """Group the objects into units.
+
+    :param objects: All objects of the project.
+    :type objects: Dict[str, ObjectWithContext]
+    :param unit_names: The full names of the units to find, defaults to all units
+    :type unit_names: Optional[Collection[str]]
+    :return: The objects of each unit by the unit's full name, starting with the root.
+    :rtype: Dict[str, List[ObjectWithContext]]
+    """
+    if unit_names is None:
+        candidates: Iterable[ObjectWithContext] = objects.values()
+    else:
+        candidates = (objects[name] for name in unit_names if name in objects)
+    units = {}
+    for obj in candidates:
+        if isinstance(obj, (PackageWithContext, ExternalModuleWithContext)):
+            units[obj.full_name] = [obj]
+        elif isinstance(obj, ModuleWithContext):
+            # A name defined again in the same scope replaces the earlier object
+            # in the project's objects, so the earlier one isn't part of the graph.
+            units[obj.full_name] = [
+                contained
+                for contained in obj.with_contained_objects()
+                if objects.get(contained.full_name) is contained
+            ]
+    return units
+
+
+def _fingerprint(
+    unit_objects: List[ObjectWithContext], objects: Dict[str, ObjectWithContext]
+) -> str:
+    """Calculate the fingerprint of a unit's nodes and outgoing edges.
+
+    :param unit_objects: The objects of the unit.
+    :type unit_objects: List[ObjectWithContext]
+    :param objects: All objects of the project.
+    :type objects: Dict[str, ObjectWithContext]
+    :return: A hexadecimal digest.
+    :rtype: str
+    """
+    nodes = [repr((obj.label(), obj.node_properties())) for obj in unit_objects]
+    # The order of the relationships depends on the order of the import resolution.
+    edges = sorted(
+        repr((obj.full_name, rel.name, rel.destination_full_name, rel.properties()))
+        for obj in unit_objects
+        for rel in obj.relationships
+        if rel.destination_full_name in objects
+    )
+    return hashlib.blake2b(
+        "\n".join(nodes + edges).encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
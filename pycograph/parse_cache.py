@@ -0,0 +1,349 @@
+"""Persistent cache for the syntax elements of the modules.
+
+The cache directory contains:
+* an index, which maps each file path to its size, modification time and content
+digest and stores the size and last usage of each entry
+* one entry file per content digest with the module's syntax elements
+
+A module whose size and modification time didn't change is loaded
+from the cache without reading the file.
+A module with a known content digest (e.g. a vendored copy of another module)
+is loaded from the cache without parsing it.
+The entries are stored in marshal format, which is compact, fast to load
+and can't execute code while loading.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import shutil
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pycograph.helpers.source_reader import Source
+from pycograph.schemas.basic_syntax_elements import (
+    CallSyntaxElement,
+    ClassDefSyntaxElement,
+    ConstantSyntaxElement,
+    FunctionDefSyntaxElement,
+    ImportFromSyntaxElement,
+    ImportSyntaxElement,
+    SyntaxElement,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = ".pycograph-cache"
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+# Increase the version whenever the format or the content of the entries changes.
+CACHE_VERSION = 2
+
+INDEX_FILE_NAME = "index"
+ENTRIES_DIR_NAME = "entries"
+
+# Tags of the syntax elements in the encoded entries.
+_CALL = "call"
+_IMPORT = "import"
+_IMPORT_FROM = "import_from"
+_CONSTANT = "constant"
+_FUNCTION_DEF = "function_def"
+_CLASS_DEF = "class_def"
+
+
+def content_digest(content: Source) -> str:
+    """Calculate the digest identifying a module's content.
+
+    :param content: The module's content as bytes or as text,
+    which is hashed in UTF-8.
+    :type content: Source
+    :return: A hexadecimal digest of the content.
+    :rtype: str
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+def load_entry(cache_dir: str, digest: str) -> Optional[List[SyntaxElement]]:
+    """Load the syntax elements of a content digest if they are in the cache.
+
+    This function doesn't use the index,
+    so it can be called from the worker processes as well.
+
+    :param cache_dir: The cache directory.
+    :type cache_dir: str
+    :param digest: A content digest.
+    :type digest: str
+    :return: The cached syntax elements or None.
+    :rtype: Optional[List[SyntaxElement]]
+    """
+    try:
+        with open(_entry_path(cache_dir, digest), "rb") as f:
+            return decode_syntax_elements(marshal.loads(f.read()))
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        return None
+
+
+def encode_syntax_elements(syntax_elements: List[SyntaxElement]) -> List[tuple]:
+    """Convert syntax elements into tuples that can be stored with marshal.
+
+    :param syntax_elements: The syntax elements to encode.
+    :type syntax_elements: List[SyntaxElement]
+    :return: One tuple per syntax element, starting with a tag.
+    :rtype: List[tuple]
+    """
+    result: List[tuple] = []
+    for elem in syntax_elements:
+        if isinstance(elem, CallSyntaxElement):
+            result.append((_CALL, elem.what_reference_name, elem.called_attribute))
+        elif isinstance(elem, ImportFromSyntaxElement):
+            result.append(
+                (_IMPORT_FROM, elem.name, elem.as_name, elem.from_text, elem.level)
+            )
+        elif isinstance(elem, ImportSyntaxElement):
+            result.append((_IMPORT, elem.name, elem.as_name))
+        elif isinstance(elem, ConstantSyntaxElement):
+            result.append((_CONSTANT, elem.name))
+        elif isinstance(elem, FunctionDefSyntaxElement):
+            result.append(
+                (_FUNCTION_DEF, elem.name, encode_syntax_elements(elem.syntax_elements))
+            )
+        elif isinstance(elem, ClassDefSyntaxElement):
+            result.append(
+                (_CLASS_DEF, elem.name, encode_syntax_elements(elem.syntax_elements))
+            )
+    return result
+
+
+def decode_syntax_elements(encoded: List[tuple]) -> List[SyntaxElement]:
+    """Create syntax elements from their encoded form.
+
+    :param encoded: Syntax elements encoded by `encode_syntax_elements`.
+    :type encoded: List[tuple]
+    :return: The syntax elements.
+    :rtype: List[SyntaxElement]
+    """
+    result: List[SyntaxElement] = []
+    for tag, *values in encoded:
+        if tag == _CALL:
+            result.append(
+                CallSyntaxElement(
+                    what_reference_name=values[0], called_attribute=values[1]
+                )
+            )
+        elif tag == _IMPORT_FROM:
+            result.append(
+                ImportFromSyntaxElement(
+                    name=values[0],
+                    as_name=values[1],
+                    from_text=values[2],
+                    level=values[3],
+                )
+            )
+        elif tag == _IMPORT:
+            result.append(ImportSyntaxElement(name=values[0], as_name=values[1]))
+        elif tag == _CONSTANT:
+            result.append(ConstantSyntaxElement(name=values[0]))
+        elif tag == _FUNCTION_DEF:
+            result.append(
+                FunctionDefSyntaxElement(
+                    name=values[0], syntax_elements=decode_syntax_elements(values[1])
+                )
+            )
+        elif tag == _CLASS_DEF:
+            result.append(
+                ClassDefSyntaxElement(
+                    name=values[0], syntax_elements=decode_syntax_elements(values[1])
+                )
+            )
+        else:
+            raise ValueError(f"Unknown syntax element tag in the parse cache: {tag}")
+    return result
+
+
+class ParseCache:
+    """A persistent cache for the syntax elements of the modules.
+
+    The least recently used entries are evicted when the cache exceeds its size limit.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize a cache and load its index.
+
+        :param cache_dir: The directory where the cache is stored.
+        :type cache_dir: str
+        :param max_size: The maximal size of the entries in bytes,
+        defaults to DEFAULT_MAX_SIZE
+        :type max_size: int
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        # file path => (size, modification time in ns, digest)
+        self._files: Dict[str, Tuple[int, int, str]] = {}
+        # digest => (entry size in bytes, last usage timestamp)
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        # file path => (size, modification time in ns) at the time of the lookup
+        self._looked_up_stats: Dict[str, Tuple[int, int]] = {}
+        self._changed = False
+        self._load_index()
+
+    def get(self, file_path: str) -> Optional[List[SyntaxElement]]:
+        """Get a module's syntax elements if its file didn't change.
+
+        :param file_path: The path of the module's file.
+        :type file_path: str
+        :return: The cached syntax elements or None.
+        :rtype: Optional[List[SyntaxElement]]
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        file_stat = (stat.st_size, stat.st_mtime_ns)
+        self._looked_up_stats[file_path] = file_stat
+        cached_file = self._files.get(file_path)
+        if not cached_file or cached_file[:2] != file_stat:
+            return None
+        return self.get_by_digest(cached_file[2])
+
+    def get_by_digest(self, digest: str) -> Optional[List[SyntaxElement]]:
+        """Get the syntax elements of a content digest.
+
+        :param digest: A content digest.
+        :type digest: str
+        :return: The cached syntax elements or None.
+        :rtype: Optional[List[SyntaxElement]]
+        """
+        if digest not in self._entries:
+            return None
+        syntax_elements = load_entry(self.cache_dir, digest)
+        if syntax_elements is None:
+            del self._entries[digest]
+        else:
+            self._entries[digest] = (self._entries[digest][0], time.time())
+        self._changed = True
+        return syntax_elements
+
+    def put(
+        self, file_path: str, digest: str, syntax_elements: List[SyntaxElement]
+    ) -> None:
+        """Store a module's syntax elements.
+
+        :param file_path: The path of the module's file.
+        :type file_path: str
+        :param digest: The digest of the module's content.
+        :type digest: str
+        :param syntax_elements: The module's syntax elements.
+        :type syntax_elements: List[SyntaxElement]
+        """
+        file_stat = self._looked_up_stats.pop(file_path, None)
+        if file_stat:
+            self._files[file_path] = (*file_stat, digest)
+            self._changed = True
+        if digest in self._entries:
+            self._entries[digest] = (self._entries[digest][0], time.time())
+            return
+        entry_path = _entry_path(self.cache_dir, digest)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            data = marshal.dumps(encode_syntax_elements(syntax_elements))
+            # Entries are never changed, a partially written entry fails to load.
+            with open(entry_path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning(f"Could not write the parse cache entry {entry_path}: {e}")
+            return
+        self._entries[digest] = (len(data), time.time())
+        self._changed = True
+
+    def save(self) -> None:
+        """Evict the least recently used entries if necessary and store the index."""
+        if not self._changed:
+            return
+        self._evict()
+        index = {
+            "version": CACHE_VERSION,
+            "python": tuple(sys.version_info[:2]),
+            "files": self._files,
+            "entries": self._entries,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_atomically(
+                os.path.join(self.cache_dir, INDEX_FILE_NAME), marshal.dumps(index)
+            )
+        except OSError as e:
+            logger.warning(f"Could not write the parse cache index: {e}")
+            return
+        self._changed = False
+
+    def clear(self) -> None:
+        """Delete all the cached data."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._files = {}
+        self._entries = {}
+        self._changed = False
+
+    def size(self) -> int:
+        """The total size of the cached entries in bytes."""
+        return sum(entry_size for entry_size, _ in self._entries.values())
+
+    def _load_index(self) -> None:
+        """Load the index. An invalid or outdated cache is cleared."""
+        index_path = os.path.join(self.cache_dir, INDEX_FILE_NAME)
+        if not os.path.exists(index_path):
+            return
+        index: Any = None
+        try:
+            with open(index_path, "rb") as f:
+                index = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        if (
+            not isinstance(index, dict)
+            or index.get("version") != CACHE_VERSION
+            or index.get("python") != tuple(sys.version_info[:2])
+        ):
+            logger.info(f"Clearing the outdated parse cache at {self.cache_dir}")
+            self.clear()
+            return
+        self._files = index["files"]
+        self._entries = index["entries"]
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries until the size limit is met."""
+        total_size = self.size()
+        if total_size <= self.max_size:
+            return
+        by_last_usage = sorted(self._entries.items(), key=lambda item: item[1][1])
+        evicted = set()
+        for digest, (entry_size, _) in by_last_usage:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(_entry_path(self.cache_dir, digest))
+            except OSError:
+                pass
+            total_size -= entry_size
+            evicted.add(digest)
+            del self._entries[digest]
+        self._files = {
+            file_path: cached_file
+            for file_path, cached_file in self._files.items()
+            if cached_file[2] not in evicted
+        }
+
+
+def _entry_path(cache_dir: str, digest: str) -> str:
+    return os.path.join(cache_dir, ENTRIES_DIR_NAME, digest[:2], digest)
+
+
+def write_atomically(path: str, data: bytes) -> None:
+    """Write a file, so that readers never see a partially written file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
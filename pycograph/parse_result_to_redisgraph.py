@@ -1,18 +1,28 @@
 """Generate RedisGraph nodes and edges from a ParseResult"""
 
-from typing import Dict
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
 
 import redis  # type: ignore
 from redisgraph import Edge, Graph, Node  # type: ignore
 
-from pycograph.config import settings
+from pycograph.config import active_settings
 from pycograph.exceptions import (
     RedisConnectionException,
     RedisResponseException,
+    RedisTimeoutException,
     RedisWithoutGraphException,
 )
 from pycograph.schemas.parse_result import ObjectWithContext, ParseResult, Relationship
 
+# The node properties with an exact-match index for each label.
+INDEXED_PROPERTIES = ("full_name", "name")
+
+# The connection pools by the connection settings, shared by the loads of a process.
+_connection_pools: Dict[Tuple[Any, ...], redis.ConnectionPool] = {}
+_connection_pools_lock = threading.Lock()
+
 
 def populate_graph(graph_name: str, parse_result: ParseResult) -> Graph:
     """Create and commit a RedisGraph `Graph` based on the `ParseResult`.
@@ -26,15 +36,11 @@ def populate_graph(graph_name: str, parse_result: ParseResult) -> Graph:
     :return: [description]
     :rtype: Graph
     """
-    redis_instance = redis.Redis(host=settings.redis_host, port=settings.redis_port)
-    if settings.overwrite_existing_graph:
-        try:
-            redis_instance.delete(graph_name)
-        except redis.exceptions.ConnectionError as e:
-            raise RedisConnectionException(
-                "Could not connect to the Redis instance at the step overwrite."
-            ) from e
+    redis_instance = redis_connection()
+    if active_settings().overwrite_existing_graph:
+        delete_graph(redis_instance, graph_name)
     redis_graph = Graph(graph_name, redis_instance)
+    create_indexes(redis_graph, {obj.label() for obj in parse_result.objects.values()})
     nodes = {}
     for obj in parse_result.objects.values():
         node = _add_node_to_graph(obj, redis_graph)
@@ -49,25 +55,146 @@ def populate_graph(graph_name: str, parse_result: ParseResult) -> Graph:
     return redis_graph
 
 
-def _commit_graph(redis_graph: Graph) -> None:
-    """Commit a `Graph` and handle various errors that can occur.
+def redis_connection() -> redis.Redis:
+    """Create a Redis client for the instance of the active settings.
 
-    :param redis_graph: The graph to be committed.
+    The clients with the same connection settings share a connection pool,
+    so the connections are reused by the subsequent loads of the process.
+    The instance is reached through a unix domain socket, if one is set.
+
+    :return: The Redis client.
+    :rtype: redis.Redis
+    """
+    config = active_settings()
+    key = (
+        config.redis_host,
+        config.redis_port,
+        config.redis_socket,
+        config.redis_socket_timeout,
+        config.redis_connect_timeout,
+    )
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None:
+            if config.redis_socket:
+                # redis-py's unix domain socket connections have no connect timeout,
+                # the response timeout applies to connecting as well.
+                pool = redis.ConnectionPool(
+                    connection_class=redis.UnixDomainSocketConnection,
+                    path=config.redis_socket,
+                    socket_timeout=config.redis_socket_timeout,
+                )
+            else:
+                pool = redis.ConnectionPool(
+                    host=config.redis_host,
+                    port=config.redis_port,
+                    socket_timeout=config.redis_socket_timeout,
+                    socket_connect_timeout=config.redis_connect_timeout,
+                    socket_keepalive=True,
+                )
+            _connection_pools[key] = pool
+    return redis.Redis(connection_pool=pool)
+
+
+def delete_graph(redis_instance: redis.Redis, graph_name: str) -> None:
+    """Delete a graph, so that it can be overwritten.
+
+    :param redis_instance: The Redis instance containing the graph.
+    :type redis_instance: redis.Redis
+    :param graph_name: The name of the graph.
+    :type graph_name: str
+    :raises RedisConnectionException: If we can't connect to a Redis instance.
+    :raises RedisTimeoutException: If the Redis instance doesn't respond in time.
+    """
+    try:
+        redis_instance.delete(graph_name)
+    except redis.exceptions.ConnectionError as e:
+        raise RedisConnectionException(
+            "Could not connect to the Redis instance at the step overwrite."
+        ) from e
+    except redis.exceptions.TimeoutError as e:
+        raise RedisTimeoutException(
+            "The Redis instance didn't respond in time at the step overwrite."
+        ) from e
+
+
+def create_indexes(redis_graph: Graph, labels: Iterable[str]) -> List[Tuple[str, str]]:
+    """Create the missing exact-match indexes of the labels' indexed properties.
+
+    The existing indexes are read first,
+    so a graph with all its indexes costs only one query.
+
+    :param redis_graph: The graph where the indexes are created.
+    :type redis_graph: Graph
+    :param labels: The labels of the nodes.
+    :type labels: Iterable[str]
+    :return: The label and property of each created index.
+    :rtype: List[Tuple[str, str]]
+    """
+    labels = sorted(set(labels))
+    if not labels:
+        return []
+    existing = existing_indexes(redis_graph)
+    created = []
+    for label in labels:
+        for property_name in INDEXED_PROPERTIES:
+            if (label, property_name) in existing:
+                continue
+            with handle_redis_errors("index"):
+                try:
+                    redis_graph.query(f"CREATE INDEX ON :{label}({property_name})")
+                except redis.exceptions.ResponseError as e:
+                    # Created concurrently by another load.
+                    if "already indexed" not in str(e):
+                        raise
+            created.append((label, property_name))
+    return created
+
+
+def existing_indexes(redis_graph: Graph) -> Set[Tuple[str, str]]:
+    """Read the exact-match indexes of a graph.
+
+    :param redis_graph: The graph to read.
     :type redis_graph: Graph
+    :return: The label and property of each index.
+    :rtype: Set[Tuple[str, str]]
+    """
+    with handle_redis_errors("index"):
+        result = redis_graph.query("CALL db.indexes() YIELD type, label, properties")
+    return {
+        (label, property_name)
+        for index_type, label, properties in result.result_set
+        if index_type == "exact-match"
+        for property_name in properties
+    }
+
+
+@contextmanager
+def handle_redis_errors(step: str) -> Iterator[None]:
+    """Convert the errors of the Redis client libraries into Pycograph exceptions.
+
+    :param step: The name of the step, used in the error messages.
+    :type step: str
     :raises RedisConnectionException: If we can't connect to a Redis instance.
+    :raises RedisTimeoutException: If the Redis instance doesn't respond in time.
     :raises RedisWithoutGraphException: If the Redis instance doesn't support the
     GRAPH command.
     :raises RedisResponseException: If the Redis library threw an unclassified
     ResponseError.
     """
     try:
-        redis_graph.commit()
+        yield
     except redis.exceptions.ConnectionError as e:
         raise RedisConnectionException(
-            "Could not connect to the Redis instance at the step commit."
+            f"Could not connect to the Redis instance at the step {step}."
+        ) from e
+    except redis.exceptions.TimeoutError as e:
+        # Not a subclass of ConnectionError in redis-py 3.
+        raise RedisTimeoutException(
+            f"The Redis instance didn't respond in time at the step {step}."
         ) from e
     except redis.exceptions.ResponseError as e:
-        if str(e).startswith("unknown command `GRAPH.QUERY`"):
+        if str(e).startswith("unknown command `GRAPH."):
             msg = (
                 "You're connected to a Redis instance, "
                 "which doesn't support GRAPH commands."
@@ -76,6 +203,21 @@ def _commit_graph(redis_graph: Graph) -> None:
         raise RedisResponseException from e
 
 
+def _commit_graph(redis_graph: Graph) -> None:
+    """Commit a `Graph` and handle various errors that can occur.
+
+    :param redis_graph: The graph to be committed.
+    :type redis_graph: Graph
+    :raises RedisConnectionException: If we can't connect to a Redis instance.
+    :raises RedisWithoutGraphException: If the Redis instance doesn't support the
+    GRAPH command.
+    :raises RedisResponseException: If the Redis library threw an unclassified
+    ResponseError.
+    """
+    with handle_redis_errors("commit"):
+        redis_graph.commit()
+
+
 def _add_node_to_graph(obj: ObjectWithContext, graph: Graph) -> Node:
     """Add a node to a `Graph` from an object.
 
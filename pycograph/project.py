@@ -2,24 +2,42 @@
 
 import logging
 import os
-from typing import Dict, List, Optional
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from pycograph.exceptions import (
     ModuleWithInvalidContentException,
     NoPythonFileFoundException,
 )
+from pycograph.external_modules import ExternalModuleIndex
+from pycograph.file_discovery import FileDiscovery
+from pycograph.parse_cache import ParseCache, content_digest, load_entry
 from pycograph.schemas.basic_syntax_elements import (
     ABSOLUTE,
-    RELATIVE,
     ImportSyntaxElement,
+    SyntaxElement,
 )
 from pycograph.schemas.parse_result import (
+    ExternalModuleWithContext,
     ModuleWithContext,
     ObjectWithContext,
     PackageWithContext,
     ParseResult,
     ResolvedImportRelationship,
 )
+from pycograph.symbol_table import SymbolTable
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +50,67 @@ class PythonProject:
     and resolves their references in the context of a project.
     """
 
-    def __init__(self, root_dir_path: str) -> None:
-        """Initialize a project with a root dir path.
-
-        :param root_dir_path: The path of the project's root dir.
-        :type root_dir_path: str
+    def __init__(
+        self,
+        root_dir_path: Union[str, Sequence[str]],
+        jobs: int = 1,
+        parse_cache: Optional[ParseCache] = None,
+        keep_parsed_modules: bool = False,
+        file_discovery: Optional[FileDiscovery] = None,
+        external_module_index: Optional[ExternalModuleIndex] = None,
+    ) -> None:
+        """Initialize a project with one or more root dir paths.
+
+        The modules of all roots form one project,
+        so the imports between the roots are resolved.
+        If several roots contain a module with the same full name,
+        the first root wins, like the first entry of `sys.path`.
+
+        :param root_dir_path: The path of the project's root dir or a list of paths.
+        :type root_dir_path: Union[str, Sequence[str]]
+        :param jobs: The number of worker processes parsing the modules,
+        0 means one per CPU, defaults to 1
+        :type jobs: int
+        :param parse_cache: A cache for the modules' syntax elements, defaults to None
+        :type parse_cache: Optional[ParseCache]
+        :param keep_parsed_modules: Keep the modules' syntax elements in memory,
+        so that repeated parsing reads only the changed files, defaults to False
+        :type keep_parsed_modules: bool
+        :param file_discovery: Finds the project's Python files,
+        defaults to a discovery with the default excludes
+        :type file_discovery: Optional[FileDiscovery]
+        :param external_module_index: If provided, the imports of modules outside of
+        the project are resolved to external module objects, defaults to None
+        :type external_module_index: Optional[ExternalModuleIndex]
         """
-        self.root_dir_path: str = root_dir_path
+        self.root_dir_paths: List[str] = root_dir_paths(root_dir_path)
+        self.root_dir_path: str = self.root_dir_paths[0]
+        self.jobs: int = jobs or os.cpu_count() or 1
+        self.parse_cache = parse_cache
+        self.keep_parsed_modules = keep_parsed_modules
+        self.file_discovery = file_discovery or FileDiscovery()
+        self.external_module_index = external_module_index
+        # file path => (size, modification time in ns, syntax elements)
+        self.parsed_modules: Dict[
+            str, Tuple[int, int, Optional[List[SyntaxElement]]]
+        ] = {}
         self.modules: List[ModuleWithContext] = []
         self.objects: Dict[str, ObjectWithContext] = {}
-        self.imported_names: Dict[str, str] = {}
+        self.symbol_table = SymbolTable(self.objects)
+        self.external_modules: List[ExternalModuleWithContext] = []
+        # The full names of the packages, modules and external modules
+        # the last reparse might have changed, None if it parsed the whole project.
+        self.updated_units: Optional[Set[str]] = None
+        # the paths of the .py files found in the roots, in the order of discovery
+        self._module_files: List[str] = []
+        # the name a module's names are imported from => the module
+        self._module_owners: Dict[str, ModuleWithContext] = {}
+        # module full name => the full names of the modules its imports might refer to
+        self._imported_modules: Dict[str, Set[str]] = {}
+        # module full name => the full names of the modules that might import it
+        self._importers: DefaultDict[str, Set[str]] = defaultdict(set)
+        # external module full name => the number of imports resolved to it
+        self._external_imports: Counter = Counter()
 
     def parse(self) -> ParseResult:
         """Parse the .py files in the project's directory.
@@ -49,7 +118,28 @@ class PythonProject:
         :return: The parse result prepared for the graph model.
         :rtype: ParseResult
         """
+        # Go through the project's directory,
+        # find the packages and modules and parse the modules's contents.
+        for _ in self.iter_parsed_modules():
+            pass
+
+        # Resolve all the relationships in the context of this project.
+        for _ in self.iter_resolved_modules():
+            pass
+        return ParseResult(
+            objects=self.objects,
+        )
+
+    def iter_parsed_modules(self) -> Iterator[ModuleWithContext]:
+        """Find the packages and modules and parse the modules's contents.
+
+        Each module is yielded as soon as its content is parsed,
+        so that its nodes can be processed before the next module is parsed.
+        The packages are known when the first module is yielded.
 
+        :return: The parsed modules.
+        :rtype: Iterator[ModuleWithContext]
+        """
         # Go through the project's directory
         # and find the packages and modules.
         self._parse_file_system()
@@ -58,28 +148,217 @@ class PythonProject:
         # In this step, we find:
         # * all the objects that will become the nodes
         # * some basic data about the relationships.
-        self._parse_module_contents()
+        yield from self._iter_module_contents()
 
-        # Resolve all the relationships in the context of this project.
-        self._resolve_relationships()
-        return ParseResult(
-            objects=self.objects,
+    def reparse(self) -> ParseResult:
+        """Parse the project again after some of its files changed.
+
+        If the project keeps its parsed modules and its modules are the same
+        as at the previous parsing, the resolved objects are kept in memory.
+        Only the changed modules and the modules importing them
+        (directly or through re-exports) are rebuilt and resolved again.
+        The units these modules belong to are stored in `updated_units`.
+
+        If a module was added or removed, the whole project is parsed again
+        with a new set of objects, because any import might be resolved differently.
+        Even then, only the changed files are read.
+
+        :return: The parse result prepared for the graph model.
+        :rtype: ParseResult
+        """
+        if (
+            self.keep_parsed_modules
+            and self.modules
+            and self._discover_module_files() == self._module_files
+        ):
+            self._reparse_changed_modules()
+            return ParseResult(objects=self.objects)
+
+        self.modules = []
+        self.objects = {}
+        self.symbol_table = SymbolTable(self.objects)
+        self.external_modules = []
+        self.updated_units = None
+        self._module_owners = {}
+        self._imported_modules = {}
+        self._importers = defaultdict(set)
+        self._external_imports = Counter()
+        return self.parse()
+
+    def _reparse_changed_modules(self) -> None:
+        """Rebuild and resolve the changed modules and the modules importing them."""
+        changed_modules = [modu for modu in self.modules if self._is_changed(modu)]
+        affected_names = self._affected_modules(
+            modu.full_name for modu in changed_modules
         )
+        affected_modules = [
+            modu for modu in self.modules if modu.full_name in affected_names
+        ]
+        self.updated_units = set()
+        for modu in affected_modules:
+            self.updated_units.add(modu.full_name)
+            self.updated_units.add(modu.full_name.rpartition(".")[0])
+            self.updated_units.update(self._forget_module(modu))
+
+        # The changed modules are read again, the others are rebuilt from memory.
+        syntax_elements_by_module = dict(
+            zip(changed_modules, self._extract_syntax_elements(changed_modules))
+        )
+        for modu in affected_modules:
+            if modu in syntax_elements_by_module:
+                syntax_elements = syntax_elements_by_module[modu]
+            else:
+                syntax_elements = self.parsed_modules[modu.file_path][2]
+            if syntax_elements is None:
+                logger.error(
+                    f"Skipped module {modu.full_name} because of syntax error."
+                )
+            else:
+                self.objects.update(modu.add_syntax_elements(syntax_elements))
+        if self.parse_cache:
+            self.parse_cache.save()
+
+        self._resolve_imports(affected_modules)
+        if self.external_module_index:
+            self._resolve_external_imports(self.external_module_index, affected_modules)
+            self._forget_unused_external_modules()
+        for modu in affected_modules:
+            modu.resolve_calls(self.symbol_table.imported_names)
+            self.updated_units.update(
+                rel.destination_full_name
+                for rel in modu.relationships
+                if isinstance(
+                    self.objects.get(rel.destination_full_name),
+                    ExternalModuleWithContext,
+                )
+            )
+
+    def _is_changed(self, modu: ModuleWithContext) -> bool:
+        """Whether a module's file changed since it was parsed.
+
+        :param modu: The module.
+        :type modu: ModuleWithContext
+        :return: True if the module's file changed or its state is unknown.
+        :rtype: bool
+        """
+        file_stat = self._file_stat(modu)
+        parsed = self.parsed_modules.get(modu.file_path)
+        return not file_stat or not parsed or parsed[:2] != file_stat
+
+    def _affected_modules(self, module_names: Iterable[str]) -> Set[str]:
+        """Find the modules affected by changing some modules.
+
+        These are the modules themselves
+        and the modules importing them directly or through other modules.
+
+        :param module_names: The full names of the changed modules.
+        :type module_names: Iterable[str]
+        :return: The full names of the affected modules.
+        :rtype: Set[str]
+        """
+        affected = set(module_names)
+        worklist = deque(affected)
+        while worklist:
+            for importer in self._importers.get(worklist.popleft(), ()):
+                if importer not in affected:
+                    affected.add(importer)
+                    worklist.append(importer)
+        return affected
+
+    def _forget_module(self, modu: ModuleWithContext) -> Set[str]:
+        """Remove everything a module added to the project, except the module itself.
+
+        :param modu: The module to forget.
+        :type modu: ModuleWithContext
+        :return: The full names of the external modules the module imported.
+        :rtype: Set[str]
+        """
+        for obj in modu.with_contained_objects()[1:]:
+            if self.objects.get(obj.full_name) is obj:
+                del self.objects[obj.full_name]
+        external_names = set()
+        owner_name = _owner_name(modu)
+        for rel in modu.relationships:
+            if not isinstance(rel, ResolvedImportRelationship):
+                continue
+            destination = self.objects.get(rel.destination_full_name)
+            if isinstance(destination, ExternalModuleWithContext):
+                external_names.add(destination.full_name)
+                self._external_imports[destination.full_name] -= 1
+            else:
+                self.symbol_table.remove_imported_name(
+                    f"{owner_name}.{rel.import_element.name}"
+                )
+        for imported_module in self._imported_modules.pop(modu.full_name, ()):
+            self._importers[imported_module].discard(modu.full_name)
+        modu.names_in_scope = {}
+        modu.relationships = []
+        modu.unresolved_imports = []
+        modu.calls = []
+        modu.contained_objects = []
+        return external_names
+
+    def _forget_unused_external_modules(self) -> None:
+        """Remove the external modules that aren't imported anymore."""
+        for full_name, import_count in list(self._external_imports.items()):
+            if import_count <= 0:
+                del self._external_imports[full_name]
+                del self.objects[full_name]
+        self.external_modules = [
+            external_module
+            for external_module in self.external_modules
+            if external_module.full_name in self._external_imports
+        ]
+
+    def _discover_module_files(self) -> List[str]:
+        """Find the paths of the .py files in the project's root directories.
+
+        :return: The file paths in the order of discovery.
+        :rtype: List[str]
+        """
+        return [
+            os.path.join(current_dir, file_name)
+            for walk_result in self._walk_roots()
+            for current_dir, file_names in walk_result
+            for file_name in file_names
+        ]
 
     def _parse_file_system(self) -> None:
-        """Find the packages and modules int project's directory."""
-        for current_dir, dirs, files in os.walk(self.root_dir_path):
-            current_package = None
-            for file_name in files:
-                name_content, extension = os.path.splitext(file_name)
-                if extension == ".py" and file_name != "setup.py":
-                    if not current_package:
-                        current_package = self._add_package(current_dir)
-                    self._add_module_to_package(current_package, name_content)
+        """Find the packages and modules in the project's root directories."""
+        self._module_files = []
+        for root_dir_path, walk_result in zip(self.root_dir_paths, self._walk_roots()):
+            for current_dir, file_names in walk_result:
+                current_package = self._add_package(current_dir, root_dir_path)
+                for file_name in file_names:
+                    self._module_files.append(os.path.join(current_dir, file_name))
+                    name_content, _ = os.path.splitext(file_name)
+                    self._add_module_to_package(
+                        current_package, name_content, current_dir
+                    )
 
         if len(self.modules) == 0:
             raise NoPythonFileFoundException()
 
+    def _walk_roots(self) -> List[Iterable[Tuple[str, List[str]]]]:
+        """Find the directories containing Python files in each root.
+
+        Multiple roots are traversed concurrently in threads,
+        because the traversal mostly waits for the file system.
+        The results are in the order of the roots.
+
+        :return: The directories and their Python files' names for each root.
+        :rtype: List[Iterable[Tuple[str, List[str]]]]
+        """
+        if len(self.root_dir_paths) == 1:
+            return [self.file_discovery.walk(self.root_dir_path)]
+        with ThreadPoolExecutor(max_workers=len(self.root_dir_paths)) as executor:
+            return list(
+                executor.map(
+                    lambda root: list(self.file_discovery.walk(root)),
+                    self.root_dir_paths,
+                )
+            )
+
     def _add_object(self, obj: ObjectWithContext) -> None:
         """Add an object to the internal object collection.
 
@@ -88,20 +367,28 @@ class PythonProject:
         """
         self.objects[obj.full_name] = obj
 
-    def _add_package(self, dir_path: str) -> PackageWithContext:
+    def _add_package(self, dir_path: str, root_dir_path: str) -> PackageWithContext:
         """Create a package object and add it the project.
 
+        A package with the same name in another root is reused,
+        so the modules of both directories belong to the same package.
+
         :param dir_path: The directory path of the package.
         :type dir_path: str
-        :return: The created package object.
+        :param root_dir_path: The root directory containing the package.
+        :type root_dir_path: str
+        :return: The package object.
         :rtype: PackageWithContext
         """
-        package_path = os.path.relpath(dir_path, start=self.root_dir_path)
+        package_path = os.path.relpath(dir_path, start=root_dir_path)
         package_name = package_path.replace(os.path.sep, ".")
 
         # Workaround for the src dir structure.
         if package_name.startswith("src."):
             package_name = package_name.replace("src.", "")
+        existing = self.objects.get(package_name)
+        if isinstance(existing, PackageWithContext):
+            return existing
         pkg = PackageWithContext(
             name=package_name,
             full_name=package_name,
@@ -111,18 +398,28 @@ class PythonProject:
         return pkg
 
     def _add_module_to_package(
-        self, package: PackageWithContext, name: str
-    ) -> ModuleWithContext:
+        self, package: PackageWithContext, name: str, dir_path: str
+    ) -> Optional[ModuleWithContext]:
         """Create a module object in a package and add it to the project.
 
         :param package: The package where the module is located.
         :type package: PackageWithContext
         :param name: The module's name without the package prefix.
         :type name: str
-        :return: The created module object.
-        :rtype: ModuleWithContext
+        :param dir_path: The directory containing the module's file.
+        :type dir_path: str
+        :return: The created module object,
+        None if another root already contains a module with the same name.
+        :rtype: Optional[ModuleWithContext]
         """
-        modu = package.add_module(name)
+        full_name = f"{package.full_name}.{name}"
+        if full_name in self.objects:
+            logger.warning(
+                f"Skipped {os.path.join(dir_path, name)}.py, "
+                f"the module {full_name} is already in an earlier root."
+            )
+            return None
+        modu = package.add_module(name, dir_path)
         self._add_module(modu)
         return modu
 
@@ -134,6 +431,7 @@ class PythonProject:
         """
         self._add_object(modu)
         self.modules.append(modu)
+        self._module_owners[_owner_name(modu)] = modu
 
     def _parse_module_contents(self) -> None:
         """Go through all the modules and parse their contents.
@@ -142,95 +440,325 @@ class PythonProject:
         * all the objects that will become the nodes
         * some basic data about the relationships, that needs to be resolved later.
         """
-        for modu in self.modules:
-            try:
-                added_objects = modu.parse()
-            except ModuleWithInvalidContentException:
+        for _ in self._iter_module_contents():
+            pass
+
+    def _iter_module_contents(self) -> Iterator[ModuleWithContext]:
+        """Parse the modules' contents and yield each module after parsing it.
+
+        :return: The parsed modules, including the ones with invalid syntax.
+        :rtype: Iterator[ModuleWithContext]
+        """
+        for modu, syntax_elements in zip(self.modules, self._extract_syntax_elements()):
+            if syntax_elements is None:
                 logger.error(
                     f"Skipped module {modu.full_name} because of syntax error."
                 )
-                continue
-            self.objects.update(added_objects)
+            else:
+                self.objects.update(modu.add_syntax_elements(syntax_elements))
+            yield modu
+        if self.parse_cache:
+            self.parse_cache.save()
+        if self.keep_parsed_modules:
+            self._forget_deleted_modules()
+
+    def _extract_syntax_elements(
+        self, modules: Optional[List[ModuleWithContext]] = None
+    ) -> Iterator[Optional[List[SyntaxElement]]]:
+        """Read and parse the modules into basic syntax elements.
+
+        Modules that didn't change since the previous parsing are reused from memory,
+        if the project keeps its parsed modules.
+        Unchanged modules are loaded from the parse cache.
+        With more than 1 job, the other modules are distributed
+        between worker processes.
+        The results are yielded in the order of the modules in both cases,
+        so the objects are created exactly as in a serial run.
+
+        :param modules: The modules to parse, defaults to all modules of the project
+        :type modules: Optional[List[ModuleWithContext]]
+        :return: The syntax elements of each module, None for invalid modules.
+        :rtype: Iterator[Optional[List[SyntaxElement]]]
+        """
+        cache = self.parse_cache
+        if modules is None:
+            modules = self.modules
+        file_stats = [self._file_stat(modu) for modu in modules]
+        cached_results = [
+            self._get_parsed_module(modu, file_stat)
+            for modu, file_stat in zip(modules, file_stats)
+        ]
+        cache_dir = cache.cache_dir if cache else None
+        module_data = [
+            (modu.full_name, modu.file_path, modu.content, cache_dir)
+            for modu, cached in zip(modules, cached_results)
+            if cached is None
+        ]
+        extracted_results = self._run_extraction(module_data)
+        for modu, file_stat, syntax_elements in zip(
+            modules, file_stats, cached_results
+        ):
+            if syntax_elements is None:
+                digest, syntax_elements = next(extracted_results)
+                if cache and syntax_elements is not None and not modu.content:
+                    cache.put(modu.file_path, digest, syntax_elements)
+            if file_stat:
+                self.parsed_modules[modu.file_path] = (*file_stat, syntax_elements)
+            yield syntax_elements
+
+    def _file_stat(self, modu: ModuleWithContext) -> Optional[Tuple[int, int]]:
+        """Determine a module file's size and modification time if it's needed.
+
+        :param modu: The module.
+        :type modu: ModuleWithContext
+        :return: The file's size and modification time in ns,
+        None if the parsed modules aren't kept or the module's content is known.
+        :rtype: Optional[Tuple[int, int]]
+        """
+        if not self.keep_parsed_modules or modu.content:
+            return None
+        try:
+            stat = os.stat(modu.file_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _get_parsed_module(
+        self, modu: ModuleWithContext, file_stat: Optional[Tuple[int, int]]
+    ) -> Optional[List[SyntaxElement]]:
+        """Get the syntax elements of an unchanged module from memory or the cache.
+
+        A module with invalid syntax is kept in memory as well,
+        but it's parsed again to report the error.
+
+        :param modu: The module.
+        :type modu: ModuleWithContext
+        :param file_stat: The file's size and modification time in ns.
+        :type file_stat: Optional[Tuple[int, int]]
+        :return: The module's syntax elements or None.
+        :rtype: Optional[List[SyntaxElement]]
+        """
+        parsed = self.parsed_modules.get(modu.file_path)
+        if file_stat and parsed and parsed[:2] == file_stat:
+            return parsed[2]
+        if self.parse_cache and not modu.content:
+            return self.parse_cache.get(modu.file_path)
+        return None
 
-    def _resolve_relationships(self) -> None:
+    def _forget_deleted_modules(self) -> None:
+        """Remove the modules that aren't in the project anymore from the memory."""
+        file_paths = {modu.file_path for modu in self.modules}
+        for file_path in list(self.parsed_modules):
+            if file_path not in file_paths:
+                del self.parsed_modules[file_path]
+
+    def _run_extraction(
+        self, module_data: List[Tuple[str, str, str, Optional[str]]]
+    ) -> Iterator[Tuple[str, Optional[List[SyntaxElement]]]]:
+        """Extract the syntax elements of the modules, in worker processes if needed.
+
+        :param module_data: The data needed to find each module.
+        :type module_data: List[Tuple[str, str, str, Optional[str]]]
+        :return: The content digest and syntax elements of each module.
+        :rtype: Iterator[Tuple[str, Optional[List[SyntaxElement]]]]
+        """
+        if self.jobs == 1 or len(module_data) < 2:
+            yield from map(_extract_module_syntax_elements, module_data)
+            return
+        chunk_size = max(1, len(module_data) // (self.jobs * 4))
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            yield from executor.map(
+                _extract_module_syntax_elements, module_data, chunksize=chunk_size
+            )
+
+    def iter_resolved_modules(self) -> Iterator[ModuleWithContext]:
         """Resolve the relationships in the context of the project.
 
         The resolution steps have a strict order:
-        1. Resolve the imports.
-        2. Update the names in the modules's scopes based on the imports.
-        3. With the knowledge of the new names, resolve the calls relationships.
+        1. Resolve the imports, which adds the imported names to the modules' scopes.
+        2. With the knowledge of the new names, resolve the calls relationships.
+
+        The imports of all modules are resolved first,
+        the calls are resolved module by module.
+        Each module is yielded as soon as its relationships are final.
+
+        :return: The modules with resolved relationships.
+        :rtype: Iterator[ModuleWithContext]
         """
 
-        # We have multiple rounds of import resolution
-        # In case an import is referencing an imported name.
-        # Currently, we have 3 rounds hard-coded.
-        # An alternative would be to loop until we find new imports to resolve.
-        for _ in range(3):
-            for modu in self.modules:
-                self._resolve_imports(modu)
-
-        # With resolving the imports,
-        # we defined several new names in the modules.
-        # We need to pass those to the content of the modules.
-        for modu in self.modules:
-            modu.update_names_in_scope_for_content()
+        self._resolve_imports()
+        if self.external_module_index:
+            self._resolve_external_imports(self.external_module_index)
 
-        # After defining the new names, we can resolve the function calls.
         for modu in self.modules:
-            modu.resolve_calls(self.imported_names)
+            # With resolving the imports,
+            # we defined several new names in the modules.
+            # The contained objects find them through their enclosing scopes,
+            # so we can resolve the function calls.
+            modu.resolve_calls(self.symbol_table.imported_names)
+            yield modu
+
+    def _resolve_imports(
+        self, modules: Optional[List[ModuleWithContext]] = None
+    ) -> None:
+        """Resolve the imports of the modules until no further import can be resolved.
+
+        An import can refer to a name imported by another module (a re-export),
+        so it might be resolvable only after another import.
+        Each import that can't be resolved waits for the names it could refer to.
+        When one of these names gets imported, only its waiting imports are retried.
+        This way, each import is retried only when it might have become resolvable
+        and re-export chains of any depth are resolved.
+        The imports that remain unresolved are kept in their modules.
+        The modules each module's imports might refer to are registered,
+        so that a module can be resolved again when one of these modules changes.
+
+        :param modules: The modules whose imports are resolved,
+        defaults to all modules of the project
+        :type modules: Optional[List[ModuleWithContext]]
+        """
+        if modules is None:
+            modules = self.modules
+        imports = [
+            (modu, import_elem)
+            for modu in modules
+            for import_elem in modu.unresolved_imports
+        ]
+        resolved = [False] * len(imports)
+        # reference name => indexes of the imports waiting for the name to be imported
+        waiting: DefaultDict[str, List[int]] = defaultdict(list)
+        worklist = deque(range(len(imports)))
+        while worklist:
+            index = worklist.popleft()
+            if resolved[index]:
+                continue
+            modu, import_elem = imports[index]
+            resolve_result = self.symbol_table.resolve_import(
+                import_elem, modu.full_name
+            )
+            if isinstance(resolve_result, ExternalModuleWithContext):
+                # The external modules of a previous parsing are resolved
+                # only after the project's imports, as in the first parsing.
+                resolve_result = None
+            if resolve_result:
+                resolved[index] = True
+                reference_name = self._process_resolved_import(
+                    modu, import_elem, resolve_result
+                )
+                worklist.extend(waiting.pop(reference_name, ()))
+            else:
+                for candidate in self.symbol_table.import_candidates(
+                    import_elem, modu.full_name
+                ):
+                    waiting[candidate].append(index)
 
-    def _resolve_imports(self, modu: ModuleWithContext):
-        """Try to resolve a module's unresolved imports in the project's context.
+        for modu in modules:
+            modu.unresolved_imports = []
+        for (modu, import_elem), is_resolved in zip(imports, resolved):
+            if not is_resolved:
+                modu.unresolved_imports.append(import_elem)
+            self._register_imported_modules(modu, import_elem)
 
-        :param modu: The module whose imports are resolved.
+    def _register_imported_modules(
+        self, modu: ModuleWithContext, import_elem: ImportSyntaxElement
+    ) -> None:
+        """Register the modules an import might refer to, resolved or not.
+
+        Each candidate name belongs to the module with the longest matching name.
+
+        :param modu: The module where the import is located.
         :type modu: ModuleWithContext
+        :param import_elem: The import syntax element.
+        :type import_elem: ImportSyntaxElement
         """
-        import_defs = modu.unresolved_imports.copy()
-        modu.unresolved_imports = []
-
-        for imp_rel in import_defs:
-            resolve_result = self._resolve_import(imp_rel, modu.full_name)
-            if resolve_result:
-                self._process_resolved_import(modu, imp_rel, resolve_result)
-            else:
-                modu.unresolved_imports.append(imp_rel)
-
-    def _resolve_import(
-        self, import_elem: ImportSyntaxElement, module_full_name: str
-    ) -> Optional[ObjectWithContext]:
-        """Resolve which object an import syntax element is referring to.
-
-        :param import_element: An import syntax element.
-        :type import_element: ImportSyntaxElement
-        :param module_full_name: The full name of the module where the import is.
-        :type module_full_name: str
-        :return: The object the import syntax element is referring to.
-        :rtype: Optional[ObjectWithContext]
+        imported_modules = self._imported_modules.setdefault(modu.full_name, set())
+        for candidate in self.symbol_table.import_candidates(
+            import_elem, modu.full_name
+        ):
+            name = candidate
+            while name:
+                owner = self._module_owners.get(name)
+                if owner is not None:
+                    if owner is not modu:
+                        imported_modules.add(owner.full_name)
+                        self._importers[owner.full_name].add(modu.full_name)
+                    break
+                name = name.rpartition(".")[0]
+
+    def _resolve_external_imports(
+        self,
+        index: ExternalModuleIndex,
+        modules: Optional[List[ModuleWithContext]] = None,
+    ) -> None:
+        """Resolve the remaining absolute imports to modules outside of the project.
+
+        An external module object is created for each imported top-level module,
+        unless the project contains an object with the same name.
+        The imported names aren't added to the modules' scopes,
+        so the calls of external objects aren't resolved.
+
+        :param index: The index of the external modules.
+        :type index: ExternalModuleIndex
+        :param modules: The modules whose imports are resolved,
+        defaults to all modules of the project
+        :type modules: Optional[List[ModuleWithContext]]
         """
-        if import_elem.reference_type() == ABSOLUTE:
-            imported_thing = self._find_by_full_name(import_elem.what_full_name())
-            if imported_thing:
-                return imported_thing
-            # check the importer module's directory
-            sibling_module_path = self._get_relative_imported_path(
-                module_full_name, import_elem.what_full_name(), 1
-            )
-            return self._find_by_full_name(sibling_module_path)
-        if import_elem.reference_type() == RELATIVE:
-            relative_import_path = self._get_relative_imported_path(
-                module_full_name,
-                import_elem.what_full_name(),
-                import_elem.level,  # type: ignore
-            )
-            return self._find_by_full_name(relative_import_path)
-        return None
+        if modules is None:
+            modules = self.modules
+        for modu in modules:
+            unresolved_imports = []
+            for import_elem in modu.unresolved_imports:
+                top_level_name = None
+                if import_elem.reference_type() == ABSOLUTE:
+                    top_level_name = index.top_level_module(
+                        import_elem.what_full_name()
+                    )
+                external_module = (
+                    self._get_external_module(top_level_name)
+                    if top_level_name
+                    else None
+                )
+                if not external_module:
+                    unresolved_imports.append(import_elem)
+                    continue
+                modu.relationships.append(
+                    ResolvedImportRelationship(
+                        destination_full_name=external_module.full_name,
+                        import_element=import_elem,
+                    )
+                )
+                self._external_imports[external_module.full_name] += 1
+            modu.unresolved_imports = unresolved_imports
+
+    def _get_external_module(
+        self, top_level_name: str
+    ) -> Optional[ExternalModuleWithContext]:
+        """Get or create the object of an external module.
+
+        :param top_level_name: The external module's top-level name.
+        :type top_level_name: str
+        :return: The external module object,
+        None if a project object has the same name.
+        :rtype: Optional[ExternalModuleWithContext]
+        """
+        existing = self.objects.get(top_level_name)
+        if existing is not None:
+            if isinstance(existing, ExternalModuleWithContext):
+                return existing
+            return None
+        external_module = ExternalModuleWithContext(
+            name=top_level_name, full_name=top_level_name
+        )
+        self._add_object(external_module)
+        self.external_modules.append(external_module)
+        return external_module
 
     def _process_resolved_import(
         self,
         modu: ModuleWithContext,
         imp_rel: ImportSyntaxElement,
         resolve_result: ObjectWithContext,
-    ):
+    ) -> str:
         """Process a resolved import.
 
         * Add the name to the module's scope,
@@ -245,6 +773,8 @@ class PythonProject:
         :type imp_rel: ImportSyntaxElement
         :param resolve_result: The object the import is referring to.
         :type resolve_result: ObjectWithContext
+        :return: The name registered in the project.
+        :rtype: str
         """
         modu.names_in_scope[imp_rel.name_in_importer()] = resolve_result.full_name
         resolved_imp_rel = ResolvedImportRelationship(
@@ -252,46 +782,66 @@ class PythonProject:
             import_element=imp_rel,
         )
         modu.relationships.append(resolved_imp_rel)
-        if modu.label() == "init":
-            owner_name = modu.full_name.replace(".__init__", "")
-        else:
-            owner_name = modu.full_name
-        reference_name = f"{owner_name}.{imp_rel.name}"
-        self.imported_names[reference_name] = resolve_result.full_name
-
-    def _find_by_full_name(self, reference_name: str) -> Optional[ObjectWithContext]:
-        """Find the object belonging to a full name.
-
-        Search at the following places:
-        1. The project's objects.
-        2. The project's imported names.
-
-        :param reference_name: The full name we're searching for.
-        :type reference_name: str
-        :return: The object belonging to this full name.
-        :rtype: Optional[ObjectWithContext]
-        """
-        basic = self.objects.get(reference_name)
-        if basic:
-            return basic
-        referenced_full_name = self.imported_names.get(reference_name)
-        if referenced_full_name:
-            return self._find_by_full_name(referenced_full_name)
-        return None
+        reference_name = f"{_owner_name(modu)}.{imp_rel.name}"
+        self.symbol_table.add_imported_name(reference_name, resolve_result.full_name)
+        return reference_name
 
-    def _get_relative_imported_path(
-        self, module_full_name: str, import_full_name: str, level: int
-    ) -> str:
-        """Determine the path a relative import is referring to.
-
-        :param module_full_name: The module's full name, where the import is located.
-        :type module_full_name: str
-        :param import_full_name: The imported name.
-        :type import_full_name: str
-        :param level: The relative import's level.
-        :type level: int
-        :return: The full name this import is referring to.
-        :rtype: str
-        """
-        relative_pkg = ".".join(module_full_name.split(".")[:-(level)])
-        return f"{relative_pkg}.{import_full_name}"
+
+def root_dir_paths(root_dir_path: Union[str, Sequence[str]]) -> List[str]:
+    """Convert one or more root dir paths into a list.
+
+    :param root_dir_path: The path of a root dir or a list of paths.
+    :type root_dir_path: Union[str, Sequence[str]]
+    :return: The paths of the root dirs.
+    :rtype: List[str]
+    """
+    if isinstance(root_dir_path, (str, os.PathLike)):
+        return [str(root_dir_path)]
+    return [str(path) for path in root_dir_path]
+
+
+def _owner_name(modu: ModuleWithContext) -> str:
+    """Determine the name other modules import a module's names from.
+
+    :param modu: The module.
+    :type modu: ModuleWithContext
+    :return: The module's full name, the package's name for an `__init__` module.
+    :rtype: str
+    """
+    if modu.name == "__init__":
+        return modu.full_name.replace(".__init__", "")
+    return modu.full_name
+
+
+def _extract_module_syntax_elements(
+    module_data: Tuple[str, str, str, Optional[str]]
+) -> Tuple[str, Optional[List[SyntaxElement]]]:
+    """Read and parse one module. This function runs in the worker processes.
+
+    Only the data needed to find the module is sent to the worker
+    and only the content digest and the syntax elements are sent back.
+    The file is read as bytes and released as soon as it's parsed.
+    If the parse cache contains the digest (e.g. a copy of another module),
+    the module isn't parsed.
+
+    :param module_data: The module's full name, file path, already known content
+    and the parse cache directory.
+    :type module_data: Tuple[str, str, str, Optional[str]]
+    :return: The module's content digest and syntax elements,
+    None instead of the syntax elements if the module contains invalid syntax.
+    :rtype: Tuple[str, Optional[List[SyntaxElement]]]
+    """
+    full_name, file_path, content, cache_dir = module_data
+    modu = ModuleWithContext(
+        name=full_name, full_name=full_name, file_path=file_path, content=content
+    )
+    with modu.open_source() as source:
+        digest = content_digest(source)
+        if cache_dir:
+            cached = load_entry(cache_dir, digest)
+            if cached is not None:
+                return digest, cached
+        try:
+            return digest, modu.parse_source(source)
+        except ModuleWithInvalidContentException:
+            return digest, None
@@ -1,19 +1,422 @@
-"""Main module for Pycograph"""
+"""Main module for Pycograph
+
+Each function can be called with its own `Settings` object,
+otherwise it uses the global settings.
+Functions called with their own settings can run concurrently in threads.
+"""
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
 from redisgraph.graph import Graph  # type: ignore
 
+from pycograph.async_loader import DEFAULT_MAX_IN_FLIGHT, load_project_async
+from pycograph.bulk_insert import bulk_insert
+from pycograph.config import Settings, use_settings
+from pycograph.exporters import (
+    Compression,
+    ExportFormat,
+    ExportResult,
+    export_parse_result,
+)
+from pycograph.external_modules import (
+    ExternalModuleIndex,
+    load_index,
+    user_cache_dir,
+)
+from pycograph.file_discovery import FileDiscovery
+from pycograph.graph_store import GraphStore
+from pycograph.graph_swap import swapped_graph
+from pycograph.graph_writer import DEFAULT_BUFFER_SIZE, GraphWriter, open_graph
+from pycograph.incremental_update import GraphUpdateResult, update_graph
+from pycograph.parse_cache import CACHE_DIR_NAME, ParseCache
 from pycograph.parse_result_to_redisgraph import populate_graph
 from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
 from pycograph.schemas.pycograph_input import PycographLoadInput
+from pycograph.streaming import stream_project
+from pycograph.watch import watch_project
 
 
-def load(load_input: PycographLoadInput) -> Graph:
+def load(load_input: PycographLoadInput, config: Optional[Settings] = None) -> Graph:
     """Load a Python project's code into a graph model.
 
+    The modules of all the project's root directories are loaded into one graph.
+    With the `upsert` setting, the graph is merged into the existing one with
+    batched queries instead of being committed in one query.
+    The returned graph doesn't hold the nodes and edges in memory then.
+
     :param load_input: An object containing the input data.
     :type load_input: PycographLoadInput
+    :param config: The settings of this load, defaults to the global settings
+    :type config: Optional[Settings]
     :return: A RedisGraph graph with the parsed Python project.
     :rtype: Graph
     """
-    project = PythonProject(root_dir_path=load_input.project_dir_path)  # type: ignore
-    project_parse_result = project.parse()
-    return populate_graph(load_input.graph_name, project_parse_result)  # type: ignore
+    with use_settings(config) as active_config:
+        project_parse_result = _parse_project(load_input, active_config)
+        with _target_graph(load_input, active_config) as graph_name:
+            if active_config.upsert:
+                redis_graph = _upsert_graph(graph_name, project_parse_result)
+            else:
+                redis_graph = populate_graph(graph_name, project_parse_result)
+    # After a swap, the graph is found under its live name.
+    redis_graph.name = load_input.graph_name
+    return redis_graph
+
+
+def write(
+    load_input: PycographLoadInput, config: Optional[Settings] = None
+) -> GraphUpdateResult:
+    """Load a Python project's code into a graph model with batched queries.
+
+    Unlike `load`, no `Graph` is built in memory and committed in one query.
+    The nodes and then the edges are sent in parameterized queries,
+    in batches adapted to the latency of the queries.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary of the written graph.
+    :rtype: GraphUpdateResult
+    """
+    with use_settings(config) as active_config:
+        project_parse_result = _parse_project(load_input, active_config)
+        with _target_graph(load_input, active_config) as graph_name:
+            writer = GraphWriter(open_graph(graph_name))
+            writer.add_parse_result(project_parse_result)
+            writer.flush()
+    return GraphUpdateResult(
+        graph_name=load_input.graph_name,  # type: ignore
+        nodes_added=writer.nodes_added,
+        edges_added=writer.edges_added,
+        queries=writer.pipeline.queries,
+        round_trips=writer.pipeline.round_trips,
+    )
+
+
+def bulk(
+    load_input: PycographLoadInput, config: Optional[Settings] = None
+) -> GraphUpdateResult:
+    """Load a Python project's code into a new graph with bulk insert commands.
+
+    The nodes and edges are sent in RedisGraph's binary bulk format,
+    in batches of the size set in the settings.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary of the created graph.
+    :rtype: GraphUpdateResult
+    """
+    with use_settings(config) as active_config:
+        project_parse_result = _parse_project(load_input, active_config)
+        with _target_graph(load_input, active_config) as graph_name:
+            update_result = bulk_insert(graph_name, project_parse_result)
+    update_result.graph_name = load_input.graph_name  # type: ignore
+    return update_result
+
+
+def export(
+    load_input: PycographLoadInput,
+    output_dir: str,
+    export_format: ExportFormat = ExportFormat.jsonl,
+    compression: Optional[Compression] = None,
+    config: Optional[Settings] = None,
+) -> ExportResult:
+    """Export a Python project's graph model to files, without Redis.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param output_dir: The directory where the files are written.
+    :type output_dir: str
+    :param export_format: The format of the files, defaults to ExportFormat.jsonl
+    :type export_format: ExportFormat
+    :param compression: The compression of the files, defaults to None
+    :type compression: Optional[Compression]
+    :param config: The settings of this export, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary of the export.
+    :rtype: ExportResult
+    """
+    with use_settings(config) as active_config:
+        project_parse_result = _parse_project(load_input, active_config)
+        return export_parse_result(
+            project_parse_result, output_dir, export_format, compression
+        )
+
+
+def graph_store(
+    load_input: PycographLoadInput, config: Optional[Settings] = None
+) -> GraphStore:
+    """Load a Python project's graph model into memory to query it without Redis.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The graph store with the parsed Python project.
+    :rtype: GraphStore
+    """
+    with use_settings(config) as active_config:
+        return GraphStore(_parse_project(load_input, active_config))
+
+
+def update(
+    load_input: PycographLoadInput, config: Optional[Settings] = None
+) -> GraphUpdateResult:
+    """Update the graph model of a Python project incrementally.
+
+    Only the packages and modules changed since the last update are rewritten.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this update, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary of the update.
+    :rtype: GraphUpdateResult
+    """
+    with use_settings(config) as active_config:
+        project_parse_result = _parse_project(load_input, active_config)
+        return update_graph(load_input.graph_name, project_parse_result)  # type: ignore
+
+
+def stream(
+    load_input: PycographLoadInput,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    config: Optional[Settings] = None,
+) -> GraphUpdateResult:
+    """Load a Python project's code into a graph model while parsing it.
+
+    The nodes and edges are written in batches
+    as soon as they are final, instead of building the whole graph in memory.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param buffer_size: The number of nodes and edges buffered before writing them,
+    defaults to DEFAULT_BUFFER_SIZE
+    :type buffer_size: int
+    :param config: The settings of this load, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary of the written graph.
+    :rtype: GraphUpdateResult
+    """
+    with use_settings(config) as active_config:
+        project = _create_project(load_input, active_config)
+        with _target_graph(load_input, active_config) as graph_name:
+            update_result = stream_project(project, graph_name, buffer_size)
+    update_result.graph_name = load_input.graph_name  # type: ignore
+    return update_result
+
+
+async def aload(
+    load_input: PycographLoadInput,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    config: Optional[Settings] = None,
+) -> GraphUpdateResult:
+    """Load a Python project's code into a graph model, writing while parsing.
+
+    Like `stream`, but several batches are written concurrently
+    while the parser goes on, so parsing and waiting for Redis overlap.
+    When `max_in_flight` batches are in flight, the parser waits for one of them.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param buffer_size: The number of nodes and edges buffered before writing them,
+    defaults to DEFAULT_BUFFER_SIZE
+    :type buffer_size: int
+    :param max_in_flight: The maximal number of batches written concurrently,
+    defaults to DEFAULT_MAX_IN_FLIGHT
+    :type max_in_flight: int
+    :param config: The settings of this load, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary of the written graph.
+    :rtype: GraphUpdateResult
+    """
+    with use_settings(config) as active_config:
+        project = _create_project(load_input, active_config)
+        with _target_graph(load_input, active_config) as graph_name:
+            update_result = await load_project_async(
+                project, graph_name, buffer_size, max_in_flight
+            )
+    update_result.graph_name = load_input.graph_name  # type: ignore
+    return update_result
+
+
+def watch(
+    load_input: PycographLoadInput,
+    interval: float,
+    debounce: float,
+    config: Optional[Settings] = None,
+) -> Iterator[Tuple[GraphUpdateResult, float]]:
+    """Keep the graph model of a Python project up to date with its files.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param interval: Seconds between two checks for changes.
+    :type interval: float
+    :param debounce: Seconds without changes before the graph is updated.
+    :type debounce: float
+    :param config: The settings of this watch, defaults to the global settings
+    :type config: Optional[Settings]
+    :return: The summary and the duration in seconds of each update.
+    :rtype: Iterator[Tuple[GraphUpdateResult, float]]
+    """
+    # The settings are active only while a round runs, not between the rounds.
+    with use_settings(config) as active_config:
+        parse_cache = _parse_cache(load_input, active_config)
+        file_discovery = _file_discovery(active_config)
+        external_module_index = _external_module_index(active_config)
+    yield from watch_project(
+        project_dir_path=[str(path) for path in load_input.project_dir_paths],
+        graph_name=load_input.graph_name,  # type: ignore
+        jobs=active_config.jobs,
+        parse_cache=parse_cache,
+        file_discovery=file_discovery,
+        external_module_index=external_module_index,
+        interval=interval,
+        debounce=debounce,
+        config=active_config,
+    )
+
+
+@contextmanager
+def _target_graph(load_input: PycographLoadInput, config: Settings) -> Iterator[str]:
+    """The name of the graph to write, a temporary one if the graph is swapped in.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of the load.
+    :type config: Settings
+    :return: The name of the graph to write.
+    :rtype: Iterator[str]
+    """
+    if not config.swap_graph:
+        yield load_input.graph_name  # type: ignore
+        return
+    with swapped_graph(load_input.graph_name) as building_name:  # type: ignore
+        yield building_name
+
+
+def _upsert_graph(graph_name: str, parse_result: ParseResult) -> Graph:
+    """Merge a parsed project into a graph with batched queries.
+
+    :param graph_name: The name of the graph.
+    :type graph_name: str
+    :param parse_result: The parsed project.
+    :type parse_result: ParseResult
+    :return: The graph, without its nodes and edges in memory.
+    :rtype: Graph
+    """
+    redis_graph = open_graph(graph_name)
+    writer = GraphWriter(redis_graph, upsert=True)
+    writer.add_parse_result(parse_result)
+    writer.flush()
+    return redis_graph
+
+
+def _parse_project(load_input: PycographLoadInput, config: Settings) -> ParseResult:
+    """Parse the Python project described by the input.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load.
+    :type config: Settings
+    :return: The parse result prepared for the graph model.
+    :rtype: ParseResult
+    """
+    return _create_project(load_input, config).parse()
+
+
+def _create_project(load_input: PycographLoadInput, config: Settings) -> PythonProject:
+    """Create the Python project described by the input.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load.
+    :type config: Settings
+    :return: The project, which isn't parsed yet.
+    :rtype: PythonProject
+    """
+    return PythonProject(
+        root_dir_path=[str(path) for path in load_input.project_dir_paths],
+        jobs=config.jobs,
+        parse_cache=_parse_cache(load_input, config),
+        file_discovery=_file_discovery(config),
+        external_module_index=_external_module_index(config),
+    )
+
+
+def _file_discovery(config: Settings) -> FileDiscovery:
+    """Create the discovery of the project's Python files based on the settings.
+
+    :param config: The settings of this load.
+    :type config: Settings
+    :return: The file discovery.
+    :rtype: FileDiscovery
+    """
+    return FileDiscovery(
+        include=config.include,
+        exclude=config.exclude,
+        use_default_excludes=config.use_default_excludes,
+        use_gitignore=config.use_gitignore,
+        max_file_size=config.max_file_size,
+    )
+
+
+def _parse_cache(
+    load_input: PycographLoadInput, config: Settings
+) -> Optional[ParseCache]:
+    """Create the parse cache based on the settings.
+
+    By default, the cache is stored in the project's directory.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load.
+    :type config: Settings
+    :return: The parse cache or None if it's turned off.
+    :rtype: Optional[ParseCache]
+    """
+    if not (config.use_parse_cache or config.clear_parse_cache):
+        return None
+    parse_cache = ParseCache(
+        _cache_dir(load_input, config), max_size=config.parse_cache_max_size
+    )
+    if config.clear_parse_cache:
+        parse_cache.clear()
+    return parse_cache if config.use_parse_cache else None
+
+
+def _external_module_index(config: Settings) -> Optional[ExternalModuleIndex]:
+    """Load the index of the external modules if they should be resolved.
+
+    The index is cached in the user's cache directory,
+    independently of the parse cache.
+
+    :param config: The settings of this load.
+    :type config: Settings
+    :return: The index or None if the external imports aren't resolved.
+    :rtype: Optional[ExternalModuleIndex]
+    """
+    if not config.resolve_external_imports:
+        return None
+    return load_index(user_cache_dir())
+
+
+def _cache_dir(load_input: PycographLoadInput, config: Settings) -> str:
+    """Determine the cache directory, by default in the first root directory.
+
+    :param load_input: An object containing the input data.
+    :type load_input: PycographLoadInput
+    :param config: The settings of this load.
+    :type config: Settings
+    :return: The path of the cache directory.
+    :rtype: str
+    """
+    return config.parse_cache_dir or os.path.join(
+        load_input.project_dir_path, CACHE_DIR_NAME  # type: ignore
+    )
@@ -1 +1 @@
-"""Pydantic schemas used by Pycograph."""
+"""Schemas used by Pycograph."""
@@ -1,21 +1,26 @@
 """Basic syntax elements the output of the parsing by ast.
 
 These objects should contain only properties and simple methods.
+
+Parsing a big code base creates millions of syntax elements,
+so they are lightweight slotted objects instead of pydantic models.
+They are created only from the abstract syntax tree, not from user input,
+so they aren't validated.
 """
 
 from abc import ABC
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pycograph.schemas.record import Record
 
 ABSOLUTE = "absolute"
 RELATIVE = "relative"
 
 
-class SyntaxElement(BaseModel, ABC):
+class SyntaxElement(Record, ABC):
     """The base class for all syntax element classes."""
 
-    pass
+    __slots__ = ()
 
 
 class DefinitionSyntaxElement(SyntaxElement, ABC):
@@ -24,6 +29,8 @@ class DefinitionSyntaxElement(SyntaxElement, ABC):
     Examples: class, function, constant.
     """
 
+    __slots__ = ()
+
     name: str
 
 
@@ -33,7 +40,9 @@ class BlockSyntaxElement(SyntaxElement, ABC):
     They can contain multiple further syntax elements.
     """
 
-    syntax_elements: List[SyntaxElement] = []
+    __slots__ = ()
+
+    syntax_elements: List[SyntaxElement]
 
     def add_syntax_elements(self, syntax_elements: List[SyntaxElement]):
         self.syntax_elements.extend(syntax_elements)
@@ -45,7 +54,14 @@ class ClassDefSyntaxElement(DefinitionSyntaxElement, BlockSyntaxElement):
     It can contain multiple syntax elements, e.g. function definitions.
     """
 
-    pass
+    __slots__ = ("name", "syntax_elements")
+    _fields = ("name", "syntax_elements")
+
+    def __init__(
+        self, *, name: str, syntax_elements: Optional[List[SyntaxElement]] = None
+    ) -> None:
+        self.name = name
+        self.syntax_elements = syntax_elements if syntax_elements is not None else []
 
 
 class FunctionDefSyntaxElement(DefinitionSyntaxElement, BlockSyntaxElement):
@@ -54,27 +70,48 @@ class FunctionDefSyntaxElement(DefinitionSyntaxElement, BlockSyntaxElement):
     It can contain multiple syntax elements, mainly calls.
     """
 
-    pass
+    __slots__ = ("name", "syntax_elements")
+    _fields = ("name", "syntax_elements")
+
+    def __init__(
+        self, *, name: str, syntax_elements: Optional[List[SyntaxElement]] = None
+    ) -> None:
+        self.name = name
+        self.syntax_elements = syntax_elements if syntax_elements is not None else []
 
 
 class ConstantSyntaxElement(DefinitionSyntaxElement):
     """Constant definition."""
 
-    pass
+    __slots__ = ("name",)
+    _fields = ("name",)
+
+    def __init__(self, *, name: str) -> None:
+        self.name = name
 
 
 class CallSyntaxElement(SyntaxElement):
     """A call from one named object to another."""
 
-    what_reference_name: str
-    called_attribute: Optional[str]
+    __slots__ = ("what_reference_name", "called_attribute")
+    _fields = ("what_reference_name", "called_attribute")
+
+    def __init__(
+        self, *, what_reference_name: str, called_attribute: Optional[str] = None
+    ) -> None:
+        self.what_reference_name = what_reference_name
+        self.called_attribute = called_attribute
 
 
 class ImportSyntaxElement(SyntaxElement):
     """The representation of an import statement."""
 
-    name: str
-    as_name: Optional[str]
+    __slots__ = ("name", "as_name")
+    _fields = ("name", "as_name")
+
+    def __init__(self, *, name: str, as_name: Optional[str] = None) -> None:
+        self.name = name
+        self.as_name = as_name
 
     def name_in_importer(self):
         return self.as_name or self.name
@@ -89,8 +126,20 @@ class ImportSyntaxElement(SyntaxElement):
 class ImportFromSyntaxElement(ImportSyntaxElement):
     """The representation of an import from statement."""
 
-    from_text: Optional[str]
-    level: int
+    __slots__ = ("from_text", "level")
+    _fields = ("name", "as_name", "from_text", "level")
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        as_name: Optional[str] = None,
+        from_text: Optional[str] = None,
+        level: int = 0,
+    ) -> None:
+        super().__init__(name=name, as_name=as_name)
+        self.from_text = from_text
+        self.level = level
 
     def what_full_name(self):
         if self.from_text:
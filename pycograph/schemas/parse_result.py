@@ -6,14 +6,14 @@ They contain contextual information and methods with logic.
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel
+from contextlib import contextmanager
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple
 
 from pycograph.ast_to_basic_syntax_elements import parse_module
-from pycograph.config import settings
+from pycograph.config import active_settings
 from pycograph.exceptions import ModuleWithInvalidContentException
 from pycograph.helpers.name_analyzer import determine_full_name_parts
+from pycograph.helpers.source_reader import Source, open_source
 from pycograph.schemas.basic_syntax_elements import (
     BlockSyntaxElement,
     CallSyntaxElement,
@@ -24,6 +24,7 @@ from pycograph.schemas.basic_syntax_elements import (
     ImportSyntaxElement,
     SyntaxElement,
 )
+from pycograph.schemas.record import Record
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ CALLS = "calls"
 IMPORTS = "imports"
 
 
-class Relationship(BaseModel, ABC):
+class Relationship(Record, ABC):
     """Base class for all relationship classes.
 
     These classes will be converted into the graph's edges.
@@ -40,8 +41,13 @@ class Relationship(BaseModel, ABC):
     The destination object's full name is stored as a property in the relationship.
     """
 
-    name: str
-    destination_full_name: str
+    __slots__ = ("destination_full_name",)
+    _fields = ("destination_full_name",)
+
+    name: ClassVar[str]
+
+    def __init__(self, *, destination_full_name: str) -> None:
+        self.destination_full_name = destination_full_name
 
     def properties(self) -> Dict[str, Any]:
         return {}
@@ -50,20 +56,42 @@ class Relationship(BaseModel, ABC):
 class ContainsRelationship(Relationship):
     """Contains relationship between two objects."""
 
-    name: str = CONTAINS
+    __slots__ = ()
+
+    name = CONTAINS
 
 
 class CallsRelationship(Relationship):
-    """Calls relationship between two objects."""
+    """Calls relationship between two objects.
+
+    If the calls are aggregated, one relationship represents all the identical calls
+    of its source object and `count` shows their number.
+    """
+
+    __slots__ = ("syntax_element", "count")
+    _fields = ("destination_full_name", "syntax_element", "count")
 
-    name: str = CALLS
-    syntax_element: CallSyntaxElement
+    name = CALLS
+
+    def __init__(
+        self,
+        *,
+        destination_full_name: str,
+        syntax_element: CallSyntaxElement,
+        count: int = 1,
+    ) -> None:
+        super().__init__(destination_full_name=destination_full_name)
+        self.syntax_element = syntax_element
+        self.count = count
 
     def properties(self) -> Dict[str, Any]:
-        return {
+        properties: Dict[str, Any] = {
             "reference_name": self.syntax_element.what_reference_name,
             "called_attribute": self.syntax_element.called_attribute or "",
         }
+        if active_settings().aggregate_calls:
+            properties["count"] = self.count
+        return properties
 
 
 class ResolvedImportRelationship(Relationship):
@@ -73,8 +101,16 @@ class ResolvedImportRelationship(Relationship):
     when we've figured out the full name of the imported object.
     """
 
-    name: str = IMPORTS
-    import_element: ImportSyntaxElement
+    __slots__ = ("import_element",)
+    _fields = ("destination_full_name", "import_element")
+
+    name = IMPORTS
+
+    def __init__(
+        self, *, destination_full_name: str, import_element: ImportSyntaxElement
+    ) -> None:
+        super().__init__(destination_full_name=destination_full_name)
+        self.import_element = import_element
 
     def properties(self) -> Dict[str, Any]:
         props = {
@@ -88,21 +124,48 @@ class ResolvedImportRelationship(Relationship):
         return props
 
 
-class ObjectWithContext(BaseModel, ABC):
+class ObjectWithContext(ABC):
     """Base class for all objects.
 
     These will become the graph's nodes.
+    A big code base has hundreds of thousands of objects,
+    so they are slotted and each collection is created only for its own object.
     """
 
-    name: str
-    full_name: str = ""
-    names_in_scope: dict = {}
-    is_test_object: bool = False
-    test_type: str = ""
-    relationships: List[Relationship] = []
-    unresolved_imports: List[ImportSyntaxElement] = []
-    calls: List[CallSyntaxElement] = []
-    contained_objects: List["ObjectWithContext"] = []
+    __slots__ = (
+        "name",
+        "full_name",
+        "names_in_scope",
+        "enclosing_scope",
+        "is_test_object",
+        "test_type",
+        "relationships",
+        "unresolved_imports",
+        "calls",
+        "contained_objects",
+    )
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        full_name: str = "",
+        is_test_object: bool = False,
+        test_type: str = "",
+    ) -> None:
+        self.name = name
+        self.full_name = full_name
+        self.names_in_scope: Dict[str, str] = {}
+        self.enclosing_scope: Optional[ObjectWithContext] = None
+        self.is_test_object = is_test_object
+        self.test_type = test_type
+        self.relationships: List[Relationship] = []
+        self.unresolved_imports: List[ImportSyntaxElement] = []
+        self.calls: List[CallSyntaxElement] = []
+        self.contained_objects: List[ObjectWithContext] = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(full_name={self.full_name!r})"
 
     @abstractmethod
     def label(self) -> str:
@@ -118,18 +181,25 @@ class ObjectWithContext(BaseModel, ABC):
         :return: A dictionary containing the properties for the graph node.
         :rtype: Dict[str, Any]
         """
-        return self.dict(include=self._node_property_keys())
+        properties: Dict[str, Any] = {
+            "name": self.name,
+            "full_name": self.full_name,
+            "is_test_object": self.is_test_object,
+        }
+        if self.is_test_object and active_settings().determine_test_types:
+            properties["test_type"] = self.test_type
+        return properties
 
-    def _node_property_keys(self) -> set:
-        """The property keys that will be used by the node.
+    def with_contained_objects(self) -> List["ObjectWithContext"]:
+        """The object and all the objects it contains recursively.
 
-        :return: A set with the relevant property names.
-        :rtype: set
+        :return: The object followed by the contained objects, breadth-first.
+        :rtype: List[ObjectWithContext]
         """
-        relevant_keys = {"name", "full_name", "is_test_object"}
-        if self.is_test_object and settings.determine_test_types:
-            relevant_keys.add("test_type")
-        return relevant_keys
+        result = [self]
+        for obj in result:
+            result.extend(obj.contained_objects)
+        return result
 
     def _parse_syntax_elements(
         self, syntax_elements: List[SyntaxElement]
@@ -167,6 +237,7 @@ class ObjectWithContext(BaseModel, ABC):
                 )
             if defined_object:
                 self._add_to_content(defined_object)
+                defined_object.enclosing_scope = self
                 result[defined_object.full_name] = defined_object
                 self.names_in_scope[defined_object.name] = defined_object.full_name
 
@@ -208,11 +279,25 @@ class ObjectWithContext(BaseModel, ABC):
         self.is_test_object = owner.is_test_object
         self.test_type = owner.test_type
 
-    def update_names_in_scope_for_content(self) -> None:
-        """Pass the names in scope to all contained objects recursively."""
-        for thing in self.contained_objects:
-            thing.names_in_scope.update(self.names_in_scope)
-            thing.update_names_in_scope_for_content()
+    def lookup_name(self, name: str) -> Optional[str]:
+        """Find the full name a name refers to in the object's scope chain.
+
+        Each object stores only the names it defines.
+        The names of the enclosing objects (up to the module) are looked up
+        through the chain of enclosing scopes.
+        If multiple scopes define the name, the outermost one wins.
+
+        :param name: The name used in the object.
+        :type name: str
+        :return: The full name the name refers to or None if it's unknown.
+        :rtype: Optional[str]
+        """
+        full_name = None
+        scope: Optional[ObjectWithContext] = self
+        while scope is not None:
+            full_name = scope.names_in_scope.get(name, full_name)
+            scope = scope.enclosing_scope
+        return full_name
 
     def resolve_calls(self, imported_names: Dict[str, str]) -> None:
         """Resolve all call definitions recursively.
@@ -221,13 +306,20 @@ class ObjectWithContext(BaseModel, ABC):
         name refers to.
         :type imported_names: Dict[str, str]
         """
+        # (destination, reference name, called attribute) => the aggregated calls
+        aggregated_calls: Optional[Dict[Tuple[str, str, str], CallsRelationship]] = (
+            {} if active_settings().aggregate_calls else None
+        )
         for call in self.calls:
-            self._resolve_call(call, imported_names)
+            self._resolve_call(call, imported_names, aggregated_calls)
         for thing in self.contained_objects:
             thing.resolve_calls(imported_names)
 
     def _resolve_call(
-        self, call: CallSyntaxElement, imported_names: Dict[str, str]
+        self,
+        call: CallSyntaxElement,
+        imported_names: Dict[str, str],
+        aggregated_calls: Optional[Dict[Tuple[str, str, str], CallsRelationship]],
     ) -> None:
         """Resolve a call and determine which object it refers to.
 
@@ -236,25 +328,44 @@ class ObjectWithContext(BaseModel, ABC):
         :param imported_names: A project-level dict showing which object an imported
         name refers to.
         :type imported_names: Dict[str, str]
+        :param aggregated_calls: The object's calls relationships by their
+        destination, reference name and called attribute,
+        None if the calls aren't aggregated.
+        :type aggregated_calls:
+        Optional[Dict[Tuple[str, str, str], CallsRelationship]]
         """
-        if call.what_reference_name not in self.names_in_scope.keys():
+        called_full_name = self.lookup_name(call.what_reference_name)
+        if called_full_name is None:
             return
-        called_full_name = self.names_in_scope[call.what_reference_name]
         if call.called_attribute:
             what_full_name = f"{called_full_name}.{call.called_attribute}"
         else:
             what_full_name = called_full_name
         if what_full_name in imported_names:
             what_full_name = imported_names[what_full_name]
+        if aggregated_calls is not None:
+            key = (
+                what_full_name,
+                call.what_reference_name,
+                call.called_attribute or "",
+            )
+            aggregated_rel = aggregated_calls.get(key)
+            if aggregated_rel:
+                aggregated_rel.count += 1
+                return
         calls_rel = CallsRelationship(
             destination_full_name=what_full_name, syntax_element=call
         )
         self.relationships.append(calls_rel)
+        if aggregated_calls is not None:
+            aggregated_calls[key] = calls_rel
 
 
 class FunctionWithContext(ObjectWithContext):
     """An object representing a function."""
 
+    __slots__ = ()
+
     def label(self) -> str:
         if self.is_test_object:
             if self.name.startswith("test_"):
@@ -268,6 +379,8 @@ class FunctionWithContext(ObjectWithContext):
 class ClassWithContext(ObjectWithContext):
     """An object representing a class."""
 
+    __slots__ = ()
+
     def _update_properties_from_owner(self, owner: "ObjectWithContext"):
         super()._update_properties_from_owner(owner)
         self.names_in_scope = {
@@ -285,6 +398,8 @@ class ClassWithContext(ObjectWithContext):
 class ConstantWithContext(ObjectWithContext):
     """An object representing a constant."""
 
+    __slots__ = ()
+
     def label(self) -> str:
         if self.is_test_object:
             return "test_constant"
@@ -299,8 +414,12 @@ class ModuleWithContext(ObjectWithContext):
     while it's parsing the file system and detecting .py files.
     """
 
-    file_path: str
-    content: str = ""
+    __slots__ = ("file_path", "content")
+
+    def __init__(self, *, file_path: str, content: str = "", **data: Any) -> None:
+        super().__init__(**data)
+        self.file_path = file_path
+        self.content = content
 
     def label(self) -> str:
         if self.name == "__init__":
@@ -322,18 +441,63 @@ class ModuleWithContext(ObjectWithContext):
         :return: A dictionary of objects and their unique full names.
         :rtype: Dict[str, ObjectWithContext]
         """
-        self._read_content()
+        return self.add_syntax_elements(self.extract_syntax_elements())
+
+    def extract_syntax_elements(self) -> List[SyntaxElement]:
+        """Read the module's source and parse it into basic syntax elements.
+
+        This step doesn't change the module,
+        so it can be executed in a worker process as well.
+
+        :raises ModuleWithInvalidContentException: If the module contains invalid
+        syntax.
+        :return: The basic syntax elements of the module.
+        :rtype: List[SyntaxElement]
+        """
+        with self.open_source() as source:
+            return self.parse_source(source)
+
+    def parse_source(self, source: Source) -> List[SyntaxElement]:
+        """Parse the module's source into basic syntax elements.
+
+        :param source: The module's source.
+        :type source: Source
+        :raises ModuleWithInvalidContentException: If the module contains invalid
+        syntax or an invalid encoding.
+        :return: The basic syntax elements of the module.
+        :rtype: List[SyntaxElement]
+        """
         try:
-            syntax_elements = parse_module(self.content, self.full_name)
-            return self._parse_syntax_elements(syntax_elements)
-        except SyntaxError as e:
+            return parse_module(source, self.full_name)
+        except (SyntaxError, ValueError) as e:
             raise ModuleWithInvalidContentException from e
 
-    def _read_content(self):
+    def add_syntax_elements(
+        self, syntax_elements: List[SyntaxElement]
+    ) -> Dict[str, ObjectWithContext]:
+        """Create the objects of the module from its basic syntax elements.
+
+        :param syntax_elements: The basic syntax elements of the module.
+        :type syntax_elements: List[SyntaxElement]
+        :return: A dictionary of objects and their unique full names.
+        :rtype: Dict[str, ObjectWithContext]
+        """
+        return self._parse_syntax_elements(syntax_elements)
+
+    @contextmanager
+    def open_source(self) -> Iterator[Source]:
+        """Provide the module's source: its known content or its file's bytes.
+
+        The file's bytes are released when the context is exited.
+
+        :return: The module's source.
+        :rtype: Iterator[Source]
+        """
         if self.content:
+            yield self.content
             return
-        with open(self.file_path, "r") as f:
-            self.content = f.read()
+        with open_source(self.file_path) as source:
+            yield source
 
 
 class PackageWithContext(ObjectWithContext):
@@ -343,7 +507,7 @@ class PackageWithContext(ObjectWithContext):
     while it's parsing the file system and detecting directories containing .py files.
     """
 
-    dir_path: str
+    __slots__ = ("dir_path",)
 
     def label(self) -> str:
         if self.is_test_object:
@@ -351,26 +515,33 @@ class PackageWithContext(ObjectWithContext):
         else:
             return "package"
 
-    def __init__(self, **data: Any) -> None:
+    def __init__(self, *, dir_path: str, **data: Any) -> None:
         super().__init__(**data)
+        self.dir_path = dir_path
         full_name_parts = determine_full_name_parts(self.full_name)
         self.is_test_object = "test" in full_name_parts or "tests" in full_name_parts
         if (
-            settings.determine_test_types
+            active_settings().determine_test_types
             and self.is_test_object
             and len(full_name_parts) > 1
         ):
             self.test_type = full_name_parts[1]
 
-    def add_module(self, name: str) -> ModuleWithContext:
+    def add_module(
+        self, name: str, dir_path: Optional[str] = None
+    ) -> ModuleWithContext:
         """Create a module contained by this package.
 
         :param name: The name of the module.
         :type name: str
+        :param dir_path: The directory containing the module's file,
+        defaults to the package's directory. It's different
+        if the package is located in multiple project roots.
+        :type dir_path: Optional[str]
         :return: The module created.
         :rtype: ModuleWithContext
         """
-        module_path = os.path.join(self.dir_path, f"{name}.py")
+        module_path = os.path.join(dir_path or self.dir_path, f"{name}.py")
         modu = ModuleWithContext(
             name=name,
             file_path=module_path,
@@ -379,7 +550,22 @@ class PackageWithContext(ObjectWithContext):
         return modu
 
 
-class ParseResult(BaseModel):
+class ExternalModuleWithContext(ObjectWithContext):
+    """An object representing a module outside of the project.
+
+    E.g. a module of the standard library or an installed package.
+    Only its top-level name is known, it has no contained objects.
+    They are created by the PythonProject,
+    while it's resolving the imports, if external imports are resolved.
+    """
+
+    __slots__ = ()
+
+    def label(self) -> str:
+        return "external_module"
+
+
+class ParseResult:
     """The result of parsing a Python project.
 
     This will be used to create the graph model.
@@ -387,4 +573,7 @@ class ParseResult(BaseModel):
     The edges are modelled as relationships list of the source object.
     """
 
-    objects: Dict[str, ObjectWithContext] = {}
+    __slots__ = ("objects",)
+
+    def __init__(self, *, objects: Optional[Dict[str, ObjectWithContext]] = None):
+        self.objects: Dict[str, ObjectWithContext] = objects or {}
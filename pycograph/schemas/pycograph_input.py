@@ -4,21 +4,57 @@ Validation and adjustment of input data should happen here.
 """
 
 import os
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel, DirectoryPath
 
+from pycograph.exceptions import InvalidManifestException
+
 
 class PycographLoadInput(BaseModel):
-    """Input data for the pycograph load command."""
+    """Input data for the pycograph load command.
+
+    A project can have multiple root directories, e.g. the services of a monorepo.
+    `project_dir_path` is the first of them.
+    """
 
     project_dir_path: Optional[DirectoryPath] = None
+    project_dir_paths: List[DirectoryPath] = []
     graph_name: Optional[str] = None
 
     def __init__(self, **data: Any) -> None:
         """Initialize model and adjust values."""
         super().__init__(**data)
-        if not self.project_dir_path:
-            self.project_dir_path = os.getcwd()  # type: ignore
+        if not self.project_dir_paths and self.project_dir_path:
+            self.project_dir_paths = [self.project_dir_path]
+        if not self.project_dir_paths:
+            self.project_dir_paths = [os.getcwd()]  # type: ignore
+        self.project_dir_path = self.project_dir_paths[0]
         if not self.graph_name:
             self.graph_name = os.path.split(self.project_dir_path)[-1]  # type: ignore
+
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """Read the project root directories listed in a manifest file.
+
+    The manifest contains one directory per line.
+    Relative paths are relative to the manifest's directory.
+    Empty lines and lines starting with `#` are skipped.
+
+    :param manifest_path: The path of the manifest file.
+    :type manifest_path: str
+    :raises InvalidManifestException: If the manifest can't be read.
+    :return: The paths of the root directories.
+    :rtype: List[str]
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError) as e:
+        raise InvalidManifestException(f"Can't read the manifest {manifest_path}: {e}")
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [
+        os.path.join(base_dir, line)
+        for line in (line.strip() for line in lines)
+        if line and not line.startswith("#")
+    ]
@@ -0,0 +1,29 @@
+"""Base class for lightweight slotted records."""
+
+from typing import Any, ClassVar, Tuple
+
+
+class Record:
+    """A slotted object without validation, compared by its fields.
+
+    Subclasses define their attributes in `__slots__`
+    and list all of them, including the inherited ones, in `_fields`.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    # The names of all attributes, used for comparison and representation.
+    _fields: ClassVar[Tuple[str, ...]] = ()
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self._fields
+        )
+
+    def __repr__(self) -> str:
+        attributes = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self._fields
+        )
+        return f"{type(self).__name__}({attributes})"
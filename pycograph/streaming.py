@@ -0,0 +1,157 @@
+"""Write a Python project into RedisGraph while it's being parsed.
+
+The nodes of a module are written as soon as the module is parsed.
+The contains edges are final at that point, so they are written as well.
+The imports and calls edges are written after the imports of the whole project
+are resolved, module by module.
+Afterwards, the relationships of the module are released.
+
+The project's objects are kept, because the import resolution needs them.
+The memory used for the graph model is bounded by the writer's buffer.
+"""
+
+from typing import Iterator, List, Protocol
+
+from pycograph.graph_writer import DEFAULT_BUFFER_SIZE, GraphWriter, open_graph
+from pycograph.incremental_update import GraphUpdateResult
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import (
+    ContainsRelationship,
+    ModuleWithContext,
+    ObjectWithContext,
+    PackageWithContext,
+    Relationship,
+)
+
+
+class RowWriter(Protocol):
+    """A writer collecting the nodes and edges of the stream."""
+
+    def add_node(self, obj: ObjectWithContext) -> None:
+        ...  # pragma: no cover
+
+    def add_edge(
+        self,
+        source: ObjectWithContext,
+        relationship: Relationship,
+        destination: ObjectWithContext,
+    ) -> None:
+        ...  # pragma: no cover
+
+
+def stream_project(
+    project: PythonProject, graph_name: str, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> GraphUpdateResult:
+    """Parse a project and write its graph model in a stream.
+
+    :param project: The project to parse.
+    :type project: PythonProject
+    :param graph_name: The name of the graph.
+    :type graph_name: str
+    :param buffer_size: The number of nodes and edges buffered before writing them,
+    defaults to DEFAULT_BUFFER_SIZE
+    :type buffer_size: int
+    :return: The summary of the written graph.
+    :rtype: GraphUpdateResult
+    """
+    writer = GraphWriter(open_graph(graph_name), buffer_size)
+    modules_added = 0
+    for modules_added in stream_rows(project, writer):
+        pass
+    writer.flush()
+
+    return GraphUpdateResult(
+        graph_name=graph_name,
+        modules_added=modules_added,
+        nodes_added=writer.nodes_added,
+        edges_added=writer.edges_added,
+        queries=writer.pipeline.queries,
+        round_trips=writer.pipeline.round_trips,
+    )
+
+
+def stream_rows(project: PythonProject, writer: RowWriter) -> Iterator[int]:
+    """Parse a project and add its nodes and edges to a writer as they become final.
+
+    The generator pauses after each module, so the caller can write the rows
+    collected so far.
+
+    :param project: The project to parse.
+    :type project: PythonProject
+    :param writer: The writer receiving the nodes and edges.
+    :type writer: RowWriter
+    :return: The number of modules parsed so far, after each step.
+    :rtype: Iterator[int]
+    """
+    modules_added = 0
+    for modu in project.iter_parsed_modules():
+        module_objects = _project_objects(project, modu)
+        for obj in module_objects:
+            writer.add_node(obj)
+        for obj in module_objects:
+            for rel in obj.relationships:
+                writer.add_edge(obj, rel, project.objects[rel.destination_full_name])
+        modules_added += 1
+        yield modules_added
+
+    packages = [
+        obj for obj in project.objects.values() if isinstance(obj, PackageWithContext)
+    ]
+    for pkg in packages:
+        writer.add_node(pkg)
+    for pkg in packages:
+        for rel in pkg.relationships:
+            writer.add_edge(pkg, rel, project.objects[rel.destination_full_name])
+    yield modules_added
+
+    external_modules_added = False
+    for modu in project.iter_resolved_modules():
+        # The external modules are known when the first module is resolved.
+        if not external_modules_added:
+            for external_module in project.external_modules:
+                writer.add_node(external_module)
+            external_modules_added = True
+        for obj in _project_objects(project, modu):
+            for rel in obj.relationships:
+                if isinstance(rel, ContainsRelationship):
+                    continue
+                destination = project.objects.get(rel.destination_full_name)
+                if destination:
+                    writer.add_edge(obj, rel, destination)
+        for obj in modu.with_contained_objects():
+            _release_relationships(obj)
+        yield modules_added
+
+
+def _project_objects(
+    project: PythonProject, modu: ModuleWithContext
+) -> List[ObjectWithContext]:
+    """The objects of a module that are in the project's objects.
+
+    A name defined again in the same scope replaces the earlier object
+    in the project's objects, so the earlier one isn't part of the graph model.
+
+    :param project: The project containing the module.
+    :type project: PythonProject
+    :param modu: The module.
+    :type modu: ModuleWithContext
+    :return: The module and its contained objects without the replaced ones.
+    :rtype: List[ObjectWithContext]
+    """
+    return [
+        obj
+        for obj in modu.with_contained_objects()
+        if project.objects.get(obj.full_name) is obj
+    ]
+
+
+def _release_relationships(obj: ObjectWithContext) -> None:
+    """Release the data of an object that isn't needed after writing its edges.
+
+    :param obj: The object whose edges have been written.
+    :type obj: ObjectWithContext
+    """
+    obj.relationships = []
+    obj.calls = []
+    obj.unresolved_imports = []
+    obj.names_in_scope = {}
@@ -0,0 +1,214 @@
+"""The names known in a Python project, used for resolving its imports."""
+
+import logging
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+from pycograph.schemas.basic_syntax_elements import ABSOLUTE, ImportSyntaxElement
+from pycograph.schemas.parse_result import ObjectWithContext
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolTable:
+    """The objects of a project and the names imported by its modules.
+
+    An imported name can refer to another imported name (a re-export).
+    The chains of these aliases are followed once and their results are memoized.
+    A chain that leads back to one of its own names is treated as unresolvable.
+    The package prefixes of the relative imports are computed once per module
+    and interned, because they occur in many names.
+    """
+
+    __slots__ = (
+        "objects",
+        "imported_names",
+        "_alias_targets",
+        "_chain_targets",
+        "_package_prefixes",
+    )
+
+    def __init__(self, objects: Dict[str, ObjectWithContext]) -> None:
+        """Initialize a symbol table for a project's objects.
+
+        :param objects: The project's objects by their full names.
+        The dict is referenced, not copied.
+        :type objects: Dict[str, ObjectWithContext]
+        """
+        self.objects = objects
+        # imported name => the full name it refers to
+        self.imported_names: Dict[str, str] = {}
+        # imported name => the full name of the object it refers to directly
+        self._alias_targets: Dict[str, str] = {}
+        # imported name => the full name of the object at the end of its alias chain
+        self._chain_targets: Dict[str, str] = {}
+        # (module full name, level) => the package a relative import refers to
+        self._package_prefixes: Dict[Tuple[str, int], str] = {}
+
+    def add_imported_name(self, reference_name: str, full_name: str) -> None:
+        """Register a name imported by a module.
+
+        :param reference_name: The name as it's reachable from other modules,
+        e.g. `package.module.imported_function`.
+        :type reference_name: str
+        :param full_name: The full name the imported name refers to.
+        :type full_name: str
+        """
+        previous = self.imported_names.get(reference_name)
+        if previous is not None and previous != full_name:
+            # The memoized chains going through this name might be outdated.
+            self._alias_targets.pop(reference_name, None)
+            self._chain_targets.clear()
+        self.imported_names[reference_name] = full_name
+        if full_name in self.objects:
+            self._alias_targets[reference_name] = full_name
+
+    def remove_imported_name(self, reference_name: str) -> None:
+        """Forget a name imported by a module, e.g. because the module changed.
+
+        :param reference_name: The name as it's reachable from other modules.
+        :type reference_name: str
+        """
+        if self.imported_names.pop(reference_name, None) is not None:
+            self._alias_targets.pop(reference_name, None)
+            # The memoized chains going through this name might be outdated.
+            self._chain_targets.clear()
+
+    def find(self, reference_name: str) -> Optional[ObjectWithContext]:
+        """Find the object belonging to a full name.
+
+        Search at the following places:
+        1. The project's objects.
+        2. The project's imported names, following the chains of aliases.
+
+        :param reference_name: The full name we're searching for.
+        :type reference_name: str
+        :return: The object belonging to this full name.
+        :rtype: Optional[ObjectWithContext]
+        """
+        obj = self.objects.get(reference_name)
+        if obj is not None:
+            return obj
+        target = self._alias_targets.get(reference_name) or self._chain_targets.get(
+            reference_name
+        )
+        if target is None:
+            if reference_name not in self.imported_names:
+                return None
+            target = self._follow_aliases(reference_name)
+            if target is None:
+                return None
+        return self.objects.get(target)
+
+    def resolve_import(
+        self, import_elem: ImportSyntaxElement, module_full_name: str
+    ) -> Optional[ObjectWithContext]:
+        """Resolve which object an import syntax element is referring to.
+
+        :param import_elem: An import syntax element.
+        :type import_elem: ImportSyntaxElement
+        :param module_full_name: The full name of the module where the import is.
+        :type module_full_name: str
+        :return: The object belonging to the first known candidate.
+        :rtype: Optional[ObjectWithContext]
+        """
+        what_full_name = import_elem.what_full_name()
+        if import_elem.reference_type() == ABSOLUTE:
+            obj = self.find(what_full_name)
+            if obj is not None:
+                return obj
+            # check the importer module's directory
+            return self.find(
+                self.relative_full_name(module_full_name, what_full_name, 1)
+            )
+        return self.find(
+            self.relative_full_name(
+                module_full_name,
+                what_full_name,
+                import_elem.level,  # type: ignore
+            )
+        )
+
+    def import_candidates(
+        self, import_elem: ImportSyntaxElement, module_full_name: str
+    ) -> List[str]:
+        """Determine the full names an import syntax element might be referring to.
+
+        These are the names `resolve_import` looks up.
+
+        :param import_elem: An import syntax element.
+        :type import_elem: ImportSyntaxElement
+        :param module_full_name: The full name of the module where the import is.
+        :type module_full_name: str
+        :return: The full names in the order of their precedence.
+        :rtype: List[str]
+        """
+        what_full_name = import_elem.what_full_name()
+        if import_elem.reference_type() == ABSOLUTE:
+            # check the importer module's directory as well
+            return [
+                what_full_name,
+                self.relative_full_name(module_full_name, what_full_name, 1),
+            ]
+        return [
+            self.relative_full_name(
+                module_full_name,
+                what_full_name,
+                import_elem.level,  # type: ignore
+            )
+        ]
+
+    def relative_full_name(
+        self, module_full_name: str, import_full_name: str, level: int
+    ) -> str:
+        """Determine the full name a relative import is referring to.
+
+        :param module_full_name: The module's full name, where the import is located.
+        :type module_full_name: str
+        :param import_full_name: The imported name.
+        :type import_full_name: str
+        :param level: The relative import's level.
+        :type level: int
+        :return: The full name this import is referring to.
+        :rtype: str
+        """
+        key = (module_full_name, level)
+        package_prefix = self._package_prefixes.get(key)
+        if package_prefix is None:
+            package_prefix = sys.intern(
+                ".".join(module_full_name.split(".")[:-(level)])
+            )
+            self._package_prefixes[key] = package_prefix
+        return f"{package_prefix}.{import_full_name}"
+
+    def _follow_aliases(self, reference_name: str) -> Optional[str]:
+        """Follow a chain of imported names until an object is reached.
+
+        :param reference_name: The first name of the chain.
+        :type reference_name: str
+        :return: The full name of the object at the end of the chain,
+        None if the chain ends without an object or contains a cycle.
+        :rtype: Optional[str]
+        """
+        chain: List[str] = []
+        visited: Set[str] = set()
+        current = reference_name
+        while current not in self.objects:
+            memoized = self._alias_targets.get(current) or self._chain_targets.get(
+                current
+            )
+            if memoized is not None:
+                current = memoized
+                break
+            next_name = self.imported_names.get(current)
+            if next_name is None:
+                return None
+            if current in visited:
+                logger.warning(f"Import cycle: {' -> '.join(chain + [current])}")
+                return None
+            visited.add(current)
+            chain.append(current)
+            current = next_name
+        for alias in chain:
+            self._chain_targets[alias] = current
+        return current
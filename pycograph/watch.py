@@ -0,0 +1,162 @@
+"""Keep a graph up to date with a Python project's working tree."""
+
+import os
+import time
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from pycograph.config import Settings, use_settings
+from pycograph.external_modules import ExternalModuleIndex
+from pycograph.file_discovery import FileDiscovery
+from pycograph.graph_writer import open_graph
+from pycograph.incremental_update import (
+    GraphUpdateResult,
+    apply_plan,
+    plan_update,
+    read_units,
+)
+from pycograph.parse_cache import ParseCache
+from pycograph.project import PythonProject, root_dir_paths
+
+# file path => (size, modification time in ns)
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def watch_project(
+    project_dir_path: Union[str, Sequence[str]],
+    graph_name: str,
+    jobs: int = 1,
+    parse_cache: Optional[ParseCache] = None,
+    file_discovery: Optional[FileDiscovery] = None,
+    external_module_index: Optional[ExternalModuleIndex] = None,
+    interval: float = 1.0,
+    debounce: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep,
+    config: Optional[Settings] = None,
+) -> Iterator[Tuple[GraphUpdateResult, float]]:
+    """Update the graph whenever the project's .py files change.
+
+    The first round updates the graph with the whole project.
+    Each further round starts when the files changed
+    and then stayed unchanged for the debounce period,
+    so a burst of changes (e.g. switching branches) triggers only one round.
+
+    The resolved project and the fingerprints stored in the graph are kept in memory,
+    so a round parses only the changed modules, resolves only them and their
+    importers again, and compares and writes only their units.
+
+    :param project_dir_path: The project's root directory or a list of roots.
+    :type project_dir_path: Union[str, Sequence[str]]
+    :param graph_name: The name of the graph.
+    :type graph_name: str
+    :param jobs: The number of worker processes parsing the modules, defaults to 1
+    :type jobs: int
+    :param parse_cache: A cache for the modules' syntax elements, defaults to None
+    :type parse_cache: Optional[ParseCache]
+    :param file_discovery: Finds the project's Python files,
+    defaults to a discovery with the default excludes
+    :type file_discovery: Optional[FileDiscovery]
+    :param external_module_index: If provided, the imports of modules outside of
+    the project are resolved to external module objects, defaults to None
+    :type external_module_index: Optional[ExternalModuleIndex]
+    :param interval: Seconds between two checks for changes, defaults to 1.0
+    :type interval: float
+    :param debounce: Seconds without changes before a round starts, defaults to 0.5
+    :type debounce: float
+    :param sleep: The function used for waiting, defaults to time.sleep
+    :type sleep: Callable[[float], None]
+    :param config: The settings of the rounds, defaults to the settings active
+    in each round. They are active only while a round runs,
+    not while the caller handles its result.
+    :type config: Optional[Settings]
+    :return: The summary and the duration in seconds of each round.
+    :rtype: Iterator[Tuple[GraphUpdateResult, float]]
+    """
+    file_discovery = file_discovery or FileDiscovery()
+    with use_settings(config):
+        project = PythonProject(
+            root_dir_path=project_dir_path,
+            jobs=jobs,
+            parse_cache=parse_cache,
+            keep_parsed_modules=True,
+            file_discovery=file_discovery,
+            external_module_index=external_module_index,
+        )
+        redis_graph = open_graph(graph_name)
+        stored_units = read_units(redis_graph)
+    current_snapshot = snapshot(project_dir_path, file_discovery)
+    while True:
+        start = time.perf_counter()
+        with use_settings(config):
+            parse_result = project.reparse()
+            plan = plan_update(parse_result, stored_units, project.updated_units)
+            apply_plan(redis_graph, plan)
+        plan.update_stored_units(stored_units)
+        yield plan.result(graph_name), time.perf_counter() - start
+        current_snapshot = wait_for_changes(
+            project_dir_path,
+            file_discovery,
+            current_snapshot,
+            interval,
+            debounce,
+            sleep,
+        )
+
+
+def wait_for_changes(
+    project_dir_path: Union[str, Sequence[str]],
+    file_discovery: FileDiscovery,
+    previous_snapshot: Snapshot,
+    interval: float,
+    debounce: float,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Snapshot:
+    """Wait until the .py files change and then stay unchanged for a while.
+
+    :param project_dir_path: The project's root directory or a list of roots.
+    :type project_dir_path: Union[str, Sequence[str]]
+    :param file_discovery: Finds the project's Python files.
+    :type file_discovery: FileDiscovery
+    :param previous_snapshot: The state of the files after the previous round.
+    :type previous_snapshot: Snapshot
+    :param interval: Seconds between two checks for changes.
+    :type interval: float
+    :param debounce: Seconds without changes before returning.
+    :type debounce: float
+    :param sleep: The function used for waiting, defaults to time.sleep
+    :type sleep: Callable[[float], None]
+    :return: The state of the files after the changes.
+    :rtype: Snapshot
+    """
+    current_snapshot = previous_snapshot
+    while current_snapshot == previous_snapshot:
+        sleep(interval)
+        current_snapshot = snapshot(project_dir_path, file_discovery)
+    while True:
+        sleep(debounce)
+        latest_snapshot = snapshot(project_dir_path, file_discovery)
+        if latest_snapshot == current_snapshot:
+            return latest_snapshot
+        current_snapshot = latest_snapshot
+
+
+def snapshot(
+    project_dir_path: Union[str, Sequence[str]], file_discovery: FileDiscovery
+) -> Snapshot:
+    """Determine the size and modification time of the project's .py files.
+
+    :param project_dir_path: The project's root directory or a list of roots.
+    :type project_dir_path: Union[str, Sequence[str]]
+    :param file_discovery: Finds the project's Python files.
+    :type file_discovery: FileDiscovery
+    :return: The size and modification time in ns by file path.
+    :rtype: Snapshot
+    """
+    result = {}
+    for root_dir_path in root_dir_paths(project_dir_path):
+        for file_path in file_discovery.python_files(root_dir_path):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            result[file_path] = (stat.st_size, stat.st_mtime_ns)
+    return result
@@ -3,6 +3,8 @@ from pathlib import Path
 
 import pytest
 
+from pycograph.config import settings
+
 
 @pytest.fixture
 def test_data_dir():
@@ -14,3 +16,22 @@ def test_data_dir():
 @pytest.fixture
 def no_graph_commit(mocker):
     mocker.patch("redisgraph.graph.Graph.commit")
+    # The indexes are created with queries before the commit.
+    mocker.patch("redisgraph.graph.Graph.query")
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    """Restore the global settings changed by a test."""
+    original_settings = settings.copy()
+    yield
+    for field_name in settings.__fields__:
+        setattr(settings, field_name, getattr(original_settings, field_name))
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path, monkeypatch):
+    """Keep the user's cache directory out of the tests."""
+    cache_home = tmp_path / "user-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
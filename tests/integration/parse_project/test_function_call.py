@@ -1,5 +1,6 @@
 import pytest
 
+from pycograph.config import settings
 from pycograph.schemas.basic_syntax_elements import CallSyntaxElement
 from pycograph.schemas.parse_result import (
     CallsRelationship,
@@ -151,3 +152,61 @@ def test_calling_method_in_class(project_with_1_module):
         syntax_element=CallSyntaxElement(what_reference_name="self"),
     )
     assert other_element.relationships == [calls_do_stuff_rel, calls_example_rel]
+
+
+REPEATED_CALLS = """
+def helper():
+    pass
+
+def other():
+    helper()
+    helper()
+    sample_func = helper
+    helper.attribute()
+"""
+
+
+@pytest.mark.parametrize(
+    ("content", "module_name", "package_name"),
+    [(REPEATED_CALLS, "example", "project")],
+)
+def test_repeated_calls_are_aggregated(project_with_1_module):
+    project = project_with_1_module
+
+    project.parse()
+
+    other_element = project.objects["project.example.other"]
+    assert other_element.relationships == [
+        CallsRelationship(
+            destination_full_name="project.example.helper",
+            syntax_element=CallSyntaxElement(what_reference_name="helper"),
+            count=4,
+        ),
+        CallsRelationship(
+            destination_full_name="project.example.helper.attribute",
+            syntax_element=CallSyntaxElement(
+                what_reference_name="helper", called_attribute="attribute"
+            ),
+        ),
+    ]
+    assert other_element.relationships[0].properties()["count"] == 4
+
+
+@pytest.mark.parametrize(
+    ("content", "module_name", "package_name"),
+    [(REPEATED_CALLS, "example", "project")],
+)
+def test_repeated_calls_without_aggregation(project_with_1_module, mocker):
+    mocker.patch.object(settings, "aggregate_calls", False)
+    project = project_with_1_module
+
+    project.parse()
+
+    other_element = project.objects["project.example.other"]
+    calls_helper_rel = CallsRelationship(
+        destination_full_name="project.example.helper",
+        syntax_element=CallSyntaxElement(what_reference_name="helper"),
+    )
+    assert other_element.relationships.count(calls_helper_rel) == 4
+    assert len(other_element.relationships) == 5
+    assert "count" not in calls_helper_rel.properties()
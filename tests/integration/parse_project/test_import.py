@@ -1,6 +1,8 @@
+from pycograph.external_modules import ExternalModuleIndex
 from pycograph.project import PythonProject
 from pycograph.schemas.basic_syntax_elements import ABSOLUTE, ImportSyntaxElement
 from pycograph.schemas.parse_result import (
+    IMPORTS,
     PackageWithContext,
     ResolvedImportRelationship,
 )
@@ -51,3 +53,38 @@ def do_stuff(nr):
     }
     assert importer_module_object.relationships == [imports_do_stuff_rel]
     assert importer_module_object.names_in_scope["package"] == "package"
+
+
+def test_external_imports():
+    content = """
+import os
+import os.path
+from requests.adapters import HTTPAdapter
+from . import sibling
+import package.missing
+import missing
+"""
+    importer_module = create_module_with_content(content, "importer", "package")
+    project = PythonProject(
+        root_dir_path="dummy",
+        external_module_index=ExternalModuleIndex(["os", "requests", "package"]),
+    )
+    project._add_object(
+        PackageWithContext(name="package", full_name="package", dir_path="package")
+    )
+    project._add_module(importer_module)
+
+    project.parse()
+
+    assert [obj.full_name for obj in project.external_modules] == ["os", "requests"]
+    assert project.objects["os"].label() == "external_module"
+    assert [
+        rel.destination_full_name
+        for rel in importer_module.relationships
+        if rel.name == IMPORTS
+    ] == ["os", "os", "requests"]
+    assert [imp.name for imp in importer_module.unresolved_imports] == [
+        "sibling",
+        "package.missing",
+        "missing",
+    ]
@@ -119,3 +119,48 @@ def other():
         syntax_element=CallSyntaxElement(what_reference_name="do_stuff"),
     )
     assert other_function_object.relationships == [calls_do_stuff_rel]
+
+
+def test_import_deep_re_export_chain_and_call():
+    chain_modules = [
+        create_module_with_content(
+            "def do_stuff(nr):\n    return nr\n", "reexport0", "package"
+        )
+    ]
+    for index in range(1, 6):
+        chain_modules.append(
+            create_module_with_content(
+                f"from package.reexport{index - 1} import do_stuff\n",
+                f"reexport{index}",
+                "package",
+            )
+        )
+    importer_content = """
+from package.reexport5 import do_stuff
+from package.missing import nothing
+
+def other():
+    do_stuff()
+"""
+    importer_module = create_module_with_content(
+        importer_content,
+        "importer",
+        "package",
+    )
+
+    project = PythonProject(root_dir_path="dummy")
+    # The importers come before the imported modules,
+    # so each import can be resolved only after the previous one in the chain.
+    project._add_module(importer_module)
+    for modu in reversed(chain_modules):
+        project._add_module(modu)
+
+    project.parse()
+
+    other_function_object = project.objects["package.importer.other"]
+    calls_do_stuff_rel = CallsRelationship(
+        destination_full_name="package.reexport0.do_stuff",
+        syntax_element=CallSyntaxElement(what_reference_name="do_stuff"),
+    )
+    assert other_function_object.relationships == [calls_do_stuff_rel]
+    assert [imp.name for imp in importer_module.unresolved_imports] == ["nothing"]
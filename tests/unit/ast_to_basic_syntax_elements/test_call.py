@@ -1,6 +1,7 @@
 from pycograph.ast_to_basic_syntax_elements import parse_module
 from pycograph.schemas.basic_syntax_elements import (
     CallSyntaxElement,
+    ClassDefSyntaxElement,
     FunctionDefSyntaxElement,
 )
 
@@ -74,3 +75,43 @@ def dummy_func():
     # We only create a call for obj, but nothing for dummy!!
     call_obj = CallSyntaxElement(what_reference_name="obj")
     assert function_def.syntax_elements == [call_obj]
+
+
+def test_call_with_attribute_chain():
+    function_call_code = """
+def dummy_func():
+    a.b.c.d()
+"""
+
+    result = parse_module(function_call_code, "module_name")
+
+    function_def = result[0]
+    assert function_def.syntax_elements == [
+        CallSyntaxElement(what_reference_name="a", called_attribute="b.c.d"),
+        CallSyntaxElement(what_reference_name="a", called_attribute="b.c"),
+        CallSyntaxElement(what_reference_name="a", called_attribute="b"),
+        CallSyntaxElement(what_reference_name="a"),
+    ]
+
+
+def test_call_in_a_class_in_a_function():
+    function_call_code = """
+def outer():
+    class Inner:
+        def method(self):
+            helper()
+    return Inner
+"""
+
+    result = parse_module(function_call_code, "module_name")
+
+    function_def = result[0]
+    class_def = function_def.syntax_elements[0]
+    assert type(class_def) == ClassDefSyntaxElement
+    helper_call = CallSyntaxElement(what_reference_name="helper")
+    assert class_def.syntax_elements[0].syntax_elements == [helper_call]
+    # The calls in the inner class are part of the outer function as well.
+    assert function_def.syntax_elements[1:] == [
+        CallSyntaxElement(what_reference_name="Inner"),
+        helper_call,
+    ]
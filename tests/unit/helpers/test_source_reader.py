@@ -0,0 +1,23 @@
+import mmap
+
+import pytest
+
+from pycograph.helpers.source_reader import open_source
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1024 * 1024])
+def test_open_source(tmp_path, mmap_threshold):
+    file_path = tmp_path / "example.py"
+    file_path.write_bytes(b"ANSWER = 42\n")
+
+    with open_source(str(file_path), mmap_threshold) as source:
+        assert source[:] == b"ANSWER = 42\n"
+        assert isinstance(source, mmap.mmap) == (mmap_threshold == 0)
+
+
+def test_open_empty_source(tmp_path):
+    file_path = tmp_path / "example.py"
+    file_path.write_bytes(b"")
+
+    with open_source(str(file_path), 0) as source:
+        assert source == b""
@@ -5,6 +5,7 @@ from redisgraph.graph import Graph
 from pycograph.exceptions import (
     RedisConnectionException,
     RedisResponseException,
+    RedisTimeoutException,
     RedisWithoutGraphException,
 )
 from pycograph.parse_result_to_redisgraph import _commit_graph
@@ -18,6 +19,14 @@ def test_connection_error(mocker):
         _commit_graph(graph)
 
 
+def test_timeout(mocker):
+    graph = Graph("test_graph", None)
+    mocker.patch.object(graph, "commit", side_effect=redis.exceptions.TimeoutError)
+
+    with pytest.raises(RedisTimeoutException):
+        _commit_graph(graph)
+
+
 def test_no_graph_supported(mocker):
     graph = Graph("test_graph", None)
     mocker.patch.object(
@@ -0,0 +1,77 @@
+import pytest
+import redis.exceptions
+from redisgraph.graph import Graph
+
+from pycograph.exceptions import RedisResponseException
+from pycograph.parse_result_to_redisgraph import create_indexes, populate_graph
+from pycograph.schemas.parse_result import ModuleWithContext, ParseResult
+
+
+def test_create_indexes(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    query_mock.return_value.result_set = [
+        ["exact-match", "module", ["full_name", "name"]],
+        ["exact-match", "class", ["full_name"]],
+        ["full-text", "class", ["name"]],
+    ]
+
+    created = create_indexes(graph, ["class", "module", "class"])
+
+    assert created == [("class", "name")]
+    assert [call.args[0] for call in query_mock.call_args_list] == [
+        "CALL db.indexes() YIELD type, label, properties",
+        "CREATE INDEX ON :class(name)",
+    ]
+
+
+def test_create_indexes_without_labels(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+
+    assert create_indexes(graph, []) == []
+    query_mock.assert_not_called()
+
+
+def test_index_created_concurrently(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    query_mock.return_value.result_set = []
+    query_mock.side_effect = [
+        query_mock.return_value,
+        redis.exceptions.ResponseError("Attribute 'full_name' is already indexed"),
+        None,
+    ]
+
+    created = create_indexes(graph, ["module"])
+
+    assert created == [("module", "full_name"), ("module", "name")]
+
+
+def test_index_error(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    query_mock.side_effect = [
+        query_mock.return_value,
+        redis.exceptions.ResponseError("Invalid graph operation"),
+    ]
+
+    with pytest.raises(RedisResponseException):
+        create_indexes(graph, ["module"])
+
+
+def test_populate_graph_creates_indexes_before_commit(mocker):
+    manager = mocker.MagicMock()
+    mocker.patch.object(Graph, "query", manager.query)
+    mocker.patch.object(Graph, "commit", manager.commit)
+    manager.query.return_value.result_set = []
+    modu = ModuleWithContext(name="example", full_name="example", file_path="")
+
+    populate_graph("test_graph", ParseResult(objects={"example": modu}))
+
+    assert [name for name, _, _ in manager.mock_calls] == [
+        "query",
+        "query",
+        "query",
+        "commit",
+    ]
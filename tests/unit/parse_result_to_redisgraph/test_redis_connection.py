@@ -0,0 +1,40 @@
+import redis
+
+from pycograph.config import Settings, settings, use_settings
+from pycograph.parse_result_to_redisgraph import redis_connection
+
+
+def test_connections_share_a_pool():
+    first_connection = redis_connection()
+    second_connection = redis_connection()
+
+    assert first_connection.connection_pool is second_connection.connection_pool
+
+
+def test_connection_settings():
+    settings.redis_host = "redis.example.com"
+    settings.redis_socket_timeout = 2.5
+    settings.redis_connect_timeout = 0.5
+
+    connection_kwargs = redis_connection().connection_pool.connection_kwargs
+
+    assert connection_kwargs["host"] == "redis.example.com"
+    assert connection_kwargs["socket_timeout"] == 2.5
+    assert connection_kwargs["socket_connect_timeout"] == 0.5
+
+
+def test_unix_domain_socket():
+    config = Settings(
+        redis_socket="/tmp/redis.sock",
+        redis_socket_timeout=2.5,
+        redis_connect_timeout=0.5,
+    )
+    with use_settings(config):
+        pool = redis_connection().connection_pool
+
+    assert pool.connection_class is redis.UnixDomainSocketConnection
+    assert pool.connection_kwargs["path"] == "/tmp/redis.sock"
+    assert pool.connection_kwargs["socket_timeout"] == 2.5
+    # The unix domain socket connections don't accept a connect timeout.
+    pool.make_connection()
+    assert redis_connection().connection_pool is not pool
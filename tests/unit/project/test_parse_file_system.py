@@ -22,3 +22,41 @@ def test_no_python_file_in_project_dir():
         project = PythonProject(tmpdirname)
         with pytest.raises(NoPythonFileFoundException):
             project._parse_file_system()
+
+
+def test_multiple_roots(tmp_path):
+    write(tmp_path, "service_a/shared/util.py", "def helper():\n    pass\n")
+    write(tmp_path, "service_a/tests/test_util.py", "")
+    write(
+        tmp_path,
+        "service_b/app/main.py",
+        "from shared.util import helper\n\ndef run():\n    helper()\n",
+    )
+    write(tmp_path, "service_b/tests/test_main.py", "")
+    write(tmp_path, "service_b/tests/test_util.py", "")
+    project = PythonProject([str(tmp_path / "service_a"), str(tmp_path / "service_b")])
+
+    result = project.parse()
+
+    tests_package = result.objects["tests"]
+    assert tests_package.dir_path == str(tmp_path / "service_a" / "tests")
+    assert [modu.full_name for modu in tests_package.contained_objects] == [
+        "tests.test_util",
+        "tests.test_main",
+    ]
+    assert result.objects["tests.test_main"].file_path == str(
+        tmp_path / "service_b" / "tests" / "test_main.py"
+    )
+    # The module of the first root wins.
+    assert result.objects["tests.test_util"].file_path == str(
+        tmp_path / "service_a" / "tests" / "test_util.py"
+    )
+    calls = result.objects["app.main.run"].relationships
+    assert [rel.destination_full_name for rel in calls] == ["shared.util.helper"]
+
+
+def write(root_dir, file_path: str, content: str) -> None:
+    full_path = os.path.join(root_dir, file_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
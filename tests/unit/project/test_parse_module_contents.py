@@ -1,4 +1,8 @@
+import os
+
+from pycograph.parse_cache import ParseCache
 from pycograph.project import PythonProject
+from pycograph.schemas import parse_result
 from pycograph.schemas.parse_result import ConstantWithContext, ModuleWithContext
 
 
@@ -23,3 +27,119 @@ def test_valid_and_invalid_module(mocker):
     error_logger.assert_called_once_with(
         "Skipped module other because of syntax error."
     )
+
+
+def test_valid_and_invalid_module_in_parallel(mocker):
+    error_logger = mocker.patch("pycograph.project.logger.error")
+    valid_modu = ModuleWithContext(
+        name="example", full_name="example", file_path="", content="ANSWER=42"
+    )
+    invalid_modu = ModuleWithContext(
+        name="other", full_name="other", file_path="", content="{{template"
+    )
+    project = PythonProject("", jobs=2)
+    project._add_module(valid_modu)
+    project._add_module(invalid_modu)
+
+    project._parse_module_contents()
+
+    assert len(project.objects) == 3
+    assert type(project.objects.get("example.ANSWER")) == ConstantWithContext
+    error_logger.assert_called_once_with(
+        "Skipped module other because of syntax error."
+    )
+
+
+def test_parallel_parse_result_same_as_serial(test_data_dir):
+    duplo_project_path = os.path.join(test_data_dir, "duplo-project")
+
+    serial_result = PythonProject(duplo_project_path).parse()
+    parallel_result = PythonProject(duplo_project_path, jobs=2).parse()
+
+    assert list(parallel_result.objects) == list(serial_result.objects)
+    for full_name, obj in serial_result.objects.items():
+        parallel_obj = parallel_result.objects[full_name]
+        assert parallel_obj.label() == obj.label()
+        assert parallel_obj.node_properties() == obj.node_properties()
+        assert parallel_obj.relationships == obj.relationships
+
+
+def test_unchanged_modules_are_loaded_from_the_parse_cache(tmp_path, mocker):
+    package_dir = os.path.join(tmp_path, "pak")
+    os.makedirs(package_dir)
+    for file_name in ["example.py", "vendored_copy.py"]:
+        with open(os.path.join(package_dir, file_name), "w") as f:
+            f.write("ANSWER = 42")
+    cache_dir = os.path.join(tmp_path, ".pycograph-cache")
+    parse_module_spy = mocker.spy(parse_result, "parse_module")
+
+    first_result = PythonProject(
+        str(tmp_path), parse_cache=ParseCache(cache_dir)
+    ).parse()
+    # The byte-identical copy has been parsed only once.
+    assert parse_module_spy.call_count == 1
+
+    second_result = PythonProject(
+        str(tmp_path), parse_cache=ParseCache(cache_dir)
+    ).parse()
+
+    assert parse_module_spy.call_count == 1
+    assert list(second_result.objects) == list(first_result.objects)
+    assert "pak.vendored_copy.ANSWER" in second_result.objects
+
+
+def test_reparse_reads_only_the_changed_modules(tmp_path, mocker):
+    package_dir = os.path.join(tmp_path, "pak")
+    os.makedirs(package_dir)
+    for file_name in ["example.py", "other.py"]:
+        with open(os.path.join(package_dir, file_name), "w") as f:
+            f.write("ANSWER = 42")
+    parse_module_spy = mocker.spy(parse_result, "parse_module")
+    project = PythonProject(str(tmp_path), keep_parsed_modules=True)
+    project.parse()
+    assert parse_module_spy.call_count == 2
+
+    with open(os.path.join(package_dir, "other.py"), "w") as f:
+        f.write("QUESTION = 'unknown'")
+    os.remove(os.path.join(package_dir, "example.py"))
+    result = project.reparse()
+
+    assert parse_module_spy.call_count == 3
+    assert list(result.objects) == ["pak", "pak.other", "pak.other.QUESTION"]
+    assert list(project.parsed_modules) == [os.path.join(package_dir, "other.py")]
+
+
+def test_reparse_resolves_only_the_changed_modules_and_their_importers(
+    tmp_path, mocker
+):
+    package_dir = os.path.join(tmp_path, "pak")
+    os.makedirs(package_dir)
+    contents = {
+        "__init__.py": "from .core import helper\n",
+        "core.py": "def helper():\n    pass\n",
+        "user.py": "from pak import helper\n\n\ndef run():\n    helper()\n",
+        "other.py": "ANSWER = 42\n",
+    }
+    for file_name, content in contents.items():
+        with open(os.path.join(package_dir, file_name), "w") as f:
+            f.write(content)
+    project = PythonProject(str(tmp_path), keep_parsed_modules=True)
+    project.parse()
+    add_syntax_elements_spy = mocker.spy(ModuleWithContext, "add_syntax_elements")
+
+    with open(os.path.join(package_dir, "core.py"), "w") as f:
+        f.write("def helper():\n    pass\n\n\ndef other():\n    pass\n")
+    result = project.reparse()
+
+    # The user module imports core's function through the package.
+    rebuilt_modules = {
+        call.args[0].full_name for call in add_syntax_elements_spy.call_args_list
+    }
+    assert rebuilt_modules == {"pak.__init__", "pak.core", "pak.user"}
+    assert project.updated_units == {"pak", "pak.__init__", "pak.core", "pak.user"}
+    fresh_result = PythonProject(str(tmp_path)).parse()
+    assert set(result.objects) == set(fresh_result.objects)
+    assert [
+        rel.destination_full_name
+        for rel in result.objects["pak.user.run"].relationships
+    ] == ["pak.core.helper"]
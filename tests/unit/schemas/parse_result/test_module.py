@@ -9,3 +9,23 @@ def test_module_with_syntax_error():
 
     with pytest.raises(ModuleWithInvalidContentException):
         modu.parse()
+
+
+def test_module_with_encoding_declaration(tmp_path):
+    file_path = tmp_path / "example.py"
+    file_path.write_bytes(b"# -*- coding: latin-1 -*-\nCAF\xc9 = 1\n")
+    modu = ModuleWithContext(name="example", file_path=str(file_path))
+
+    modu.parse()
+
+    assert [obj.name for obj in modu.contained_objects] == ["CAF\xc9"]
+    assert modu.content == ""
+
+
+def test_module_with_invalid_encoding(tmp_path):
+    file_path = tmp_path / "example.py"
+    file_path.write_bytes(b"ANSWER = '\xff'\n")
+    modu = ModuleWithContext(name="example", file_path=str(file_path))
+
+    with pytest.raises(ModuleWithInvalidContentException):
+        modu.parse()
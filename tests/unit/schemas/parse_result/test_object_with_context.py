@@ -0,0 +1,81 @@
+from pycograph.schemas.basic_syntax_elements import (
+    CallSyntaxElement,
+    ClassDefSyntaxElement,
+    FunctionDefSyntaxElement,
+)
+from pycograph.schemas.parse_result import (
+    CALLS,
+    CallsRelationship,
+    ContainsRelationship,
+    FunctionWithContext,
+    ModuleWithContext,
+)
+
+
+def test_objects_dont_share_their_collections():
+    first = FunctionWithContext(name="first")
+    second = FunctionWithContext(name="second")
+
+    first.names_in_scope["dumbo"] = "pak.dumbo"
+    first.calls.append(CallSyntaxElement(what_reference_name="dumbo"))
+    first.relationships.append(ContainsRelationship(destination_full_name="x"))
+
+    assert second.names_in_scope == {}
+    assert second.calls == []
+    assert second.relationships == []
+
+
+def test_module_node_properties():
+    modu = ModuleWithContext(name="example", full_name="pak.example", file_path="")
+
+    assert modu.label() == "module"
+    assert modu.node_properties() == {
+        "name": "example",
+        "full_name": "pak.example",
+        "is_test_object": False,
+    }
+
+
+def test_calls_relationship():
+    calls_rel = CallsRelationship(
+        destination_full_name="pak.dumbo",
+        syntax_element=CallSyntaxElement(
+            what_reference_name="obj", called_attribute="dumbo"
+        ),
+    )
+
+    assert calls_rel.name == CALLS
+    assert calls_rel.properties() == {
+        "reference_name": "obj",
+        "called_attribute": "dumbo",
+        "count": 1,
+    }
+    assert calls_rel != ContainsRelationship(destination_full_name="pak.dumbo")
+
+
+def test_lookup_name_in_enclosing_scopes():
+    modu = ModuleWithContext(name="example", full_name="pak.example", file_path="")
+    modu.add_syntax_elements(
+        [
+            FunctionDefSyntaxElement(name="helper"),
+            ClassDefSyntaxElement(
+                name="Dummy",
+                syntax_elements=[
+                    FunctionDefSyntaxElement(
+                        name="method",
+                        syntax_elements=[FunctionDefSyntaxElement(name="helper")],
+                    )
+                ],
+            ),
+        ]
+    )
+    modu.names_in_scope["os"] = "os"
+    method = modu.contained_objects[1].contained_objects[0]
+
+    assert method.lookup_name("os") == "os"
+    assert method.lookup_name("self") == "pak.example.Dummy"
+    assert method.lookup_name("method") == "pak.example.Dummy.method"
+    # The outermost scope wins.
+    assert method.lookup_name("helper") == "pak.example.helper"
+    assert method.lookup_name("unknown") is None
+    assert method.names_in_scope == {"helper": "pak.example.Dummy.method.helper"}
@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+from pycograph.schemas.basic_syntax_elements import (
+    ABSOLUTE,
+    RELATIVE,
+    CallSyntaxElement,
+    FunctionDefSyntaxElement,
+    ImportFromSyntaxElement,
+    ImportSyntaxElement,
+)
+
+
+def test_syntax_elements_have_no_instance_dict():
+    call = CallSyntaxElement(what_reference_name="dumbo")
+
+    with pytest.raises(AttributeError):
+        call.__dict__
+
+
+def test_equality():
+    assert CallSyntaxElement(what_reference_name="obj", called_attribute="x") == (
+        CallSyntaxElement(what_reference_name="obj", called_attribute="x")
+    )
+    assert CallSyntaxElement(what_reference_name="obj") != CallSyntaxElement(
+        what_reference_name="other"
+    )
+    assert ImportSyntaxElement(name="os") != ImportFromSyntaxElement(name="os")
+
+
+def test_block_elements_dont_share_their_content():
+    first = FunctionDefSyntaxElement(name="first")
+    second = FunctionDefSyntaxElement(name="second")
+
+    first.add_syntax_elements([CallSyntaxElement(what_reference_name="dumbo")])
+
+    assert second.syntax_elements == []
+
+
+def test_import_from():
+    import_from = ImportFromSyntaxElement(
+        name="do_stuff", as_name="ds", from_text="logic", level=1
+    )
+
+    assert import_from.name_in_importer() == "ds"
+    assert import_from.what_full_name() == "logic.do_stuff"
+    assert import_from.reference_type() == RELATIVE
+    assert ImportSyntaxElement(name="os").reference_type() == ABSOLUTE
+
+
+def test_pickle():
+    function_def = FunctionDefSyntaxElement(
+        name="answer",
+        syntax_elements=[
+            CallSyntaxElement(what_reference_name="dumbo"),
+            ImportFromSyntaxElement(name="os", level=0),
+        ],
+    )
+
+    assert pickle.loads(pickle.dumps(function_def)) == function_def
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from pycograph.exceptions import InvalidManifestException
+from pycograph.schemas.pycograph_input import PycographLoadInput, read_manifest
+
+
+def test_load_input_with_multiple_roots(tmp_path):
+    first_root = tmp_path / "service_a"
+    second_root = tmp_path / "service_b"
+    first_root.mkdir()
+    second_root.mkdir()
+
+    load_input = PycographLoadInput(project_dir_paths=[first_root, second_root])
+
+    assert load_input.project_dir_path == first_root
+    assert load_input.project_dir_paths == [first_root, second_root]
+    assert load_input.graph_name == "service_a"
+
+
+def test_load_input_with_one_root(tmp_path):
+    load_input = PycographLoadInput(project_dir_path=tmp_path)
+
+    assert load_input.project_dir_paths == [tmp_path]
+    assert load_input == PycographLoadInput(project_dir_paths=[tmp_path])
+
+
+def test_read_manifest(tmp_path):
+    manifest_path = tmp_path / "roots.txt"
+    manifest_path.write_text("# services\nservice_a\n\n  /opt/service_b  \n")
+
+    result = read_manifest(str(manifest_path))
+
+    assert result == [os.path.join(tmp_path, "service_a"), "/opt/service_b"]
+
+
+def test_read_missing_manifest(tmp_path):
+    with pytest.raises(InvalidManifestException):
+        read_manifest(str(tmp_path / "roots.txt"))
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import redis.exceptions
+
+from pycograph.async_loader import AsyncGraphWriter, load_project_async
+from pycograph.config import settings
+from pycograph.exceptions import RedisResponseException
+from pycograph.project import PythonProject
+
+
+@pytest.mark.parametrize("buffer_size,max_in_flight", [(1, 1), (7, 3), (10000, 4)])
+def test_aload_writes_the_same_graph_as_parse(
+    test_data_dir, mocker, buffer_size, max_in_flight
+):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    project_dir = os.path.join(test_data_dir, "duplo-project")
+
+    result = asyncio.run(
+        load_project_async(
+            PythonProject(project_dir), "test_graph", buffer_size, max_in_flight
+        )
+    )
+
+    written_nodes = set()
+    written_edges = set()
+    for call in query_mock.call_args_list:
+        query = call.args[0]
+        for row in call.args[1]["rows"] if len(call.args) > 1 else []:
+            if " CREATE (:" in query:
+                label = query.split("CREATE (:")[1].split(" ")[0]
+                written_nodes.add((label, row[1]))
+            else:
+                rel_name = query.split("-[:")[1].split("]")[0].split(" ")[0]
+                written_edges.add((row[0], rel_name, row[1]))
+    objects = PythonProject(project_dir).parse().objects
+    expected_nodes = {(obj.label(), obj.full_name) for obj in objects.values()}
+    expected_edges = {
+        (obj.full_name, rel.name, rel.destination_full_name)
+        for obj in objects.values()
+        for rel in obj.relationships
+        if rel.destination_full_name in objects
+    }
+    assert written_nodes == expected_nodes
+    assert written_edges == expected_edges
+    assert result.nodes_added == len(expected_nodes)
+    assert result.edges_added == len(expected_edges)
+    assert result.modules_added > 0
+
+
+def test_batches_in_flight_are_bounded(test_data_dir, mocker):
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    no_indexes = mocker.MagicMock(result_set=[])
+
+    def slow_query(query, params=None):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return no_indexes
+
+    mocker.patch("redisgraph.graph.Graph.query", side_effect=slow_query)
+    project_dir = os.path.join(test_data_dir, "duplo-project")
+
+    asyncio.run(
+        load_project_async(
+            PythonProject(project_dir), "test_graph", buffer_size=5, max_in_flight=2
+        )
+    )
+
+    assert peak[0] == 2
+
+
+def test_edges_are_sent_after_their_nodes_are_written(test_data_dir, mocker):
+    events = []
+
+    no_indexes = mocker.MagicMock(result_set=[])
+
+    def slow_query(query, params=None):
+        kind = "edges" if "MATCH" in query else "nodes"
+        events.append(("start", kind))
+        time.sleep(0.005)
+        events.append(("end", kind))
+        return no_indexes
+
+    mocker.patch("redisgraph.graph.Graph.query", side_effect=slow_query)
+    project_dir = os.path.join(test_data_dir, "duplo-project")
+
+    asyncio.run(load_project_async(PythonProject(project_dir), "test_graph", 10000))
+
+    first_edge = events.index(("start", "edges"))
+    last_node = len(events) - 1 - events[::-1].index(("end", "nodes"))
+    assert last_node < first_edge
+
+
+def test_edges_wait_for_the_nodes_of_earlier_buffers(mocker):
+    events = []
+
+    def slow_query(query, params=None):
+        if params is None:
+            # The indexes are created without delay.
+            return mocker.MagicMock(result_set=[])
+        kind = "edges" if "MATCH" in query else "nodes"
+        events.append(("start", kind))
+        if kind == "nodes":
+            time.sleep(0.05)
+        events.append(("end", kind))
+        return mocker.MagicMock(result_set=[])
+
+    redis_graph = mocker.Mock()
+    redis_graph.query.side_effect = slow_query
+    nodes_only = (defaultdict(list), defaultdict(list))
+    nodes_only[0][("function", ("name", "full_name"))].append(["f", "m.f"])
+    edges_only = (defaultdict(list), defaultdict(list))
+    edges_only[1][("module", "contains", "function", ())].append(["m", "m.f"])
+
+    async def write_buffers():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            writer = AsyncGraphWriter(redis_graph, executor, max_in_flight=2)
+            await writer.write(nodes_only)
+            await writer.write(edges_only)
+            await writer.close()
+
+    asyncio.run(write_buffers())
+
+    assert events == [
+        ("start", "nodes"),
+        ("end", "nodes"),
+        ("start", "edges"),
+        ("end", "edges"),
+    ]
+
+
+def test_write_error_stops_the_load(test_data_dir, mocker):
+    no_indexes = mocker.MagicMock(result_set=[])
+
+    def failing_query(query, params=None):
+        if "UNWIND" in query:
+            raise redis.exceptions.ResponseError("Invalid graph operation")
+        return no_indexes
+
+    mocker.patch("redisgraph.graph.Graph.query", side_effect=failing_query)
+    project_dir = os.path.join(test_data_dir, "duplo-project")
+
+    with pytest.raises(RedisResponseException):
+        asyncio.run(
+            load_project_async(PythonProject(project_dir), "test_graph", buffer_size=3)
+        )
+
+
+def test_aload_upsert(test_data_dir, mocker):
+    settings.upsert = True
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    project_dir = os.path.join(test_data_dir, "mini-project")
+
+    asyncio.run(load_project_async(PythonProject(project_dir), "test_graph"))
+
+    write_queries = [
+        call.args[0]
+        for call in query_mock.call_args_list
+        if call.args[0].startswith("UNWIND")
+    ]
+    assert write_queries
+    assert all(" MERGE " in query for query in write_queries)
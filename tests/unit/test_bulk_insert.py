@@ -0,0 +1,146 @@
+import struct
+
+import pytest
+
+from pycograph.bulk_insert import (
+    TYPE_BOOL,
+    TYPE_LONG,
+    TYPE_NULL,
+    TYPE_STRING,
+    BulkGraph,
+    bulk_insert,
+    packed_header,
+    packed_value,
+)
+from pycograph.config import settings
+from pycograph.exceptions import GraphExistsException
+from pycograph.schemas.parse_result import (
+    ContainsRelationship,
+    FunctionWithContext,
+    ModuleWithContext,
+    ParseResult,
+)
+
+
+def test_packed_values():
+    assert packed_value(None) == bytes([TYPE_NULL])
+    assert packed_value(True) == bytes([TYPE_BOOL, 1])
+    assert packed_value(3) == struct.pack("=Bq", TYPE_LONG, 3)
+    assert packed_value("ab") == bytes([TYPE_STRING]) + b"ab\0"
+    with pytest.raises(TypeError):
+        packed_value(["list"])
+
+
+def test_packed_header():
+    assert packed_header("module", ("name", "full_name")) == (
+        b"module\0" + struct.pack("=I", 2) + b"name\0full_name\0"
+    )
+
+
+def test_node_ids_follow_the_groups():
+    bulk_graph = BulkGraph(project_parse_result())
+
+    assert bulk_graph.nodes == {
+        ("module", ("name", "full_name", "is_test_object")): [
+            ["example", "example", False],
+            ["other", "other", False],
+        ],
+        ("function", ("name", "full_name", "is_test_object")): [
+            ["answer", "example.answer", False]
+        ],
+    }
+    # The relationship to an unknown object is skipped.
+    assert bulk_graph.edges == {("contains", ()): [[0, 2]]}
+
+
+def test_batches():
+    bulk_graph = BulkGraph(project_parse_result())
+
+    batches = list(bulk_graph.batches(1024 * 1024))
+
+    assert len(batches) == 1
+    args = batches[0].arguments(begin=True)
+    assert args[:5] == ["BEGIN", 3, 1, 2, 1]
+    assert args[-1] == b"contains\0" + struct.pack("=IQQ", 0, 0, 2)
+
+
+def test_batches_are_size_capped():
+    objects = {
+        f"module_{i}": ModuleWithContext(
+            name=f"module_{i}", full_name=f"module_{i}", file_path=""
+        )
+        for i in range(100)
+    }
+    for i in range(99):
+        objects[f"module_{i}"].relationships.append(
+            ContainsRelationship(destination_full_name=f"module_{i + 1}")
+        )
+    bulk_graph = BulkGraph(ParseResult(objects=objects))
+
+    batches = list(bulk_graph.batches(500))
+
+    assert len(batches) > 2
+    assert all(batch.size <= 500 for batch in batches)
+    assert sum(batch.node_count for batch in batches) == 100
+    assert sum(batch.edge_count for batch in batches) == 99
+    node_batches = [batch.node_count > 0 for batch in batches]
+    assert node_batches == sorted(node_batches, reverse=True)
+    assert batches[1].arguments(begin=False)[0] != "BEGIN"
+
+
+def test_bulk_insert(mocker):
+    redis_mock = mocker.patch("pycograph.bulk_insert.redis_connection").return_value
+    redis_mock.exists.return_value = 0
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+
+    result = bulk_insert("test_graph", project_parse_result(), max_batch_size=64)
+
+    commands = [call.args for call in redis_mock.execute_command.call_args_list]
+    assert len(commands) == 4
+    assert commands[0][:3] == ("GRAPH.BULK", "test_graph", "BEGIN")
+    assert all(command[2] != "BEGIN" for command in commands[1:])
+    assert [call.args[0] for call in query_mock.call_args_list] == [
+        "CALL db.indexes() YIELD type, label, properties",
+        "CREATE INDEX ON :function(full_name)",
+        "CREATE INDEX ON :function(name)",
+        "CREATE INDEX ON :module(full_name)",
+        "CREATE INDEX ON :module(name)",
+    ]
+    assert result.nodes_added == 3
+    assert result.edges_added == 1
+    assert result.round_trips == 4
+
+
+def test_bulk_insert_into_existing_graph(mocker):
+    redis_mock = mocker.patch("pycograph.bulk_insert.redis_connection").return_value
+    redis_mock.exists.return_value = 1
+
+    with pytest.raises(GraphExistsException):
+        bulk_insert("test_graph", project_parse_result())
+
+    redis_mock.execute_command.assert_not_called()
+
+
+def test_bulk_insert_overwrites_graph(mocker):
+    settings.overwrite_existing_graph = True
+    redis_mock = mocker.patch("pycograph.bulk_insert.redis_connection").return_value
+    mocker.patch("redisgraph.graph.Graph.query")
+
+    bulk_insert("test_graph", project_parse_result())
+
+    redis_mock.delete.assert_called_once_with("test_graph")
+    redis_mock.exists.assert_not_called()
+    assert redis_mock.execute_command.call_count == 1
+
+
+def project_parse_result():
+    modu = ModuleWithContext(name="example", full_name="example", file_path="")
+    func = FunctionWithContext(name="answer", full_name="example.answer")
+    other = ModuleWithContext(name="other", full_name="other", file_path="")
+    modu.relationships.append(
+        ContainsRelationship(destination_full_name="example.answer")
+    )
+    modu.relationships.append(ContainsRelationship(destination_full_name="unknown"))
+    return ParseResult(
+        objects={"example": modu, "example.answer": func, "other": other}
+    )
@@ -7,6 +7,9 @@ from pycograph import __version__
 from pycograph.cli import app
 from pycograph.config import settings
 from pycograph.exceptions import RedisWithoutGraphException
+from pycograph.exporters import Compression, ExportFormat, ExportResult
+from pycograph.graph_writer import DEFAULT_BUFFER_SIZE
+from pycograph.incremental_update import GraphUpdateResult
 from pycograph.schemas.pycograph_input import PycographLoadInput
 
 runner = CliRunner()
@@ -31,6 +34,45 @@ def test_load_project_dir(load_mock, test_data_dir):
     assert "Graph successfully updated." in result.stdout
 
 
+def test_load_multiple_project_dirs(load_mock, test_data_dir):
+    project_dirs = [
+        os.path.join(test_data_dir, "mini-project"),
+        os.path.join(test_data_dir, "src-mini-project"),
+    ]
+    load_input = PycographLoadInput(project_dir_paths=project_dirs)
+
+    result = runner.invoke(
+        app,
+        ["load", "--project-dir", project_dirs[0], "--project-dir", project_dirs[1]],
+    )
+
+    load_mock.assert_called_once_with(load_input)
+    assert result.exit_code == 0
+
+
+def test_load_manifest(load_mock, test_data_dir, tmp_path):
+    manifest_path = tmp_path / "roots.txt"
+    manifest_path.write_text(f"# services\n{test_data_dir}/src-mini-project\n")
+    project_dir = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(
+        project_dir_paths=[project_dir, f"{test_data_dir}/src-mini-project"]
+    )
+
+    result = runner.invoke(
+        app, ["load", "--project-dir", project_dir, "--manifest", str(manifest_path)]
+    )
+
+    load_mock.assert_called_once_with(load_input)
+    assert result.exit_code == 0
+
+
+def test_load_missing_manifest(load_mock, tmp_path):
+    result = runner.invoke(app, ["load", "--manifest", str(tmp_path / "roots.txt")])
+
+    load_mock.assert_not_called()
+    assert "Can't read the manifest" in result.stdout
+
+
 def test_load_graph_name(load_mock):
     load_input = PycographLoadInput(project_dir_path=None, graph_name="sample-graph")
 
@@ -53,6 +95,290 @@ def test_load_host_and_port(load_mock, empty_load_input):
     assert "Graph successfully updated." in result.stdout
 
 
+def test_load_jobs(load_mock, empty_load_input):
+    result = runner.invoke(app, ["load", "--jobs", 4])
+
+    assert settings.jobs == 4
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+
+
+def test_load_without_aggregated_calls(load_mock, empty_load_input):
+    result = runner.invoke(app, ["load", "--no-aggregate-calls"])
+
+    assert settings.aggregate_calls is False
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+
+
+def test_load_external_imports(load_mock, empty_load_input):
+    result = runner.invoke(app, ["load", "--external-imports"])
+
+    assert settings.resolve_external_imports is True
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+
+
+def test_load_parse_cache_is_opt_in(load_mock, empty_load_input):
+    settings.use_parse_cache = True
+
+    result = runner.invoke(app, ["load"])
+
+    assert result.exit_code == 0
+    assert settings.use_parse_cache is False
+
+
+def test_load_parse_cache_options(load_mock, empty_load_input):
+    result = runner.invoke(
+        app, ["load", "--cache", "--clear-cache", "--cache-size", 10]
+    )
+
+    assert settings.use_parse_cache is True
+    assert settings.clear_parse_cache is True
+    assert settings.parse_cache_max_size == 10 * 1024 * 1024
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+
+
+def test_load_file_discovery_options(load_mock, empty_load_input):
+    result = runner.invoke(
+        app,
+        [
+            "load",
+            "--include",
+            "src/*",
+            "--exclude",
+            "*_pb2.py",
+            "--exclude",
+            "docs",
+            "--no-default-excludes",
+            "--gitignore",
+            "--max-file-size",
+            1,
+        ],
+    )
+
+    assert settings.include == ["src/*"]
+    assert settings.exclude == ["*_pb2.py", "docs"]
+    assert settings.use_default_excludes is False
+    assert settings.use_gitignore is True
+    assert settings.max_file_size == 1024 * 1024
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+
+
+def test_load_batch_options(load_mock, empty_load_input):
+    result = runner.invoke(app, ["load", "--batch-size", 500, "--batch-latency", 0.05])
+
+    assert settings.batch_size == 500
+    assert settings.batch_latency == 0.05
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+    assert "'nodes added': 3" in result.stdout
+
+
+def test_load_connection_options(load_mock, empty_load_input):
+    result = runner.invoke(
+        app,
+        [
+            "load",
+            "--redis-socket",
+            "/tmp/redis.sock",
+            "--redis-timeout",
+            5,
+            "--redis-connect-timeout",
+            1,
+            "--pipeline-depth",
+            16,
+        ],
+    )
+
+    assert settings.redis_socket == "/tmp/redis.sock"
+    assert settings.redis_socket_timeout == 5.0
+    assert settings.redis_connect_timeout == 1.0
+    assert settings.pipeline_depth == 16
+    load_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+    assert "'round trips saved': 0" in result.stdout
+
+
+@pytest.mark.parametrize("option", ["--redis-timeout", "--redis-connect-timeout"])
+def test_load_zero_timeout(load_mock, option):
+    result = runner.invoke(app, ["load", option, 0])
+
+    load_mock.assert_not_called()
+    assert result.exit_code != 0
+    assert "greater than 0" in result.stdout
+
+
+def test_load_incremental(load_mock, mocker, empty_load_input):
+    update_mock = mocker.patch("pycograph.pycograph.update")
+    update_mock.return_value = GraphUpdateResult(graph_name="dummy", modules_changed=1)
+
+    result = runner.invoke(app, ["load", "--incremental"])
+
+    load_mock.assert_not_called()
+    update_mock.assert_called_once_with(empty_load_input)
+    assert result.exit_code == 0
+    assert "'modules changed': 1" in result.stdout
+
+
+def test_load_stream(load_mock, mocker, empty_load_input):
+    stream_mock = mocker.patch("pycograph.pycograph.stream")
+    stream_mock.return_value = GraphUpdateResult(graph_name="dummy", nodes_added=3)
+
+    result = runner.invoke(app, ["load", "--stream", "--buffer-size", 100])
+
+    load_mock.assert_not_called()
+    stream_mock.assert_called_once_with(empty_load_input, 100)
+    assert result.exit_code == 0
+    assert "'nodes added': 3" in result.stdout
+
+
+def test_load_stream_with_batches_in_flight(load_mock, mocker, empty_load_input):
+    aload_mock = mocker.patch("pycograph.pycograph.aload")
+    aload_mock.return_value = GraphUpdateResult(graph_name="dummy", nodes_added=3)
+    stream_mock = mocker.patch("pycograph.pycograph.stream")
+
+    result = runner.invoke(app, ["load", "--stream", "--max-in-flight", 4])
+
+    stream_mock.assert_not_called()
+    aload_mock.assert_called_once_with(empty_load_input, DEFAULT_BUFFER_SIZE, 4)
+    assert result.exit_code == 0
+    assert "'nodes added': 3" in result.stdout
+
+
+def test_load_stream_and_incremental(load_mock, mocker):
+    stream_mock = mocker.patch("pycograph.pycograph.stream")
+
+    runner.invoke(app, ["load", "--stream", "--incremental"])
+
+    load_mock.assert_not_called()
+    stream_mock.assert_not_called()
+
+
+def test_load_bulk(load_mock, mocker, empty_load_input):
+    bulk_mock = mocker.patch("pycograph.pycograph.bulk")
+    bulk_mock.return_value = GraphUpdateResult(graph_name="dummy", nodes_added=3)
+
+    result = runner.invoke(app, ["load", "--bulk", "--bulk-batch-size", 16])
+
+    load_mock.assert_not_called()
+    bulk_mock.assert_called_once_with(empty_load_input)
+    assert settings.bulk_batch_size == 16 * 1024 * 1024
+    assert result.exit_code == 0
+    assert "'nodes added': 3" in result.stdout
+
+
+def test_load_bulk_and_stream(load_mock, mocker):
+    bulk_mock = mocker.patch("pycograph.pycograph.bulk")
+
+    result = runner.invoke(app, ["load", "--bulk", "--stream"])
+
+    load_mock.assert_not_called()
+    bulk_mock.assert_not_called()
+    assert "can't be combined" in result.stdout
+
+
+def test_load_upsert(load_mock, empty_load_input):
+    result = runner.invoke(app, ["load", "--upsert"])
+
+    load_mock.assert_called_once_with(empty_load_input)
+    assert settings.upsert is True
+    assert result.exit_code == 0
+
+
+def test_load_upsert_and_bulk(load_mock, mocker):
+    bulk_mock = mocker.patch("pycograph.pycograph.bulk")
+
+    result = runner.invoke(app, ["load", "--upsert", "--bulk"])
+
+    load_mock.assert_not_called()
+    bulk_mock.assert_not_called()
+    assert "can't be combined" in result.stdout
+
+
+def test_load_swap(load_mock, empty_load_input):
+    result = runner.invoke(app, ["load", "--swap"])
+
+    load_mock.assert_called_once_with(empty_load_input)
+    assert settings.swap_graph is True
+    assert result.exit_code == 0
+
+
+def test_load_swap_and_incremental(load_mock, mocker):
+    update_mock = mocker.patch("pycograph.pycograph.update")
+
+    result = runner.invoke(app, ["load", "--swap", "--incremental"])
+
+    update_mock.assert_not_called()
+    assert "can't be combined" in result.stdout
+
+
+def test_export(mocker, tmp_path):
+    export_mock = mocker.patch("pycograph.pycograph.export")
+    export_mock.return_value = ExportResult(
+        paths=["out/module.csv", "out/contains.csv"],
+        nodes_exported=3,
+        edges_exported=2,
+        bulk_loader_args=["-N", "module", "out/module.csv"],
+    )
+
+    result = runner.invoke(
+        app, ["export", "--output", str(tmp_path), "--graph-name", "example"]
+    )
+
+    export_mock.assert_called_once_with(
+        PycographLoadInput(project_dir_path=None, graph_name="example"),
+        str(tmp_path),
+        ExportFormat.csv,
+        Compression.none,
+    )
+    assert result.exit_code == 0
+    assert "'edges exported': 2" in result.stdout
+    assert "redisgraph-bulk-insert example -N module out/module.csv" in result.stdout
+
+
+def test_export_format_and_compression(mocker, tmp_path):
+    export_mock = mocker.patch("pycograph.pycograph.export")
+    export_mock.return_value = ExportResult(
+        paths=["out/graph.graphml.gz"],
+        nodes_exported=3,
+        edges_exported=2,
+        bulk_loader_args=[],
+    )
+
+    result = runner.invoke(
+        app,
+        [
+            "export",
+            "--output",
+            str(tmp_path),
+            "--format",
+            "graphml",
+            "--compression",
+            "gzip",
+        ],
+    )
+
+    assert export_mock.call_args.args[2:] == (ExportFormat.graphml, Compression.gzip)
+    assert result.exit_code == 0
+    assert "redisgraph-bulk-insert" not in result.stdout
+
+
+def test_watch(mocker):
+    watch_mock = mocker.patch("pycograph.pycograph.watch")
+    watch_mock.return_value = [(GraphUpdateResult(graph_name="dummy"), 0.1234)]
+
+    result = runner.invoke(app, ["watch", "--interval", 2, "--debounce", 0.1])
+
+    watch_mock.assert_called_once_with(
+        PycographLoadInput(project_dir_path=None, graph_name=None), 2.0, 0.1
+    )
+    assert result.exit_code == 0
+    assert "'seconds': 0.123" in result.stdout
+
+
 def test_load_raises_error(load_mock, mocker, empty_load_input):
     load_mock.side_effect = RedisWithoutGraphException()
     echo_mock = mocker.patch("typer.echo")
@@ -81,7 +407,11 @@ def test_version(load_mock):
 
 @pytest.fixture
 def load_mock(mocker):
-    return mocker.patch("pycograph.pycograph.load")
+    load_mock = mocker.patch("pycograph.pycograph.write")
+    load_mock.return_value = GraphUpdateResult(
+        graph_name="dummy", nodes_added=3, edges_added=2
+    )
+    return load_mock
 
 
 @pytest.fixture
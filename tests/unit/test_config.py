@@ -0,0 +1,42 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pycograph.config import Settings, active_settings, settings, use_settings
+
+
+def test_active_settings_default_to_the_global_settings():
+    assert active_settings() is settings
+
+
+def test_use_settings():
+    config = Settings(jobs=4)
+
+    with use_settings(config) as active_config:
+        assert active_config is config
+        assert active_settings() is config
+
+    assert active_settings() is settings
+
+
+def test_use_settings_none_keeps_the_active_settings():
+    config = Settings(jobs=4)
+
+    with use_settings(config):
+        with use_settings(None) as active_config:
+            assert active_config is config
+
+
+def test_use_settings_in_threads():
+    # All threads activate their settings before any of them reads them.
+    barrier = threading.Barrier(4)
+
+    def jobs_in_thread(jobs):
+        with use_settings(Settings(jobs=jobs)):
+            barrier.wait(timeout=5)
+            return active_settings().jobs
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = list(executor.map(jobs_in_thread, range(1, 5)))
+
+    assert result == list(range(1, 5))
+    assert settings.jobs == 1
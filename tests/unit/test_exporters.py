@@ -0,0 +1,148 @@
+import csv
+import gzip
+import json
+import lzma
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from pycograph.exporters import Compression, ExportFormat, export_parse_result
+from pycograph.schemas.basic_syntax_elements import (
+    ImportFromSyntaxElement,
+    ImportSyntaxElement,
+)
+from pycograph.schemas.parse_result import (
+    ContainsRelationship,
+    FunctionWithContext,
+    ModuleWithContext,
+    ParseResult,
+    ResolvedImportRelationship,
+)
+
+GRAPHML = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+def test_export_jsonl(tmp_path):
+    result = export_parse_result(project_parse_result(), str(tmp_path))
+
+    assert result.paths == [
+        str(tmp_path / "nodes.jsonl"),
+        str(tmp_path / "edges.jsonl"),
+    ]
+    nodes = [json.loads(line) for line in (tmp_path / "nodes.jsonl").open()]
+    assert nodes[1] == {
+        "id": "example.answer",
+        "label": "function",
+        "properties": {
+            "name": "answer",
+            "full_name": "example.answer",
+            "is_test_object": False,
+        },
+    }
+    edges = [json.loads(line) for line in (tmp_path / "edges.jsonl").open()]
+    # The relationship to an unknown object is skipped.
+    assert edges == [
+        {
+            "source": "example",
+            "type": "contains",
+            "target": "example.answer",
+            "properties": {},
+        }
+    ]
+    assert result.nodes_exported == 2
+    assert result.edges_exported == 1
+    assert result.bulk_loader_args == []
+
+
+def test_export_csv(tmp_path):
+    result = export_parse_result(
+        project_parse_result(), str(tmp_path), ExportFormat.csv
+    )
+
+    function_path = str(tmp_path / "function.csv")
+    contains_path = str(tmp_path / "contains.csv")
+    assert result.bulk_loader_args == [
+        "-N",
+        "module",
+        str(tmp_path / "module.csv"),
+        "-N",
+        "function",
+        function_path,
+        "-R",
+        "contains",
+        contains_path,
+    ]
+    with open(function_path, newline="") as f:
+        assert list(csv.reader(f)) == [
+            ["_id", "name", "full_name", "is_test_object"],
+            ["1", "answer", "example.answer", "false"],
+        ]
+    with open(contains_path, newline="") as f:
+        assert list(csv.reader(f)) == [["_src", "_dest"], ["0", "1"]]
+
+
+def test_export_csv_with_different_keys(tmp_path):
+    parse_result = project_parse_result()
+    parse_result.objects["example"].relationships = [
+        ResolvedImportRelationship(
+            destination_full_name="example.answer",
+            import_element=ImportSyntaxElement(name="example.answer"),
+        ),
+        ResolvedImportRelationship(
+            destination_full_name="example.answer",
+            import_element=ImportFromSyntaxElement(name="answer", from_text="example"),
+        ),
+    ]
+
+    result = export_parse_result(parse_result, str(tmp_path), ExportFormat.csv)
+
+    assert result.paths[2:] == [
+        str(tmp_path / "imports.csv"),
+        str(tmp_path / "imports-2.csv"),
+    ]
+    assert result.bulk_loader_args[-3:] == ["-R", "imports", result.paths[-1]]
+    with open(result.paths[-1], newline="") as f:
+        assert next(csv.reader(f))[-2:] == ["from", "level"]
+
+
+def test_export_graphml(tmp_path):
+    result = export_parse_result(
+        project_parse_result(), str(tmp_path), ExportFormat.graphml
+    )
+
+    assert result.paths == [str(tmp_path / "graph.graphml")]
+    # Only the GraphML file is left, the temporary file is deleted.
+    assert [path.name for path in tmp_path.iterdir()] == ["graph.graphml"]
+    root = ET.parse(result.paths[0]).getroot()
+    keys = {key.get("id"): key.get("attr.type") for key in root.iter(f"{GRAPHML}key")}
+    assert keys["node_is_test_object"] == "boolean"
+    assert keys["edge_label"] == "string"
+    graph = root.find(f"{GRAPHML}graph")
+    nodes = graph.findall(f"{GRAPHML}node")
+    assert [node.get("id") for node in nodes] == ["example", "example.answer"]
+    edge = graph.find(f"{GRAPHML}edge")
+    assert (edge.get("source"), edge.get("target")) == ("example", "example.answer")
+
+
+@pytest.mark.parametrize(
+    "compression,suffix,opener",
+    [(Compression.gzip, ".gz", gzip.open), (Compression.xz, ".xz", lzma.open)],
+)
+def test_compression(tmp_path, compression, suffix, opener):
+    result = export_parse_result(
+        project_parse_result(), str(tmp_path), ExportFormat.jsonl, compression
+    )
+
+    assert result.paths[0] == str(tmp_path / f"nodes.jsonl{suffix}")
+    with opener(result.paths[1], "rt") as f:
+        assert json.loads(f.readline())["target"] == "example.answer"
+
+
+def project_parse_result():
+    modu = ModuleWithContext(name="example", full_name="example", file_path="")
+    func = FunctionWithContext(name="answer", full_name="example.answer")
+    modu.relationships = [
+        ContainsRelationship(destination_full_name="example.answer"),
+        ContainsRelationship(destination_full_name="unknown"),
+    ]
+    return ParseResult(objects={"example": modu, "example.answer": func})
@@ -0,0 +1,91 @@
+import os
+
+from pycograph import external_modules
+from pycograph.config import Settings
+from pycograph.external_modules import (
+    INDEX_FILE_NAME,
+    ExternalModuleIndex,
+    build_index,
+    load_index,
+)
+from pycograph.pycograph import graph_store
+from pycograph.schemas.pycograph_input import PycographLoadInput
+
+
+def create_environment(root_dir):
+    os.makedirs(os.path.join(root_dir, "requests"))
+    os.makedirs(os.path.join(root_dir, "namespace_pkg", "sub"))
+    os.makedirs(os.path.join(root_dir, "requests-2.25.1.dist-info"))
+    os.makedirs(os.path.join(root_dir, "__pycache__"))
+    for file_name in ["six.py", "_cffi.cpython-311-x86_64-linux-gnu.so", "x.pth"]:
+        with open(os.path.join(root_dir, file_name), "w") as f:
+            f.write("")
+    return str(root_dir)
+
+
+def test_build_index(tmp_path):
+    index = build_index([create_environment(tmp_path)])
+
+    assert {"requests", "namespace_pkg", "six", "_cffi"} <= index.module_names
+    assert "requests-2.25.1.dist-info" not in index.module_names
+    assert "__pycache__" not in index.module_names
+    assert "x" not in index.module_names
+    # builtin and standard library modules
+    assert {"sys", "os"} <= index.module_names
+
+
+def test_top_level_module():
+    index = ExternalModuleIndex(["requests"])
+
+    assert index.top_level_module("requests") == "requests"
+    assert index.top_level_module("requests.adapters.HTTPAdapter") == "requests"
+    assert index.top_level_module("pycograph.project") is None
+
+
+def test_load_index_is_cached(tmp_path, mocker):
+    environment_dir = create_environment(tmp_path / "site-packages")
+    mocker.patch.object(
+        external_modules, "environment_paths", return_value=[environment_dir]
+    )
+    build_mock = mocker.spy(external_modules, "build_index")
+    cache_dir = os.path.join(tmp_path, "cache")
+
+    first_index = load_index(cache_dir)
+    second_index = load_index(cache_dir)
+
+    assert build_mock.call_count == 1
+    assert second_index.module_names == first_index.module_names
+
+
+def test_index_is_cached_without_the_parse_cache(
+    tmp_path, mocker, test_data_dir, user_cache_dir
+):
+    environment_dir = create_environment(tmp_path / "site-packages")
+    mocker.patch.object(
+        external_modules, "environment_paths", return_value=[environment_dir]
+    )
+    build_mock = mocker.spy(external_modules, "build_index")
+    load_input = PycographLoadInput(
+        project_dir_path=os.path.join(test_data_dir, "mini-project")
+    )
+    config = Settings(resolve_external_imports=True, use_parse_cache=False)
+
+    for _ in range(2):
+        graph_store(load_input, config)
+
+    assert build_mock.call_count == 1
+    assert os.listdir(user_cache_dir / "pycograph") == [INDEX_FILE_NAME]
+
+
+def test_load_index_is_rebuilt_after_installing_a_package(tmp_path, mocker):
+    environment_dir = create_environment(tmp_path / "site-packages")
+    mocker.patch.object(
+        external_modules, "environment_paths", return_value=[environment_dir]
+    )
+    cache_dir = os.path.join(tmp_path, "cache")
+    assert "numpy" not in load_index(cache_dir).module_names
+
+    os.makedirs(os.path.join(environment_dir, "numpy"))
+    os.utime(environment_dir, ns=(0, 0))
+
+    assert "numpy" in load_index(cache_dir).module_names
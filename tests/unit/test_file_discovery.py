@@ -0,0 +1,154 @@
+import os
+
+import pytest
+
+from pycograph.file_discovery import FileDiscovery, GitignoreRules
+
+
+def test_default_excludes(project_dir):
+    for rel_path in [
+        ".git/hooks/hook.py",
+        ".venv/lib/site.py",
+        "node_modules/pkg/script.py",
+        "pak/__pycache__/cached.py",
+        "env/lib/python3.8/site-packages/dep.py",
+    ]:
+        create_file(project_dir, rel_path)
+    create_file(project_dir, "env/pyvenv.cfg")
+
+    assert found_files(FileDiscovery(), project_dir) == [
+        "pak/__init__.py",
+        "pak/example.py",
+        "pak/sub/module.py",
+        "tests/test_example.py",
+    ]
+
+
+def test_build_directories_are_excluded_only_in_the_root(project_dir):
+    for rel_path in [
+        "build/lib/pak/example.py",
+        "dist/generated.py",
+        "pak/build/__init__.py",
+        "pak/build/core.py",
+    ]:
+        create_file(project_dir, rel_path)
+
+    result = found_files(FileDiscovery(), project_dir)
+
+    assert "pak/build/__init__.py" in result
+    assert "pak/build/core.py" in result
+    assert not [path for path in result if path.startswith(("build/", "dist/"))]
+
+
+def test_anchored_exclude(project_dir):
+    discovery = FileDiscovery(exclude=["/sub", "/pak/sub"])
+
+    assert "pak/sub/module.py" not in found_files(discovery, project_dir)
+    discovery = FileDiscovery(exclude=["/sub"])
+    assert "pak/sub/module.py" in found_files(discovery, project_dir)
+
+
+def test_no_file_size_limit_by_default(project_dir):
+    create_file(project_dir, "pak/generated.py", "X = 1\n" * 1000000)
+
+    assert "pak/generated.py" in found_files(FileDiscovery(), project_dir)
+
+
+def test_without_default_excludes(project_dir):
+    create_file(project_dir, ".venv/lib/site.py")
+
+    result = found_files(FileDiscovery(use_default_excludes=False), project_dir)
+
+    assert ".venv/lib/site.py" in result
+
+
+def test_walk_yields_directories_top_down_in_alphabetical_order(project_dir):
+    result = [
+        (os.path.relpath(dir_path, project_dir), file_names)
+        for dir_path, file_names in FileDiscovery().walk(project_dir)
+    ]
+
+    assert result == [
+        ("pak", ["__init__.py", "example.py"]),
+        (os.path.join("pak", "sub"), ["module.py"]),
+        ("tests", ["test_example.py"]),
+    ]
+
+
+def test_include_and_exclude(project_dir):
+    discovery = FileDiscovery(include=["pak/*"], exclude=["sub", "__init__.py"])
+
+    assert found_files(discovery, project_dir) == ["pak/example.py"]
+
+
+def test_max_file_size(project_dir):
+    create_file(project_dir, "pak/generated.py", "X = 1\n" * 100)
+
+    result = found_files(FileDiscovery(max_file_size=100), project_dir)
+
+    assert "pak/generated.py" not in result
+    assert "pak/example.py" in result
+
+
+def test_gitignore(project_dir):
+    create_file(project_dir, ".gitignore", "# comment\n/tests/\n*.py\n!pak/*.py\n")
+    create_file(project_dir, "pak/sub/.gitignore", "!module.py\n")
+
+    result = found_files(FileDiscovery(use_gitignore=True), project_dir)
+
+    assert result == ["pak/__init__.py", "pak/example.py", "pak/sub/module.py"]
+
+
+@pytest.mark.parametrize(
+    "pattern,rel_path,is_dir,expected",
+    [
+        ("build", "pak/build", True, True),
+        ("build/", "pak/build", False, False),
+        ("/build", "pak/build", True, False),
+        ("/build", "build", True, True),
+        ("pak/*.py", "pak/example.py", False, True),
+        ("pak/*.py", "pak/sub/example.py", False, False),
+        ("**/gen", "a/b/gen", True, True),
+        ("pak/**", "pak/sub/example.py", False, True),
+        ("a/**/b", "a/x/y/b", True, True),
+        ("test_[ab].py", "test_a.py", False, True),
+        ("test_[!ab].py", "test_a.py", False, False),
+        ("*.py", "example.pyc", False, False),
+    ],
+)
+def test_gitignore_patterns(pattern, rel_path, is_dir, expected, tmp_path):
+    gitignore_path = os.path.join(tmp_path, ".gitignore")
+    with open(gitignore_path, "w") as f:
+        f.write(pattern)
+    rules = GitignoreRules()
+    rules.add_file(gitignore_path, "")
+
+    assert rules.is_ignored(rel_path, is_dir) == expected
+
+
+def found_files(discovery: FileDiscovery, project_dir: str):
+    return [
+        os.path.relpath(file_path, project_dir).replace(os.path.sep, "/")
+        for file_path in discovery.python_files(project_dir)
+    ]
+
+
+def create_file(project_dir: str, rel_path: str, content: str = "") -> None:
+    file_path = os.path.join(project_dir, *rel_path.split("/"))
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w") as f:
+        f.write(content)
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    for rel_path in [
+        "setup.py",
+        "README.md",
+        "pak/__init__.py",
+        "pak/example.py",
+        "pak/sub/module.py",
+        "tests/test_example.py",
+    ]:
+        create_file(str(tmp_path), rel_path)
+    return str(tmp_path)
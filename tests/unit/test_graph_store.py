@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from pycograph.graph_store import GraphStore
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import (
+    ContainsRelationship,
+    FunctionWithContext,
+    ModuleWithContext,
+    ParseResult,
+)
+
+
+def test_callers_and_callees(duplo_store):
+    assert duplo_store.callees("duplo.main.bla") == [
+        "duplo.content.ANSWER",
+        "duplo.content.Dummy",
+        "duplo.content.publ",
+    ]
+    assert duplo_store.callers("duplo.content.publ") == ["duplo.main.bla"]
+    assert duplo_store.callers("duplo.main.bla") == []
+
+
+def test_imports_and_importers(duplo_store):
+    assert duplo_store.imports("duplo.main") == [
+        "duplo.content.ANSWER",
+        "duplo.content.Dummy",
+        "duplo.content.publ",
+    ]
+    assert duplo_store.importers("duplo.content.Dummy") == ["duplo.main"]
+
+
+def test_containment(duplo_store):
+    assert duplo_store.container("duplo.content.priv") == "duplo.content"
+    assert duplo_store.container("duplo") is None
+    assert sorted(duplo_store.subtree("duplo.content")) == [
+        "duplo.content",
+        "duplo.content.ANSWER",
+        "duplo.content.Dummy",
+        "duplo.content.priv",
+        "duplo.content.publ",
+    ]
+    assert duplo_store.subtree("duplo")[0] == "duplo"
+    assert len(duplo_store.subtree("duplo")) == len(duplo_store)
+
+
+def test_neighborhood(duplo_store):
+    assert duplo_store.neighborhood("duplo.content.priv", 2, ["calls"]) == {
+        "duplo.content.priv": 0,
+        "duplo.content.publ": 1,
+        "duplo.main.bla": 2,
+    }
+    assert duplo_store.neighborhood("duplo.main.bla", 1, direction="out") == {
+        "duplo.main.bla": 0,
+        "duplo.content.ANSWER": 1,
+        "duplo.content.Dummy": 1,
+        "duplo.content.publ": 1,
+    }
+    with pytest.raises(ValueError):
+        duplo_store.neighborhood("duplo.main.bla", 1, direction="sideways")
+
+
+def test_find_imports(duplo_store):
+    assert duplo_store.find_imports("duplo.main", "duplo.content") == [
+        ("duplo.main", "duplo.content.ANSWER"),
+        ("duplo.main", "duplo.content.Dummy"),
+        ("duplo.main", "duplo.content.publ"),
+    ]
+    assert duplo_store.find_imports("duplo.content", "duplo.main") == []
+
+
+def test_ids_and_counts(duplo_store):
+    node_id = duplo_store.node_id("duplo.content.publ")
+
+    assert duplo_store.node(node_id).label() == "function"
+    assert list(duplo_store.successors(node_id, "calls")) == [
+        duplo_store.node_id("duplo.content.priv")
+    ]
+    assert duplo_store.successors(node_id, "unknown") == ()
+    assert duplo_store.edge_count() == 14
+    assert duplo_store.edge_count("imports") == 3
+    with pytest.raises(KeyError):
+        duplo_store.node_id("unknown")
+
+
+def test_unknown_destinations_are_skipped():
+    modu = ModuleWithContext(name="example", full_name="example", file_path="")
+    func = FunctionWithContext(name="answer", full_name="example.answer")
+    modu.relationships = [
+        ContainsRelationship(destination_full_name="example.answer"),
+        ContainsRelationship(destination_full_name="unknown"),
+    ]
+
+    store = GraphStore(ParseResult(objects={"example": modu, "example.answer": func}))
+
+    assert store.subtree("example") == ["example", "example.answer"]
+    assert store.edge_count() == 1
+
+
+@pytest.fixture
+def duplo_store(test_data_dir):
+    project_dir = os.path.join(test_data_dir, "duplo-project")
+    return GraphStore(PythonProject(project_dir).parse())
@@ -0,0 +1,90 @@
+import pytest
+import redis
+
+from pycograph.exceptions import GraphSwapException
+from pycograph.graph_swap import swap_graph, swapped_graph, temporary_graph_name
+
+
+def test_temporary_graph_names_are_unique():
+    first = temporary_graph_name("example", "building")
+
+    assert first.startswith("example:building:")
+    assert first != temporary_graph_name("example", "building")
+
+
+def test_swap_replaces_the_live_graph(mocker):
+    redis_mock = mocker.MagicMock()
+    pipeline = redis_mock.pipeline.return_value.__enter__.return_value
+    pipeline.exists.return_value = 1
+
+    replaced = swap_graph(redis_mock, "example:building:1", "example")
+
+    assert replaced is True
+    retired_name = pipeline.rename.call_args_list[0].args[1]
+    assert retired_name.startswith("example:retired:")
+    assert [call.args for call in pipeline.rename.call_args_list] == [
+        ("example", retired_name),
+        ("example:building:1", "example"),
+    ]
+    pipeline.multi.assert_called_once()
+    pipeline.execute.assert_called_once()
+    redis_mock.unlink.assert_called_once_with(retired_name)
+
+
+def test_swap_without_live_graph(mocker):
+    redis_mock = mocker.MagicMock()
+    pipeline = redis_mock.pipeline.return_value.__enter__.return_value
+    pipeline.exists.side_effect = [1, 0]
+
+    replaced = swap_graph(redis_mock, "example:building:1", "example")
+
+    assert replaced is False
+    pipeline.rename.assert_called_once_with("example:building:1", "example")
+    redis_mock.unlink.assert_not_called()
+
+
+def test_swap_is_retried_after_a_concurrent_change(mocker):
+    redis_mock = mocker.MagicMock()
+    pipeline = redis_mock.pipeline.return_value.__enter__.return_value
+    pipeline.exists.return_value = 1
+    pipeline.execute.side_effect = [redis.WatchError(), None]
+
+    swap_graph(redis_mock, "example:building:1", "example")
+
+    assert pipeline.watch.call_count == 2
+    redis_mock.unlink.assert_called_once()
+
+
+def test_missing_new_graph_keeps_the_live_graph(mocker):
+    redis_mock = mocker.MagicMock()
+    pipeline = redis_mock.pipeline.return_value.__enter__.return_value
+    pipeline.exists.return_value = 0
+
+    with pytest.raises(GraphSwapException):
+        swap_graph(redis_mock, "example:building:1", "example")
+
+    pipeline.rename.assert_not_called()
+    pipeline.execute.assert_not_called()
+
+
+def test_swapped_graph(mocker):
+    redis_mock = mocker.patch("pycograph.graph_swap.redis_connection").return_value
+    swap_mock = mocker.patch("pycograph.graph_swap.swap_graph")
+
+    with swapped_graph("example") as building_name:
+        swap_mock.assert_not_called()
+
+    assert building_name.startswith("example:building:")
+    swap_mock.assert_called_once_with(redis_mock, building_name, "example")
+
+
+def test_failed_load_deletes_the_new_graph(mocker):
+    redis_mock = mocker.patch("pycograph.graph_swap.redis_connection").return_value
+    swap_mock = mocker.patch("pycograph.graph_swap.swap_graph")
+
+    with pytest.raises(ValueError):
+        with swapped_graph("example") as building_name:
+            raise ValueError("parse error")
+
+    swap_mock.assert_not_called()
+    redis_mock.unlink.assert_called_once_with(building_name)
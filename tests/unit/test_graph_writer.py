@@ -0,0 +1,251 @@
+from redisgraph.graph import Graph
+
+from pycograph.config import settings
+from pycograph.graph_writer import (
+    MAX_BATCH_SIZE,
+    MIN_BATCH_SIZE,
+    AdaptiveBatchSize,
+    GraphWriter,
+    QueryPipeline,
+    build_params_header,
+    create_edges_query,
+    create_nodes_query,
+    merge_edges_query,
+    merge_nodes_query,
+    query_in_batches,
+)
+from pycograph.schemas.parse_result import (
+    ContainsRelationship,
+    FunctionWithContext,
+    ModuleWithContext,
+    ParseResult,
+)
+
+
+def test_flush_writes_nodes_before_edges(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    writer = GraphWriter(graph)
+    modu, func, rel = module_with_function()
+
+    writer.add_node(modu)
+    writer.add_node(func)
+    writer.add_edge(modu, rel, func)
+    writer.flush()
+
+    queries = [call.args[0] for call in query_mock.call_args_list]
+    assert queries == [
+        "CALL db.indexes() YIELD type, label, properties",
+        "CREATE INDEX ON :function(full_name)",
+        "CREATE INDEX ON :function(name)",
+        "CREATE INDEX ON :module(full_name)",
+        "CREATE INDEX ON :module(name)",
+        create_nodes_query("module", ("name", "full_name", "is_test_object")),
+        create_nodes_query("function", ("name", "full_name", "is_test_object")),
+        create_edges_query("module", "contains", "function", ()),
+    ]
+    assert query_mock.call_args_list[-1].args[1] == {
+        "rows": [["example", "example.answer"]]
+    }
+    assert writer.nodes_added == 2
+    assert writer.edges_added == 1
+
+
+def test_full_buffer_is_flushed(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    writer = GraphWriter(graph, buffer_size=2)
+    modu, func, rel = module_with_function()
+
+    writer.add_node(modu)
+    assert query_mock.call_count == 0
+    writer.add_node(func)
+    assert writer.nodes_added == 2
+    writer.add_edge(modu, rel, func)
+    writer.flush()
+
+    # The indexes are created only once.
+    queries = [call.args[0] for call in query_mock.call_args_list]
+    assert len([query for query in queries if "CREATE INDEX" in query]) == 4
+    assert writer.edges_added == 1
+
+
+def test_add_parse_result_skips_unknown_destinations(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    writer = GraphWriter(graph)
+    modu, func, rel = module_with_function()
+    modu.relationships = [rel, ContainsRelationship(destination_full_name="unknown")]
+
+    writer.add_parse_result(
+        ParseResult(objects={"example": modu, "example.answer": func})
+    )
+    writer.flush()
+
+    assert query_mock.call_args_list[-1].args[1] == {
+        "rows": [["example", "example.answer"]]
+    }
+    assert writer.nodes_added == 2
+    assert writer.edges_added == 1
+
+
+def test_merge_nodes_query():
+    assert merge_nodes_query("module", ("name", "full_name", "is_test_object")) == (
+        "UNWIND $rows AS row MERGE (n:module {full_name: row[1]}) "
+        "SET n.`name` = row[0], n.`is_test_object` = row[2]"
+    )
+
+
+def test_merge_edges_query():
+    assert merge_edges_query("module", "contains", "function", ()) == (
+        "UNWIND $rows AS row "
+        "MATCH (s:module {full_name: row[0]}), (d:function {full_name: row[1]}) "
+        "MERGE (s)-[r:contains]->(d)"
+    )
+    keys = ("reference_name", "called_attribute", "count")
+    assert merge_edges_query("function", "calls", "function", keys) == (
+        "UNWIND $rows AS row "
+        "MATCH (s:function {full_name: row[0]}), (d:function {full_name: row[1]}) "
+        "MERGE (s)-[r:calls {`reference_name`: row[2], `called_attribute`: row[3]}]"
+        "->(d) SET r.`count` = row[4]"
+    )
+
+
+def test_upsert_merges_nodes_and_edges(mocker):
+    settings.upsert = True
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    writer = GraphWriter(graph)
+    modu, func, rel = module_with_function()
+
+    writer.add_node(modu)
+    writer.add_node(func)
+    writer.add_edge(modu, rel, func)
+    writer.flush()
+
+    queries = [call.args[0] for call in query_mock.call_args_list]
+    assert queries[-3:] == [
+        merge_nodes_query("module", ("name", "full_name", "is_test_object")),
+        merge_nodes_query("function", ("name", "full_name", "is_test_object")),
+        merge_edges_query("module", "contains", "function", ()),
+    ]
+
+
+def test_query_in_batches(mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    rows = [[index] for index in range(25)]
+
+    query_in_batches(graph, "UNWIND $rows AS row", rows, AdaptiveBatchSize(10, 0))
+
+    assert [len(call.args[1]["rows"]) for call in query_mock.call_args_list] == [
+        10,
+        10,
+        5,
+    ]
+
+
+def test_query_in_batches_adapts_the_batch_size(mocker):
+    graph = Graph("test_graph", None)
+    mocker.patch.object(graph, "query")
+    # Each query takes 1 second.
+    mocker.patch("time.perf_counter", side_effect=range(100))
+    batch_size = AdaptiveBatchSize(80, 0.5)
+
+    query_in_batches(graph, "UNWIND $rows AS row", [[1]] * 150, batch_size)
+
+    # 80 + 40 + 20 + 10
+    assert batch_size.size == MIN_BATCH_SIZE
+
+
+def test_batch_size_grows_after_fast_full_batches():
+    batch_size = AdaptiveBatchSize(1000, 0.2)
+
+    batch_size.observe(1000, 0.01)
+    assert batch_size.size == 2000
+    # A partial batch doesn't show that a bigger one would be fast.
+    batch_size.observe(100, 0.01)
+    assert batch_size.size == 2000
+    batch_size.observe(2000, 0.15)
+    assert batch_size.size == 2000
+    batch_size.observe(2000, 0.3)
+    assert batch_size.size == 1000
+
+
+def test_batch_size_limits():
+    assert AdaptiveBatchSize(1, 0.2).size == MIN_BATCH_SIZE
+    batch_size = AdaptiveBatchSize(MAX_BATCH_SIZE, 0.2)
+    batch_size.observe(MAX_BATCH_SIZE, 0.01)
+    assert batch_size.size == MAX_BATCH_SIZE
+
+
+def test_fixed_batch_size():
+    batch_size = AdaptiveBatchSize(1000, 0)
+
+    batch_size.observe(1000, 0.01)
+    batch_size.observe(1000, 10)
+
+    assert batch_size.size == 1000
+
+
+def test_build_params_header():
+    params = {
+        "rows": [['say "hi"', "C:\\temp", None, True, 1.5, [1, (2, 3)], {"a": ""}]],
+        "name": "f",
+    }
+
+    result = build_params_header(params)
+
+    assert result == (
+        'CYPHER rows=[["say \\"hi\\"","C:\\\\temp",null,True,1.5,[1,[2,3]],{a:""}]] '
+        'name="f" '
+    )
+
+
+def test_pipeline_sends_several_queries_in_one_round_trip(mocker):
+    redis_con = mocker.MagicMock()
+    pipeline_mock = redis_con.pipeline.return_value
+    graph = Graph("test_graph", redis_con)
+    pipeline = QueryPipeline(graph, depth=2, batch_size=AdaptiveBatchSize(10, 0))
+
+    pipeline.query_in_batches("UNWIND $rows AS row", [[index] for index in range(25)])
+
+    assert pipeline_mock.execute.call_count == 1
+    pipeline.execute()
+
+    assert pipeline_mock.execute.call_count == 2
+    commands = [call.args for call in pipeline_mock.execute_command.call_args_list]
+    assert [command[:2] for command in commands] == [("GRAPH.QUERY", "test_graph")] * 3
+    assert commands[0][2] == (
+        "CYPHER rows=[[0],[1],[2],[3],[4],[5],[6],[7],[8],[9]] UNWIND $rows AS row"
+    )
+    assert commands[2][2].startswith("CYPHER rows=[[20],")
+    assert pipeline.queries == 3
+    assert pipeline.round_trips == 2
+    assert pipeline.round_trips_saved() == 1
+
+
+def test_flush_sends_the_queued_queries(mocker):
+    redis_con = mocker.MagicMock()
+    graph = Graph("test_graph", redis_con)
+    mocker.patch.object(graph, "query")
+    writer = GraphWriter(graph, pipeline_depth=8)
+    modu, func, rel = module_with_function()
+
+    writer.add_node(modu)
+    writer.add_node(func)
+    writer.add_edge(modu, rel, func)
+    writer.flush()
+
+    # The indexes are created directly, the nodes and the edges in one round trip.
+    assert graph.query.call_count == 5
+    assert redis_con.pipeline.return_value.execute.call_count == 1
+    assert writer.pipeline.queries == 3
+    assert writer.pipeline.round_trips_saved() == 2
+
+
+def module_with_function():
+    modu = ModuleWithContext(name="example", full_name="example", file_path="")
+    func = FunctionWithContext(name="answer", full_name="example.answer")
+    rel = ContainsRelationship(destination_full_name="example.answer")
+    return modu, func, rel
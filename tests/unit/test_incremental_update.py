@@ -0,0 +1,209 @@
+import os
+
+import pytest
+from redisgraph.graph import Graph
+
+from pycograph.incremental_update import (
+    GraphUpdatePlan,
+    apply_plan,
+    plan_update,
+    update_graph,
+)
+from pycograph.project import PythonProject
+from pycograph.schemas.parse_result import ParseResult
+
+EXAMPLE_CONTENT = "def f():\n    pass\n"
+USER_CONTENT = "from pak.example import f\n\n\ndef g():\n    f()\n"
+REDEFINED_CONTENT = (
+    "def f():\n    g()\n\n\ndef f():\n    pass\n\n\ndef g():\n    pass\n"
+)
+
+
+def test_plan_for_empty_graph(project_dir):
+    plan = plan_update(parse(project_dir), {})
+
+    assert plan.modules_added == 3
+    assert plan.modules_changed == 0
+    assert plan.deleted_units == {}
+    assert created_node_names(plan) == {
+        "pak",
+        "pak.__init__",
+        "pak.example",
+        "pak.example.f",
+        "pak.user",
+        "pak.user.g",
+    }
+    assert ("pak.user.g", "pak.example.f") in created_edges(plan, "calls")
+
+
+def test_plan_for_unchanged_project(project_dir):
+    first_plan = plan_update(parse(project_dir), {})
+
+    plan = plan_update(parse(project_dir), stored_units(first_plan))
+
+    assert plan.modules_added == 0
+    assert plan.modules_changed == 0
+    assert plan.modules_removed == 0
+    assert plan.deleted_units == {}
+    assert plan.nodes == {}
+    assert plan.edges == {}
+
+
+def test_plan_for_changed_module(project_dir):
+    first_plan = plan_update(parse(project_dir), {})
+    write(project_dir, "example.py", EXAMPLE_CONTENT + "\n\ndef h():\n    pass\n")
+
+    plan = plan_update(parse(project_dir), stored_units(first_plan))
+
+    assert plan.modules_changed == 1
+    assert plan.deleted_units == {"module": ["pak.example"]}
+    assert created_node_names(plan) == {"pak.example", "pak.example.f", "pak.example.h"}
+    # The edges into the re-created module are re-created as well.
+    assert created_edges(plan, "calls") == {("pak.user.g", "pak.example.f")}
+    assert created_edges(plan, "imports") == {("pak.user", "pak.example.f")}
+    assert ("pak", "pak.example") in created_edges(plan, "contains")
+    assert ("pak.user", "pak.user.g") not in created_edges(plan, "contains")
+
+
+def test_plan_for_changed_resolution(project_dir):
+    first_plan = plan_update(parse(project_dir), {})
+    write(project_dir, "example.py", "def other():\n    pass\n")
+
+    plan = plan_update(parse(project_dir), stored_units(first_plan))
+
+    # pak.user didn't change, but its import and call can't be resolved anymore.
+    assert plan.modules_changed == 2
+    assert created_node_names(plan) == {
+        "pak.example",
+        "pak.example.other",
+        "pak.user",
+        "pak.user.g",
+    }
+    assert created_edges(plan, "calls") == set()
+
+
+def test_plan_for_removed_module(project_dir):
+    first_plan = plan_update(parse(project_dir), {})
+    os.remove(os.path.join(project_dir, "pak", "user.py"))
+
+    plan = plan_update(parse(project_dir), stored_units(first_plan))
+
+    assert plan.modules_removed == 1
+    assert plan.deleted_units["module"] == ["pak.user"]
+    # The package is re-created without its contains edge to the removed module.
+    assert created_node_names(plan) == {"pak"}
+    assert created_edges(plan, "contains") == {
+        ("pak", "pak.__init__"),
+        ("pak", "pak.example"),
+    }
+
+
+def test_plan_for_graph_without_fingerprints(project_dir):
+    first_plan = plan_update(parse(project_dir), {})
+    units = {
+        full_name: (label, None)
+        for full_name, (label, _) in stored_units(first_plan).items()
+    }
+
+    plan = plan_update(parse(project_dir), units)
+
+    assert plan.modules_changed == 3
+    assert created_node_names(plan) == created_node_names(first_plan)
+
+
+def test_plan_skips_redefined_objects(project_dir):
+    write(project_dir, "example.py", REDEFINED_CONTENT)
+    parse_result = parse(project_dir)
+
+    plan = plan_update(parse_result, {})
+
+    function_rows = [
+        row
+        for (label, _), rows in plan.nodes.items()
+        if label == "function"
+        for row in rows
+    ]
+    functions = [
+        obj for obj in parse_result.objects.values() if obj.label() == "function"
+    ]
+    assert len(function_rows) == len(functions)
+    # The calls edge of the replaced function isn't planned.
+    assert ("pak.example.f", "pak.example.g") not in created_edges(plan, "calls")
+
+
+def test_apply_plan_queries(project_dir, mocker):
+    graph = Graph("test_graph", None)
+    query_mock = mocker.patch.object(graph, "query")
+    plan = plan_update(parse(project_dir), {"pak.old": ("module", "abc")})
+
+    apply_plan(graph, plan)
+
+    queries = [call.args[0] for call in query_mock.call_args_list]
+    assert "CREATE INDEX ON :function(full_name)" in queries
+    assert (
+        "UNWIND $rows AS row "
+        "MATCH (:module {full_name: row})-[:contains*0..]->(n) DETACH DELETE n"
+    ) in queries
+    assert (
+        "UNWIND $rows AS row "
+        "MATCH (s:function {full_name: row[0]}), (d:function {full_name: row[1]}) "
+        "CREATE (s)-[:calls {`reference_name`: row[2], "
+        "`called_attribute`: row[3], `count`: row[4]}]->(d)"
+    ) in queries
+    # The fingerprints are stored after all nodes and edges are created.
+    assert all("SET n.fingerprint" in query for query in queries[-3:])
+
+
+def test_update_graph(project_dir, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    query_mock.return_value.result_set = []
+
+    result = update_graph("test_graph", parse(project_dir))
+
+    assert result.graph_name == "test_graph"
+    assert result.modules_added == 3
+    assert result.nodes_added == 6
+    assert result.edges_added == 7
+
+
+def parse(project_dir: str) -> ParseResult:
+    return PythonProject(root_dir_path=project_dir).parse()
+
+
+def write(project_dir: str, file_name: str, content: str) -> None:
+    with open(os.path.join(project_dir, "pak", file_name), "w") as f:
+        f.write(content)
+
+
+def stored_units(plan: GraphUpdatePlan):
+    return {
+        full_name: (label, fingerprint)
+        for label, rows in plan.fingerprints.items()
+        for full_name, fingerprint in rows
+    }
+
+
+def created_node_names(plan: GraphUpdatePlan):
+    result = set()
+    for (_, keys), rows in plan.nodes.items():
+        full_name_index = keys.index("full_name")
+        result.update(row[full_name_index] for row in rows)
+    return result
+
+
+def created_edges(plan: GraphUpdatePlan, rel_name: str):
+    return {
+        (row[0], row[1])
+        for (_, name, _, _), rows in plan.edges.items()
+        if name == rel_name
+        for row in rows
+    }
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    os.makedirs(tmp_path / "pak")
+    write(str(tmp_path), "__init__.py", "")
+    write(str(tmp_path), "example.py", EXAMPLE_CONTENT)
+    write(str(tmp_path), "user.py", USER_CONTENT)
+    return str(tmp_path)
@@ -1,11 +1,15 @@
+import asyncio
 import os
 import tempfile
 
 import pytest
 from redisgraph.graph import Graph
 
+from pycograph import pycograph as pycograph_module
+from pycograph.config import Settings, active_settings, settings
 from pycograph.exceptions import NoPythonFileFoundException
-from pycograph.pycograph import load
+from pycograph.exporters import ExportFormat
+from pycograph.pycograph import aload, export, graph_store, load, watch, write
 from pycograph.schemas.pycograph_input import PycographLoadInput
 
 
@@ -38,3 +42,167 @@ def test_no_python_file_in_project_dir():
         )
         with pytest.raises(NoPythonFileFoundException):
             load(load_input)
+
+
+def test_parse_cache(test_data_dir, no_graph_commit, tmp_path):
+    settings.use_parse_cache = True
+    settings.parse_cache_dir = str(tmp_path)
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+
+    first_result = load(load_input)
+    second_result = load(load_input)
+
+    assert os.path.exists(os.path.join(tmp_path, "index"))
+    assert len(second_result.nodes) == len(first_result.nodes)
+
+
+def test_load_multiple_roots(tmp_path, no_graph_commit):
+    for file_path, content in [
+        ("service_a/shared/util.py", "def helper():\n    pass\n"),
+        ("service_b/app/main.py", "from shared.util import helper\nhelper()\n"),
+    ]:
+        full_path = tmp_path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    load_input = PycographLoadInput(
+        project_dir_paths=[tmp_path / "service_a", tmp_path / "service_b"],
+        graph_name="monorepo",
+    )
+
+    result = load(load_input)
+
+    edges = {
+        (
+            edge.src_node.properties["full_name"],
+            edge.relation,
+            edge.dest_node.properties["full_name"],
+        )
+        for edge in result.edges
+    }
+    assert ("app.main", "imports", "shared.util.helper") in edges
+    assert ("app.main", "calls", "shared.util.helper") in edges
+
+
+def test_load_with_own_settings(tmp_path, no_graph_commit):
+    test_file = tmp_path / "tests" / "unit" / "test_example.py"
+    test_file.parent.mkdir(parents=True)
+    test_file.write_text("")
+    load_input = PycographLoadInput(project_dir_path=tmp_path)
+
+    result = load(load_input, Settings(determine_test_types=True))
+
+    test_types = {
+        node.properties["full_name"]: node.properties.get("test_type")
+        for node in result.nodes.values()
+    }
+    assert test_types["tests.unit.test_example"] == "unit"
+    assert settings.determine_test_types is False
+
+
+def test_load_upsert(test_data_dir, mocker):
+    commit_mock = mocker.patch("redisgraph.graph.Graph.commit")
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+
+    result = load(load_input, Settings(upsert=True))
+
+    commit_mock.assert_not_called()
+    assert result.name == "mini-project"
+    # The merged nodes and edges aren't kept in memory.
+    assert result.nodes == {}
+    assert result.edges == []
+    queries = [call.args[0] for call in query_mock.call_args_list]
+    assert not any(" CREATE " in query for query in queries)
+    assert len([query for query in queries if "MERGE" in query]) == 5
+
+
+def test_watch_settings_are_not_active_between_rounds(test_data_dir, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    query_mock.return_value.result_set = []
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+    config = Settings(determine_test_types=True)
+
+    rounds = watch(load_input, 1.0, 0.5, config)
+    result, _ = next(rounds)
+
+    assert result.modules_added == 1
+    assert active_settings() is settings
+    rounds.close()
+
+
+def test_write(test_data_dir, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+
+    result = write(load_input)
+
+    assert result.graph_name == "mini-project"
+    assert result.nodes_added == 3
+    assert result.edges_added == 2
+    queries = [call.args[0] for call in query_mock.call_args_list]
+    assert all(
+        "INDEX" in query or "db.indexes" in query or "UNWIND $rows" in query
+        for query in queries
+    )
+
+
+def test_write_swap(test_data_dir, mocker):
+    redis_mock = mocker.patch("pycograph.graph_swap.redis_connection").return_value
+    swap_mock = mocker.patch("pycograph.graph_swap.swap_graph")
+    mocker.patch("redisgraph.graph.Graph.query")
+    open_graph_mock = mocker.patch(
+        "pycograph.pycograph.open_graph", wraps=pycograph_module.open_graph
+    )
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+
+    result = write(load_input, Settings(swap_graph=True))
+
+    assert result.graph_name == "mini-project"
+    building_name = swap_mock.call_args.args[1]
+    assert building_name.startswith("mini-project:building:")
+    open_graph_mock.assert_called_once_with(building_name)
+    swap_mock.assert_called_once_with(redis_mock, building_name, "mini-project")
+
+
+def test_aload(test_data_dir, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+
+    result = asyncio.run(aload(load_input, config=Settings(batch_size=1)))
+
+    assert result.graph_name == "mini-project"
+    assert result.nodes_added == 3
+    assert result.edges_added == 2
+    assert result.queries == 5
+    assert query_mock.call_count > result.queries
+
+
+def test_export(test_data_dir, tmp_path):
+    mini_project_path = os.path.join(test_data_dir, "mini-project")
+    load_input = PycographLoadInput(project_dir_path=mini_project_path)
+
+    result = export(load_input, str(tmp_path), ExportFormat.csv)
+
+    assert [os.path.basename(path) for path in result.paths] == [
+        "package.csv",
+        "module.csv",
+        "function.csv",
+        "contains.csv",
+    ]
+    assert result.nodes_exported == 3
+    assert result.edges_exported == 2
+
+
+def test_graph_store(test_data_dir):
+    duplo_project_path = os.path.join(test_data_dir, "duplo-project")
+    load_input = PycographLoadInput(project_dir_path=duplo_project_path)
+
+    store = graph_store(load_input)
+
+    assert store.callers("duplo.content.priv") == ["duplo.content.publ"]
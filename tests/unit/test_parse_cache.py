@@ -0,0 +1,106 @@
+import os
+
+from pycograph.parse_cache import (
+    ParseCache,
+    content_digest,
+    decode_syntax_elements,
+    encode_syntax_elements,
+)
+from pycograph.schemas.basic_syntax_elements import (
+    CallSyntaxElement,
+    ClassDefSyntaxElement,
+    ConstantSyntaxElement,
+    FunctionDefSyntaxElement,
+    ImportFromSyntaxElement,
+    ImportSyntaxElement,
+)
+
+SYNTAX_ELEMENTS = [
+    ImportSyntaxElement(name="os", as_name="operating_system"),
+    ImportFromSyntaxElement(name="do_stuff", from_text="logic", level=1),
+    ConstantSyntaxElement(name="ANSWER"),
+    ClassDefSyntaxElement(
+        name="Dummy",
+        syntax_elements=[
+            FunctionDefSyntaxElement(
+                name="method",
+                syntax_elements=[
+                    CallSyntaxElement(what_reference_name="self", called_attribute="x")
+                ],
+            )
+        ],
+    ),
+]
+
+
+def test_encode_and_decode():
+    assert decode_syntax_elements(encode_syntax_elements(SYNTAX_ELEMENTS)) == (
+        SYNTAX_ELEMENTS
+    )
+
+
+def test_get_unchanged_file(tmp_path):
+    file_path = write_module(tmp_path, "example.py", "ANSWER = 42")
+    cache_dir = os.path.join(tmp_path, ".pycograph-cache")
+    cache = ParseCache(cache_dir)
+    assert cache.get(file_path) is None
+    cache.put(file_path, content_digest("ANSWER = 42"), SYNTAX_ELEMENTS)
+    cache.save()
+
+    reloaded_cache = ParseCache(cache_dir)
+
+    assert reloaded_cache.get(file_path) == SYNTAX_ELEMENTS
+
+
+def test_changed_file_is_not_returned(tmp_path):
+    file_path = write_module(tmp_path, "example.py", "ANSWER = 42")
+    cache = ParseCache(os.path.join(tmp_path, ".pycograph-cache"))
+    cache.get(file_path)
+    cache.put(file_path, content_digest("ANSWER = 42"), SYNTAX_ELEMENTS)
+
+    write_module(tmp_path, "example.py", "ANSWER = 42000")
+
+    assert cache.get(file_path) is None
+    assert cache.get_by_digest(content_digest("ANSWER = 42")) == SYNTAX_ELEMENTS
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ParseCache(os.path.join(tmp_path, ".pycograph-cache"), max_size=1)
+    cache.put("old.py", "old", SYNTAX_ELEMENTS)
+    cache.put("new.py", "new", SYNTAX_ELEMENTS)
+    cache.max_size = cache.size() - 1
+
+    cache.save()
+
+    assert cache.get_by_digest("old") is None
+    assert cache.get_by_digest("new") == SYNTAX_ELEMENTS
+
+
+def test_clear(tmp_path):
+    cache_dir = os.path.join(tmp_path, ".pycograph-cache")
+    cache = ParseCache(cache_dir)
+    cache.put("example.py", "digest", SYNTAX_ELEMENTS)
+    cache.save()
+
+    cache.clear()
+
+    assert not os.path.exists(cache_dir)
+    assert ParseCache(cache_dir).get_by_digest("digest") is None
+
+
+def test_invalid_index_is_cleared(tmp_path):
+    cache_dir = os.path.join(tmp_path, ".pycograph-cache")
+    os.makedirs(cache_dir)
+    write_module(cache_dir, "index", "not marshal data")
+
+    cache = ParseCache(cache_dir)
+
+    assert cache.size() == 0
+    assert not os.path.exists(cache_dir)
+
+
+def write_module(dir_path, file_name, content):
+    file_path = os.path.join(dir_path, file_name)
+    with open(file_path, "w") as f:
+        f.write(content)
+    return file_path
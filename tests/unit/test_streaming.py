@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from pycograph import project as project_module
+from pycograph.project import PythonProject
+from pycograph.streaming import stream_project
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 10000])
+def test_stream_writes_the_same_graph_as_parse(test_data_dir, mocker, buffer_size):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    project_dir = os.path.join(test_data_dir, "duplo-project")
+
+    result = stream_project(PythonProject(project_dir), "test_graph", buffer_size)
+
+    written_nodes = set()
+    written_edges = set()
+    for call in query_mock.call_args_list:
+        query = call.args[0]
+        for row in call.args[1]["rows"] if len(call.args) > 1 else []:
+            if " CREATE (:" in query:
+                label = query.split("CREATE (:")[1].split(" ")[0]
+                written_nodes.add((label, row[1]))
+            else:
+                rel_name = query.split("-[:")[1].split("]")[0].split(" ")[0]
+                written_edges.add((row[0], rel_name, row[1]))
+    objects = PythonProject(project_dir).parse().objects
+    expected_nodes = {(obj.label(), obj.full_name) for obj in objects.values()}
+    expected_edges = {
+        (obj.full_name, rel.name, rel.destination_full_name)
+        for obj in objects.values()
+        for rel in obj.relationships
+        if rel.destination_full_name in objects
+    }
+    assert written_nodes == expected_nodes
+    assert written_edges == expected_edges
+    assert result.nodes_added == len(expected_nodes)
+    assert result.edges_added == len(expected_edges)
+
+
+def test_module_nodes_are_written_before_parsing_the_next_module(tmp_path, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    os.makedirs(tmp_path / "pak")
+    for name in ["first", "second"]:
+        with open(tmp_path / "pak" / f"{name}.py", "w") as f:
+            f.write("ANSWER = 42")
+    original_extract = project_module._extract_module_syntax_elements
+    queries_before_parsing = []
+
+    def extract(module_data):
+        queries_before_parsing.append(query_mock.call_count)
+        return original_extract(module_data)
+
+    mocker.patch.object(
+        project_module, "_extract_module_syntax_elements", side_effect=extract
+    )
+
+    stream_project(PythonProject(str(tmp_path)), "test_graph", buffer_size=2)
+
+    assert queries_before_parsing[0] == 0
+    assert queries_before_parsing[1] > 0
+
+
+def test_redefined_names_are_written_once(tmp_path, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    os.makedirs(tmp_path / "pak")
+    with open(tmp_path / "pak" / "example.py", "w") as f:
+        f.write("def f():\n    g()\n\n\ndef f():\n    pass\n\n\ndef g():\n    pass\n")
+
+    result = stream_project(PythonProject(str(tmp_path)), "test_graph")
+
+    written_full_names = [
+        row[1]
+        for call in query_mock.call_args_list
+        if len(call.args) > 1 and " CREATE (:function" in call.args[0]
+        for row in call.args[1]["rows"]
+    ]
+    assert sorted(written_full_names) == ["pak.example.f", "pak.example.g"]
+    objects = PythonProject(str(tmp_path)).parse().objects
+    assert result.nodes_added == len(objects)
+    # The calls edge of the replaced function isn't written.
+    assert not any(
+        "calls" in call.args[0]
+        for call in query_mock.call_args_list
+        if len(call.args) > 1
+    )
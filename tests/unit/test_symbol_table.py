@@ -0,0 +1,73 @@
+from pycograph.schemas.basic_syntax_elements import (
+    ImportFromSyntaxElement,
+    ImportSyntaxElement,
+)
+from pycograph.schemas.parse_result import FunctionWithContext
+from pycograph.symbol_table import SymbolTable
+
+
+def create_symbol_table():
+    do_stuff = FunctionWithContext(name="do_stuff", full_name="package.logic.do_stuff")
+    return SymbolTable({do_stuff.full_name: do_stuff})
+
+
+def test_find_object():
+    symbol_table = create_symbol_table()
+
+    assert symbol_table.find("package.logic.do_stuff").name == "do_stuff"
+    assert symbol_table.find("package.logic.other") is None
+
+
+def test_find_through_alias_chain():
+    symbol_table = create_symbol_table()
+    symbol_table.add_imported_name("package.do_stuff", "package.logic.do_stuff")
+    symbol_table.add_imported_name("api.do_stuff", "package.do_stuff")
+    symbol_table.add_imported_name("main.do_stuff", "api.do_stuff")
+
+    assert symbol_table.find("main.do_stuff").full_name == "package.logic.do_stuff"
+    assert symbol_table.find("api.do_stuff").full_name == "package.logic.do_stuff"
+
+
+def test_changed_alias_is_followed():
+    symbol_table = create_symbol_table()
+    symbol_table.add_imported_name("api.do_stuff", "package.missing")
+    symbol_table.add_imported_name("main.do_stuff", "api.do_stuff")
+    assert symbol_table.find("main.do_stuff") is None
+
+    symbol_table.add_imported_name("api.do_stuff", "package.logic.do_stuff")
+
+    assert symbol_table.find("main.do_stuff").full_name == "package.logic.do_stuff"
+
+
+def test_alias_cycle(mocker):
+    warning_logger = mocker.patch("pycograph.symbol_table.logger.warning")
+    symbol_table = create_symbol_table()
+    symbol_table.add_imported_name("first.name", "second.name")
+    symbol_table.add_imported_name("second.name", "first.name")
+
+    assert symbol_table.find("first.name") is None
+    warning_logger.assert_called_once_with(
+        "Import cycle: first.name -> second.name -> first.name"
+    )
+
+
+def test_import_candidates():
+    symbol_table = create_symbol_table()
+
+    assert symbol_table.import_candidates(
+        ImportSyntaxElement(name="logic"), "package.importer"
+    ) == ["logic", "package.logic"]
+    assert (
+        symbol_table.import_candidates(
+            ImportFromSyntaxElement(name="do_stuff", from_text="logic", level=1),
+            "package.importer",
+        )
+        == ["package.logic.do_stuff"]
+    )
+    assert (
+        symbol_table.import_candidates(
+            ImportFromSyntaxElement(name="do_stuff", from_text="logic", level=2),
+            "package.sub.importer",
+        )
+        == ["package.logic.do_stuff"]
+    )
@@ -0,0 +1,134 @@
+import os
+
+from pycograph.config import Settings, active_settings
+from pycograph.file_discovery import FileDiscovery
+from pycograph.incremental_update import UNIT_LABELS
+from pycograph.watch import snapshot, wait_for_changes, watch_project
+
+
+def test_snapshot(tmp_path):
+    write(tmp_path, "example.py", "ANSWER = 42")
+    write(tmp_path, "setup.py", "")
+    write(tmp_path, "README.md", "")
+
+    result = snapshot(str(tmp_path), FileDiscovery())
+
+    file_path = os.path.join(tmp_path, "pak", "example.py")
+    assert list(result) == [file_path]
+    assert result[file_path][0] == len("ANSWER = 42")
+
+
+def test_wait_for_changes_debounces_a_burst(mocker):
+    snapshots = [{"a": (1, 1)}, {"a": (1, 1)}, {"a": (2, 2)}, {"a": (3, 3)}]
+    snapshots.append(snapshots[-1])
+    mocker.patch("pycograph.watch.snapshot", side_effect=snapshots)
+    sleep_mock = mocker.Mock()
+
+    result = wait_for_changes(
+        "dummy", FileDiscovery(), {"a": (1, 1)}, 1.0, 0.5, sleep=sleep_mock
+    )
+
+    assert result == {"a": (3, 3)}
+    assert [call.args[0] for call in sleep_mock.call_args_list] == [
+        1.0,
+        1.0,
+        1.0,
+        0.5,
+        0.5,
+    ]
+
+
+def test_watch_project_updates_only_the_changed_modules(tmp_path, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    query_mock.return_value.result_set = []
+    write(tmp_path, "example.py", "def f():\n    pass\n")
+    write(tmp_path, "other.py", "ANSWER = 42")
+
+    new_content = "def f():\n    pass\n\n\ndef g():\n    pass\n"
+
+    def change_file_once(_):
+        if sleep_mock.call_count == 1:
+            write(tmp_path, "example.py", new_content)
+
+    sleep_mock = mocker.Mock(side_effect=change_file_once)
+
+    rounds = watch_project(str(tmp_path), "test_graph", sleep=sleep_mock)
+    first_result, _ = next(rounds)
+    second_result, duration = next(rounds)
+
+    assert first_result.modules_added == 2
+    assert second_result.modules_added == 0
+    assert second_result.modules_changed == 1
+    # The changed module and its functions.
+    assert second_result.nodes_added == 3
+    assert duration >= 0
+    # The graph has been read only before the first round.
+    read_queries = [
+        call for call in query_mock.call_args_list if "RETURN" in call.args[0]
+    ]
+    assert len(read_queries) == len(UNIT_LABELS)
+
+
+def test_watch_project_writes_a_redefined_function_once(tmp_path, mocker):
+    query_mock = mocker.patch("redisgraph.graph.Graph.query")
+    query_mock.return_value.result_set = []
+    write(tmp_path, "example.py", "def f():\n    pass\n")
+    write(tmp_path, "other.py", "from pak.example import f\n")
+
+    redefined_content = (
+        "def f():\n    g()\n\n\ndef f():\n    pass\n\n\ndef g():\n    pass\n"
+    )
+
+    def change_file_once(_):
+        if sleep_mock.call_count == 1:
+            write(tmp_path, "example.py", redefined_content)
+
+    sleep_mock = mocker.Mock(side_effect=change_file_once)
+
+    rounds = watch_project(str(tmp_path), "test_graph", sleep=sleep_mock)
+    next(rounds)
+    query_mock.reset_mock()
+    result, _ = next(rounds)
+
+    written_functions = [
+        row[1]
+        for call in query_mock.call_args_list
+        if len(call.args) > 1 and " CREATE (:function" in call.args[0]
+        for row in call.args[1]["rows"]
+    ]
+    assert sorted(written_functions) == ["pak.example.f", "pak.example.g"]
+    # The module and its two functions.
+    assert result.nodes_added == 3
+    # The calls edge of the replaced function isn't written.
+    assert not any(
+        "calls" in call.args[0]
+        for call in query_mock.call_args_list
+        if len(call.args) > 1
+    )
+
+
+def test_watch_project_activates_the_settings_only_during_a_round(tmp_path, mocker):
+    config = Settings(aggregate_calls=False)
+    settings_in_queries = []
+
+    def query(*args, **kwargs):
+        settings_in_queries.append(active_settings())
+        return mocker.MagicMock(result_set=[])
+
+    mocker.patch("redisgraph.graph.Graph.query", side_effect=query)
+    write(tmp_path, "example.py", "ANSWER = 42")
+
+    rounds = watch_project(str(tmp_path), "test_graph", config=config)
+    next(rounds)
+
+    assert active_settings() is not config
+    assert settings_in_queries
+    assert all(active is config for active in settings_in_queries)
+    rounds.close()
+
+
+def write(project_dir, file_name: str, content: str) -> None:
+    package_dir = os.path.join(project_dir, "pak")
+    os.makedirs(package_dir, exist_ok=True)
+    with open(os.path.join(package_dir, file_name), "w") as f:
+        f.write(content)